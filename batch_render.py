@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import List
+
+# Output formats of the rendered boards
+RENDER_FORMATS = ["png", "jpg", "pdf"]
+
+# Longest image side in pixels, larger boards are scaled down to fit
+MAX_IMAGE_SIZE = 16000
+
+# Default time limit of one board in seconds
+DEFAULT_TIMEOUT = 300
+
+# Outcome of one board, the times are None if the job did not get that far
+RenderResult = namedtuple("RenderResult", ["source", "output", "status", "load_seconds", "layout_seconds",
+                                           "render_seconds", "total_seconds"])
+
+"""
+Load the tasks of a render source. JSON files are configuration files, all
+other files are task files.
+"""
+def _load_source(source: Path):
+    from task_list import TaskList
+
+    task_list = TaskList()
+    if source.suffix != ".json":
+        task_list.read(source)
+        return task_list
+
+    from configuration import Configuration
+    config = Configuration()
+    config.read(source)
+    remote_source = config.remote_source()
+    if remote_source is not None:
+        return remote_source.read()
+    task_list.read(config.task_file_path, config.task_file_format)
+    return task_list
+
+"""
+Render the scene of a main window into an image or PDF file.
+"""
+def _render_scene(scene, output_path: Path) -> None:
+    from PyQt5.QtCore import Qt, QRectF, QSizeF, QMarginsF
+    from PyQt5.QtGui import QGuiApplication, QImage, QPainter, QPdfWriter, QPageSize, QPageLayout
+
+    source_rect = scene.sceneRect()
+    if output_path.suffix == ".pdf":
+        # One page with the size of the board, one scene pixel is one point.
+        # The boxes were measured at the screen resolution, at the default
+        # 1200 dpi of the writer the texts would not fit their boxes.
+        writer = QPdfWriter(str(output_path))
+        writer.setResolution(round(QGuiApplication.primaryScreen().logicalDotsPerInch()))
+        writer.setPageSize(QPageSize(QSizeF(source_rect.width(), source_rect.height()), QPageSize.Point))
+        writer.setPageMargins(QMarginsF(0, 0, 0, 0), QPageLayout.Point)
+        painter = QPainter(writer)
+        painter.setRenderHint(QPainter.Antialiasing)
+        scene.render(painter, QRectF(), source_rect, Qt.KeepAspectRatio)
+        painter.end()
+        return
+
+    scale = min(1.0, MAX_IMAGE_SIZE / max(source_rect.width(), source_rect.height(), 1))
+    image = QImage(max(round(source_rect.width() * scale), 1), max(round(source_rect.height() * scale), 1),
+                   QImage.Format_RGB32)
+    image.fill(Qt.white)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setRenderHint(QPainter.TextAntialiasing)
+    scene.render(painter, QRectF(image.rect()), source_rect, Qt.KeepAspectRatio)
+    painter.end()
+    if not image.save(str(output_path)):
+        raise OSError(f"Could not write image: {output_path}")
+
+"""
+Render one board with the layout of the main window, without showing it.
+The window is not persistent, so the stored settings such as collapsed
+lanes do not change the image, and no progress history or layout cache is
+written next to the source.
+
+Args:
+    source (Path): Configuration or task file
+    output_path (Path): Image or PDF file, the format is taken from the suffix
+
+Returns:
+    Tuple[float, float, float]: Seconds for loading, layout and rendering
+"""
+def render_board(source: Path, output_path: Path):
+    # Qt is only needed in the worker processes, without a display
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    from main_window import MainWindow
+
+    app = QApplication.instance() or QApplication([])
+
+    start = time.perf_counter()
+    task_list = _load_source(source)
+    loaded = time.perf_counter()
+
+    # display_tasks lays out the board while the window is created
+    main_window = MainWindow(task_list, persistent=False)
+    laid_out = time.perf_counter()
+
+    _render_scene(main_window.scene, output_path)
+    rendered = time.perf_counter()
+
+    main_window.deleteLater()
+    app.processEvents()
+    return loaded - start, laid_out - loaded, rendered - laid_out
+
+def _render_job(source, output_path, connection) -> None:
+    """Worker process entry, sends the timings or the error message back."""
+    try:
+        connection.send(("ok", render_board(source, output_path)))
+    except Exception as error:
+        connection.send(("error", f"{type(error).__name__}: {error}"))
+    finally:
+        connection.close()
+
+"""
+Return an output path per source in the output directory. Sources with the
+same file name get a numbered suffix.
+"""
+def output_paths(sources: List[Path], output_dir: Path, output_format: str) -> List[Path]:
+    paths = []
+    used = set()
+    for source in sources:
+        name = source.stem
+        number = 2
+        while name in used:
+            name = f"{source.stem}-{number}"
+            number += 1
+        used.add(name)
+        paths.append(output_dir / f"{name}.{output_format}")
+    return paths
+
+"""
+Render many boards in parallel worker processes. Every board gets its own
+process, at most `jobs` run at the same time, and a process that exceeds
+the timeout is killed so one broken board cannot block the batch. The
+whole batch takes about as long as the slowest board if there are enough
+CPU cores.
+
+Args:
+    sources (List[Path]): Configuration or task files
+    output_dir (Path): Directory of the rendered files, created if missing
+    output_format (str): One of RENDER_FORMATS
+    jobs (int): Number of parallel processes, defaults to the CPU count
+    timeout (float): Time limit per board in seconds
+
+Returns:
+    List[RenderResult]: One result per source, in the order of the sources
+"""
+def render_boards(sources, output_dir, output_format: str = "png", jobs: int = None,
+                  timeout: float = DEFAULT_TIMEOUT) -> List[RenderResult]:
+    if output_format not in RENDER_FORMATS:
+        raise ValueError(f"Unsupported render format: {output_format}")
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    sources = [Path(source) for source in sources]
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    outputs = output_paths(sources, output_dir, output_format)
+
+    results = [None] * len(sources)
+    pending = list(range(len(sources)))
+    pending.reverse()
+    running = {}  # Process sentinel -> (index, process, connection, start time)
+
+    while pending or running:
+        # Start jobs up to the process limit
+        while pending and len(running) < jobs:
+            index = pending.pop()
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=_render_job, args=(sources[index], outputs[index], sender))
+            process.start()
+            sender.close()
+            running[process.sentinel] = (index, process, receiver, time.perf_counter())
+
+        # Wait until a job ends or the earliest running job reaches its timeout
+        now = time.perf_counter()
+        earliest_deadline = min(start for _, _, _, start in running.values()) + timeout
+        for sentinel in wait(list(running), max(earliest_deadline - now, 0)):
+            index, process, receiver, start = running.pop(sentinel)
+            total = time.perf_counter() - start
+            # The sentinel can be ready before the exit code is set, join first
+            process.join()
+            message = receiver.recv() if receiver.poll() else ("error", f"Worker exited with code {process.exitcode}")
+            receiver.close()
+            if message[0] == "ok":
+                results[index] = RenderResult(sources[index], outputs[index], "ok", *message[1], total)
+            else:
+                results[index] = RenderResult(sources[index], outputs[index], message[1], None, None, None, total)
+
+        now = time.perf_counter()
+        for sentinel, (index, process, receiver, start) in list(running.items()):
+            if now - start >= timeout:
+                process.kill()
+                process.join()
+                receiver.close()
+                del running[sentinel]
+                results[index] = RenderResult(sources[index], outputs[index], f"Timeout after {timeout:g} s",
+                                              None, None, None, now - start)
+    return results
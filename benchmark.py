@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+from task_list import TaskList, REQUIRED_COLUMNS, TASK_FORMATS
+import task_formats
+from task_layout import calculate_task_positions, calculate_task_positions_parallel
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+"""
+Write a synthetic task file with the given number of tasks.
+
+Args:
+    file_path (Path): Path of the CSV file to create
+    task_count (int): Number of tasks to write
+    cluster_size (int): If set, tasks only depend on tasks of the same
+                        block of cluster_size tasks, giving independent
+                        dependency clusters
+"""
+def write_task_file(file_path: Path, task_count: int, cluster_size: int = None) -> None:
+    rng = random.Random(42)
+    departments = ["STR", "SOF", "HW", "QA", "DOC"]
+
+    lines = [";".join(REQUIRED_COLUMNS)]
+    for i in range(1, task_count + 1):
+        first = 1 if cluster_size is None else (i - 1) // cluster_size * cluster_size + 1
+        depends_on = " ".join(f"T{rng.randint(first, i - 1)}" for _ in range(rng.randint(0, 2))) if i > first else ""
+        other_departments = " ".join(rng.sample(departments, rng.randint(0, 2)))
+        lines.append(f"T{i};Projekt {i % 100};Aufgabe {i};{rng.randint(1, 200)};"
+                     f"{rng.randint(0, 200)};{rng.randint(0, 100)};{other_departments};{depends_on}")
+    file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+"""
+Run a CSV parser several times and return the best time in seconds and the
+tasks of the last run.
+
+Args:
+    parser (Callable): CSV parser of task_formats, parser(file_path)
+    file_path (Path): Task file to parse
+    repeat (int): Number of runs
+"""
+def time_reader(parser, file_path: Path, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tasks = parser(file_path)
+        best = min(best, time.perf_counter() - start)
+        if tasks is None:
+            raise RuntimeError(f"{parser.__name__} fell back for the benchmark file")
+    return best, tasks
+
+"""
+Compare the csv module parser with the memory mapped fast parser.
+"""
+def benchmark_parsers(task_count: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = Path(temp_dir) / "tasks.csv"
+        write_task_file(file_path, task_count)
+
+        csv_time, tasks = time_reader(task_formats._parse_csv, file_path, repeat)
+        csv_tasks = [vars(task) for task in tasks]
+        fast_time, tasks = time_reader(task_formats._parse_csv_fast, file_path, repeat)
+        fast_tasks = [vars(task) for task in tasks]
+
+    if csv_tasks != fast_tasks:
+        raise RuntimeError("Fast parser result differs from csv parser result")
+
+    print(f"Parsing {task_count} tasks (best of {repeat}):")
+    print(f"  csv module: {csv_time * 1000:9.1f} ms")
+    print(f"  mmap fast:  {fast_time * 1000:9.1f} ms  ({csv_time / fast_time:.1f}x)")
+
+"""
+Compare the load times of the task file formats. The same synthetic tasks
+are written in every registered format and read back through TaskList.read.
+"""
+def benchmark_formats(task_count: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = Path(temp_dir) / "tasks.csv"
+        write_task_file(csv_path, task_count)
+        task_list = TaskList()
+        task_list.read(csv_path)
+        expected = [vars(task) for task in task_list.tasks]
+
+        results = []
+        for format_name, task_format in TASK_FORMATS.items():
+            file_path = Path(temp_dir) / f"tasks{task_format.suffixes[0]}"
+            if file_path != csv_path:
+                task_list.write(file_path, format_name)
+
+            best = float("inf")
+            for _ in range(repeat):
+                loaded = TaskList()
+                start = time.perf_counter()
+                loaded.read(file_path, format_name)
+                best = min(best, time.perf_counter() - start)
+            if [vars(task) for task in loaded.tasks] != expected:
+                raise RuntimeError(f"{format_name} reader result differs from csv reader result")
+            results.append((format_name, best, file_path.stat().st_size))
+
+    csv_time = results[0][1]
+    print(f"Loading {task_count} tasks per file format (best of {repeat}):")
+    for format_name, best, size in results:
+        print(f"  {format_name + ':':11s} {best * 1000:9.1f} ms  ({csv_time / best:.1f}x)  {size / 1024 / 1024:7.1f} MB")
+
+"""
+Compare the sequential layout with the parallel per-component layout.
+"""
+def benchmark_layout(task_count: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = Path(temp_dir) / "tasks.csv"
+        write_task_file(file_path, task_count, cluster_size=100)
+
+        task_list = TaskList()
+        task_list.read(file_path)
+
+    sequential_time = parallel_time = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        sequential = calculate_task_positions(task_list.tasks)
+        sequential_time = min(sequential_time, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        parallel = calculate_task_positions_parallel(task_list.tasks, min_tasks=0)
+        parallel_time = min(parallel_time, time.perf_counter() - start)
+
+    if sequential != parallel:
+        raise RuntimeError("Parallel layout result differs from sequential layout result")
+
+    print(f"Layout of {task_count} tasks in clusters of 100 on {os.cpu_count()} CPUs (best of {repeat}):")
+    print(f"  sequential: {sequential_time * 1000:9.1f} ms")
+    print(f"  parallel:   {parallel_time * 1000:9.1f} ms  ({sequential_time / parallel_time:.1f}x)")
+
+# Available benchmarks
+BENCHMARKS = {
+    "parsers": benchmark_parsers,
+    "formats": benchmark_formats,
+    "layout": benchmark_layout,
+}
+
+"""
+Entry point
+"""
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Task Tool benchmarks")
+    parser.add_argument("benchmarks", nargs="*",
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("--tasks", type=int, default=200000, help="number of synthetic tasks")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark: {', '.join(unknown)}")
+
+    for name in args.benchmarks or BENCHMARKS:
+        BENCHMARKS[name](args.tasks, args.repeat)
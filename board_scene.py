@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+import math
+from bisect import bisect_right
+from collections import namedtuple
+from PyQt5.QtWidgets import QGraphicsScene
+from PyQt5.QtCore import Qt, QRectF, QLineF, QPointF
+from PyQt5.QtGui import QPen, QColor, QFont
+from board_view import painting_view
+from text_cache import StaticTextCache
+
+# Header of one swim lane: scene x of the lane start, top and bottom of the lane,
+# lane name with collapse arrow, optional note drawn smaller behind it
+LaneHeader = namedtuple("LaneHeader", ["lane", "left", "top", "bottom", "label", "note"])
+
+class BoardScene(QGraphicsScene):
+    """
+    Scene of the task board. In time-scaled mode it draws a time axis with
+    vertical grid lines. Ticks and lines are not scene items: they are
+    computed for the exposed area on every paint, and the tick distance is
+    chosen from the current zoom so labels never crowd or thin out.
+
+    The lane headers are drawn in the foreground as well. They stay at the
+    left edge of the visible area when the view is scrolled to the right,
+    and at its top while the rest of their lane is visible. The visible
+    lanes are found by a binary search over the sorted lane tops, so the
+    cost does not grow with the number of lanes.
+    """
+
+    # Possible tick distances in hours, 8 hours make a day and 40 a week
+    TICK_STEPS = [1, 2, 4, 8, 16, 40, 80, 200, 400, 800, 2000, 4000, 8000, 20000, 40000]
+    MIN_TICK_SPACING = 80  # Minimal distance of two ticks on screen in pixels
+    AXIS_HEIGHT = 20  # Height of the axis band at the top of the view
+
+    HEADER_PADDING = 4  # Space around the header text in scene units
+    HEADER_NOTE_SPACING = 10  # Space between label and note
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.time_origin = None  # Scene x of hour zero, None if the time axis is off
+        self.pixels_per_hour = 1.0
+        self.grid_pen = QPen(QColor(225, 225, 225), 0)  # Cosmetic, one pixel at every zoom
+        self.axis_font = QFont("Arial", 8)
+
+        self.lane_headers = []  # LaneHeader per lane, sorted by top
+        self.lane_tops = []  # Top of each lane for the binary search
+        self.lane_header_handler = None  # Called with the lane when a header is clicked
+        self.header_text_cache = StaticTextCache(max_entries=1024)
+        self.header_font = QFont()
+        self.header_font.setBold(True)
+        self.header_font.setPointSize(20)
+        self.note_font = QFont()
+        self.note_font.setPointSize(11)
+        self.note_color = QColor(180, 95, 0)
+
+    def set_time_axis(self, time_origin, pixels_per_hour=1.0):
+        """
+        Show or hide the time axis.
+
+        Args:
+            time_origin (float): Scene x of hour zero, None to hide the axis
+            pixels_per_hour (float): Scene width of one hour
+        """
+        self.time_origin = time_origin
+        self.pixels_per_hour = pixels_per_hour
+        self.update()
+
+    def set_lane_headers(self, lane_headers):
+        """
+        Replace the lane headers.
+
+        Args:
+            lane_headers (List[LaneHeader]): Headers sorted by the lane top
+        """
+        self.lane_headers = lane_headers
+        self.lane_tops = [header.top for header in lane_headers]
+        self.update()
+
+    def _header_layout(self, visible_rect, scale, view=None, device=None):
+        """
+        Return the visible headers with their scene rect, pinned to the left
+        edge and the top of the visible area.
+        """
+        if not self.lane_headers:
+            return []
+
+        # Below the time axis band while a header sticks to the top
+        top = visible_rect.top()
+        if self.time_origin is not None:
+            top += self.AXIS_HEIGHT / scale
+
+        layout = []
+        padding = self.HEADER_PADDING
+        index = max(bisect_right(self.lane_tops, visible_rect.top()) - 1, 0)
+        for header in self.lane_headers[index:]:
+            if header.top > visible_rect.bottom():
+                break
+            if view is not None and not view.shows(header.lane):
+                continue
+            label = self.header_text_cache.get(header.label, self.header_font, device)
+            width = label.width + 2 * padding
+            if header.note:
+                width += self.HEADER_NOTE_SPACING + self.header_text_cache.get(header.note, self.note_font, device).width
+            height = label.height + 2 * padding
+
+            x = max(header.left, visible_rect.left() + padding / scale)
+            y = max(header.top, min(top, header.bottom - height))
+            layout.append((header, QRectF(x, y, width, height)))
+        return layout
+
+    def lane_header_at(self, scene_pos, visible_rect, scale, view=None):
+        """Return the lane of the header at a scene position, None if there is none."""
+        device = view.viewport() if view is not None else None
+        for header, rect in self._header_layout(visible_rect, scale, view, device):
+            if rect.contains(scene_pos):
+                return header.lane
+        return None
+
+    def _draw_lane_headers(self, painter, visible_rect, scale, view):
+        """Draw the visible lane headers on a translucent background."""
+        padding = self.HEADER_PADDING
+        for header, rect in self._header_layout(visible_rect, scale, view, painter.device()):
+            painter.fillRect(rect, QColor(255, 255, 255, 220))
+            label = self.header_text_cache.get(header.label, self.header_font, painter.device())
+            baseline = rect.top() + padding + label.ascent
+            painter.setPen(Qt.black)
+            painter.setFont(self.header_font)
+            painter.drawStaticText(QPointF(rect.left() + padding, rect.top() + padding), label.static_text)
+            if header.note:
+                note = self.header_text_cache.get(header.note, self.note_font, painter.device())
+                painter.setPen(self.note_color)
+                painter.setFont(self.note_font)
+                painter.drawStaticText(QPointF(rect.left() + padding + label.width + self.HEADER_NOTE_SPACING,
+                                               baseline - note.ascent), note.static_text)
+
+    def _ticks(self, rect, scale):
+        """Return the tick distance in hours and the hours of the ticks inside the rect."""
+        step = self.TICK_STEPS[-1]
+        for candidate in self.TICK_STEPS:
+            if candidate * self.pixels_per_hour * scale >= self.MIN_TICK_SPACING:
+                step = candidate
+                break
+        tick_width = step * self.pixels_per_hour
+        first = max(0, math.ceil((rect.left() - self.time_origin) / tick_width))
+        last = math.floor((rect.right() - self.time_origin) / tick_width)
+        return step, range(first * step, (last + 1) * step, step)
+
+    def drawBackground(self, painter, rect):
+        """Draw the grid lines of the visible ticks behind the items."""
+        super().drawBackground(painter, rect)
+        if self.time_origin is None:
+            return
+
+        _, hours = self._ticks(rect, painter.worldTransform().m11())
+        painter.setPen(self.grid_pen)
+        painter.drawLines([QLineF(self.time_origin + hour * self.pixels_per_hour, rect.top(),
+                                  self.time_origin + hour * self.pixels_per_hour, rect.bottom())
+                           for hour in hours])
+
+    def drawForeground(self, painter, rect):
+        """Draw the lane headers and the axis labels in a band at the top of the view, on top of the items."""
+        super().drawForeground(painter, rect)
+
+        transform = painter.worldTransform()
+        # Headers are pinned to the whole visible area, not to the exposed part. The
+        # viewport is the device area on every paint device, QPdfWriter has no rect()
+        visible_rect = transform.inverted()[0].mapRect(QRectF(painter.viewport()))
+        self._draw_lane_headers(painter, visible_rect, transform.m11(), painting_view(painter.device()))
+
+        if self.time_origin is None:
+            return
+
+        step, hours = self._ticks(rect, transform.m11())
+        device_rect = transform.mapRect(rect)
+
+        # Labels keep their size at every zoom, so they are drawn in view coordinates
+        painter.save()
+        painter.resetTransform()
+        painter.fillRect(QRectF(device_rect.left(), 0, device_rect.width(), self.AXIS_HEIGHT), QColor(255, 255, 255, 220))
+        painter.setPen(Qt.darkGray)
+        painter.setFont(self.axis_font)
+        for hour in hours:
+            x = transform.map(QPointF(self.time_origin + hour * self.pixels_per_hour, 0)).x()
+            painter.drawLine(QLineF(x, self.AXIS_HEIGHT - 5, x, self.AXIS_HEIGHT))
+            label = f"{hour // 40} w" if step >= 40 and step % 40 == 0 else f"{hour} h"
+            painter.drawText(QRectF(x + 3, 0, self.MIN_TICK_SPACING, self.AXIS_HEIGHT - 2),
+                             Qt.AlignLeft | Qt.AlignVCenter, label)
+        painter.restore()
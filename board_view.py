@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+from PyQt5.QtWidgets import QGraphicsView, QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QCheckBox, QToolButton
+from PyQt5.QtCore import Qt, QRectF, QEvent, QTimer
+from PyQt5.QtGui import QPainter, QIcon
+from typing import Dict, List
+
+class BoardView(QGraphicsView):
+    """
+    One presentation of the shared board scene. All views show the same
+    task items, so the layout is calculated once and every data change is
+    visible in all views. Each view has its own zoom, can be restricted to
+    some lanes and can draw the task boxes in the compact style of the
+    compressed mode.
+
+    The lane filter restricts the visible scene area to the selected lanes.
+    Items of other lanes are skipped when painting in this view, and mouse
+    presses on them are not passed to the scene, so they cannot be edited or
+    highlighted from here.
+
+    The mouse wheel and pinch gestures zoom around the cursor. The events
+    of a burst are summed up and applied with a single rescale once the
+    event queue is empty. While zooming, the view renders without
+    antialiasing and the items draw a reduced level of detail, full quality
+    returns after the view was idle for IDLE_DELAY milliseconds.
+    """
+
+    # Space around the visible lanes of a filtered view
+    LANE_PADDING = 20
+
+    # Zoom factor per wheel notch and per toolbar click
+    ZOOM_STEP = 1.2
+    # Limits of the overall scale
+    MIN_SCALE = 0.02
+    MAX_SCALE = 8.0
+    # Idle time in milliseconds before full render quality returns
+    IDLE_DELAY = 150
+
+    def __init__(self, scene, parent=None):
+        super().__init__(scene, parent)
+        self.lane_filter = None  # Set of shown lanes, None for all
+        self.compact = False  # Draw task boxes in compact style
+        self.lane_rects: Dict[str, QRectF] = {}  # Scene area per lane, set by set_lanes
+        self.pressed_header = None  # Lane of the header under the last left click
+
+        self.setRenderHint(QPainter.Antialiasing)
+        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setResizeAnchor(QGraphicsView.AnchorUnderMouse)
+
+        # Zoom of the current event burst, applied by the zero timer
+        self.interacting = False  # Items draw a reduced level of detail while True
+        self.pending_zoom = 1.0
+        self.zoom_timer = QTimer(self)
+        self.zoom_timer.setSingleShot(True)
+        self.zoom_timer.setInterval(0)
+        self.zoom_timer.timeout.connect(self._apply_pending_zoom)
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.setInterval(self.IDLE_DELAY)
+        self.idle_timer.timeout.connect(self._end_interaction)
+        self.viewport().grabGesture(Qt.PinchGesture)
+
+    def shows(self, lane) -> bool:
+        """Return True if the items of a lane are drawn in this view."""
+        return self.lane_filter is None or lane in self.lane_filter
+
+    def items(self, *args):
+        """Return the items like QGraphicsView.items, without the items of filtered out lanes."""
+        items = super().items(*args)
+        if self.lane_filter is None:
+            return items
+        return [item for item in items if self.shows(getattr(item, "lane", None))]
+
+    def _hidden_item_at(self, pos) -> bool:
+        """Return True if the topmost item at a viewport position belongs to a filtered out lane."""
+        if self.lane_filter is None:
+            return False
+        item = self.itemAt(pos)
+        return item is not None and not self.shows(getattr(item, "lane", None))
+
+    def set_lane_filter(self, lanes):
+        """
+        Restrict the view to some lanes.
+
+        Args:
+            lanes (Iterable[str]): Shown lanes, None for all
+        """
+        self.lane_filter = set(lanes) if lanes is not None else None
+        self._apply_scene_rect()
+
+    def set_compact(self, compact: bool):
+        """Switch the compact drawing style of the task boxes."""
+        self.compact = compact
+        self.viewport().update()
+
+    def set_lanes(self, lane_rects: Dict[str, QRectF]):
+        """
+        Take over the lane geometry after the shared layout changed.
+
+        Args:
+            lane_rects (Dict[str, QRectF]): Scene area per lane
+        """
+        self.lane_rects = lane_rects
+        self._apply_scene_rect()
+
+    def zoom_by(self, factor: float):
+        """Scale the view by a factor, within MIN_SCALE and MAX_SCALE."""
+        current = self.transform().m11()
+        target = min(max(current * factor, self.MIN_SCALE), self.MAX_SCALE)
+        if target != current:
+            self.scale(target / current, target / current)
+
+    def _queue_zoom(self, factor: float):
+        """Add a zoom step to the current burst and switch to the interactive render mode."""
+        self.pending_zoom *= factor
+        self.zoom_timer.start()
+        if not self.interacting:
+            self.interacting = True
+            self.setRenderHint(QPainter.Antialiasing, False)
+            self.setRenderHint(QPainter.TextAntialiasing, False)
+        self.idle_timer.start()
+
+    def _apply_pending_zoom(self):
+        """Apply all zoom steps of the burst with one rescale."""
+        factor, self.pending_zoom = self.pending_zoom, 1.0
+        self.zoom_by(factor)
+
+    def _end_interaction(self):
+        """Return to full render quality."""
+        self.interacting = False
+        self.setRenderHint(QPainter.Antialiasing, True)
+        self.setRenderHint(QPainter.TextAntialiasing, True)
+        self.viewport().update()
+
+    def wheelEvent(self, event):
+        """Zoom around the cursor, Shift+wheel scrolls."""
+        if event.modifiers() & Qt.ShiftModifier:
+            super().wheelEvent(event)
+            return
+        # 120 units are one notch of a standard mouse wheel, touchpads send smaller steps
+        delta = event.angleDelta().y()
+        if delta:
+            self._queue_zoom(self.ZOOM_STEP ** (delta / 120))
+        event.accept()
+
+    def viewportEvent(self, event):
+        """Zoom by pinch gestures and native touchpad zoom gestures."""
+        if event.type() == QEvent.Gesture:
+            pinch = event.gesture(Qt.PinchGesture)
+            if pinch is not None:
+                self._queue_zoom(pinch.scaleFactor())
+                event.accept()
+                return True
+        elif event.type() == QEvent.NativeGesture and event.gestureType() == Qt.ZoomNativeGesture:
+            self._queue_zoom(1 + event.value())
+            event.accept()
+            return True
+        return super().viewportEvent(event)
+
+    def _lane_header_at(self, pos):
+        """Return the lane of the header at a viewport position, None if there is none."""
+        visible_rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        return self.scene().lane_header_at(self.mapToScene(pos), visible_rect, self.transform().m11(), self)
+
+    def mousePressEvent(self, event):
+        """Accept left clicks on a lane header so the release toggles the lane."""
+        self.pressed_header = None
+        if event.button() == Qt.LeftButton:
+            self.pressed_header = self._lane_header_at(event.pos())
+            if self.pressed_header is not None:
+                event.accept()
+                return
+        if self._hidden_item_at(event.pos()):
+            # Empty space of this view, the scene must not see the hidden item
+            event.accept()
+            return
+        super().mousePressEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        """Ignore double-clicks on the items of filtered out lanes."""
+        if self._hidden_item_at(event.pos()):
+            event.accept()
+            return
+        super().mouseDoubleClickEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        """Collapse or expand the lane of a clicked header."""
+        if event.button() == Qt.LeftButton and self.pressed_header is not None:
+            lane, self.pressed_header = self.pressed_header, None
+            handler = self.scene().lane_header_handler
+            if handler is not None and self._lane_header_at(event.pos()) == lane:
+                handler(lane)
+            event.accept()
+            return
+        super().mouseReleaseEvent(event)
+
+    def _apply_scene_rect(self):
+        """Limit the scrollable area to the shown lanes."""
+        if self.lane_filter is None:
+            # A null rect follows the scene rect
+            self.setSceneRect(QRectF())
+        else:
+            rect = QRectF()
+            for lane in self.lane_filter:
+                lane_rect = self.lane_rects.get(lane)
+                if lane_rect is not None:
+                    rect = rect.united(lane_rect)
+            if rect.isNull():
+                rect = QRectF(0, 0, 1, 1)
+            pad = self.LANE_PADDING
+            self.setSceneRect(rect.adjusted(-pad, -pad, pad, pad))
+        self.viewport().update()
+
+"""
+Return the view a scene item is currently painted for, None if it is not
+painted into a BoardView (e.g. when rendering to an image).
+"""
+def painting_view(widget):
+    view = widget.parent() if isinstance(widget, QWidget) else None
+    return view if isinstance(view, BoardView) else None
+
+class BoardViewPanel(QWidget):
+    """
+    Additional board view with its own controls: lane selection,
+    compact style and zoom.
+    """
+
+    def __init__(self, scene, parent=None):
+        super().__init__(parent)
+        self.view = BoardView(scene)
+
+        self.lane_combo = QComboBox()
+        self.lane_combo.addItem("All lanes")
+        self.lane_combo.currentIndexChanged.connect(self.apply_lane_selection)
+
+        self.compact_check = QCheckBox("Compact")
+        self.compact_check.toggled.connect(self.view.set_compact)
+
+        controls = QHBoxLayout()
+        controls.setContentsMargins(4, 4, 4, 0)
+        controls.addWidget(self.lane_combo, 1)
+        controls.addWidget(self.compact_check)
+        for icon, tool_tip, handler in ((":/icons/zoom_in_24dp.png", "Zoom in", self.zoom_in),
+                                        (":/icons/zoom_out_24dp.png", "Zoom out", self.zoom_out),
+                                        (":/icons/view_real_size_24dp.png", "Fit to view", self.fit)):
+            button = QToolButton()
+            button.setIcon(QIcon(icon))
+            button.setToolTip(tool_tip)
+            button.clicked.connect(handler)
+            controls.addWidget(button)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(controls)
+        layout.addWidget(self.view)
+        self.setLayout(layout)
+
+    def set_lane_names(self, lanes: List[str]):
+        """Offer the lanes of the board, keeping the current selection if it still exists."""
+        current = self.lane_combo.currentText()
+        self.lane_combo.blockSignals(True)
+        self.lane_combo.clear()
+        self.lane_combo.addItem("All lanes")
+        self.lane_combo.addItems(lanes)
+        index = self.lane_combo.findText(current)
+        self.lane_combo.setCurrentIndex(max(index, 0))
+        self.lane_combo.blockSignals(False)
+        self.apply_lane_selection()
+
+    def apply_lane_selection(self):
+        """Filter the view to the selected lane."""
+        if self.lane_combo.currentIndex() <= 0:
+            self.view.set_lane_filter(None)
+        else:
+            self.view.set_lane_filter([self.lane_combo.currentText()])
+
+    def zoom_in(self):
+        """Zoom this view in."""
+        self.view.zoom_by(self.view.ZOOM_STEP)
+
+    def zoom_out(self):
+        """Zoom this view out."""
+        self.view.zoom_by(1 / self.view.ZOOM_STEP)
+
+    def fit(self):
+        """Fit the shown lanes into this view."""
+        self.view.fitInView(self.view.sceneRect(), Qt.KeepAspectRatio)
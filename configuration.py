@@ -5,6 +5,7 @@
 
 import json
 from pathlib import Path
+from remote_source import RemoteTaskSource, is_url, default_cache_path
 
 # Configuration class
 class Configuration:
@@ -16,6 +17,16 @@ class Configuration:
         
         self.task_file_path = ""
 
+        # Optional task file format, None selects it by the file suffix
+        self.task_file_format = None
+
+        # HTTP(S) URL of the task file, task_file_path is then its local cache
+        self.task_source_url = None
+        self.task_poll_seconds = 60
+
+        # Optional memory budget in MB, None means no budget
+        self.memory_budget_mb = None
+
     """
     Read a JSON file with configuration data and store the content.
     
@@ -36,4 +47,33 @@ class Configuration:
         if 'TASK_FILE_PATH' in config_data:
             self.task_file_path = config_data['TASK_FILE_PATH']
         else:
-            raise ValueError("TASK_FILE_PATH attribute not found in configuration")
\ No newline at end of file
+            raise ValueError("TASK_FILE_PATH attribute not found in configuration")
+
+        if is_url(self.task_file_path):
+            self.task_source_url = self.task_file_path
+            if 'TASK_CACHE_PATH' in config_data:
+                self.task_file_path = config_data['TASK_CACHE_PATH']
+            else:
+                self.task_file_path = str(default_cache_path(self.task_source_url, self.file_path.parent))
+            if 'TASK_POLL_SECONDS' in config_data:
+                self.task_poll_seconds = float(config_data['TASK_POLL_SECONDS'])
+
+        if 'TASK_FILE_FORMAT' in config_data:
+            self.task_file_format = config_data['TASK_FILE_FORMAT']
+
+        # null keeps the default of no budget
+        memory_budget_mb = config_data.get('MEMORY_BUDGET_MB')
+        if memory_budget_mb is not None:
+            try:
+                self.memory_budget_mb = float(memory_budget_mb)
+            except (TypeError, ValueError):
+                raise ValueError(f"MEMORY_BUDGET_MB is not a number: {memory_budget_mb!r}") from None
+
+    """
+    Return the remote task source of the configuration, None if the task
+    file is a local file.
+    """
+    def remote_source(self):
+        if self.task_source_url is None:
+            return None
+        return RemoteTaskSource(self.task_source_url, self.task_file_path, self.task_file_format)
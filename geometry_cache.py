@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from task_list import copy_file_mode
+
+# Cache format version, increase when the layout calculation changes
+GEOMETRY_CACHE_VERSION = 1
+
+"""
+Return a short fingerprint of a sequence of strings.
+"""
+def _fingerprint(parts) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+class GeometryCache:
+    """
+    Layout geometry of a board stored next to its task file, so an
+    unchanged board opens without recalculating it.
+
+    The dependency columns are keyed by a fingerprint over all task IDs and
+    dependencies, because dependencies cross projects. Box heights in normal
+    and compressed mode are stored per lane and keyed by a fingerprint over
+    the task texts of that lane, so only lanes of changed projects have to
+    be measured again. Both are additionally keyed by the layout parameters.
+    """
+
+    def __init__(self, task_file_path, layout_params: dict):
+        task_file_path = Path(task_file_path)
+        self.cache_path = task_file_path.with_name(f".{task_file_path.name}.layout.json")
+        self.params_key = _fingerprint([json.dumps(layout_params, sort_keys=True), str(GEOMETRY_CACHE_VERSION)])
+        self.data = None  # Content of the cache file, loaded on first use
+
+    def _load_file(self) -> dict:
+        """Read the cache file once, a missing or broken file is an empty cache."""
+        if self.data is None:
+            try:
+                data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if data.get("params") != self.params_key:
+                data = {}
+            self.data = {"params": self.params_key, "columns": data.get("columns", {}), "lanes": data.get("lanes", {})}
+        return self.data
+
+    @staticmethod
+    def columns_fingerprint(tasks) -> str:
+        """Fingerprint of everything the dependency columns depend on."""
+        return _fingerprint(f"{task.task_id}\x1e{' '.join(task.depends_on_task)}" for task in tasks)
+
+    @staticmethod
+    def lane_fingerprint(tasks) -> str:
+        """Fingerprint of everything the box heights of a lane depend on."""
+        return _fingerprint(f"{task.task_id}\x1e{task.task}\x1e{' '.join(task.other_departments)}" for task in tasks)
+
+    """
+    Look up the cached geometry of a board.
+
+    Args:
+        tasks (List[Task]): All tasks in file order
+        project_tasks (Dict[str, List[Task]]): Tasks per lane in display order
+
+    Returns:
+        Tuple: Column per task ID or None if the dependencies changed, and
+               per project the (normal, compressed) height of each task of
+               the lane, for unchanged lanes only
+    """
+    def load(self, tasks, project_tasks) -> Tuple[Optional[Dict[str, int]], Dict[str, List[Tuple[int, int]]]]:
+        data = self._load_file()
+
+        columns = None
+        cached_columns = data["columns"]
+        if cached_columns.get("fingerprint") == self.columns_fingerprint(tasks):
+            columns = dict(zip((task.task_id for task in tasks), cached_columns["values"]))
+
+        lane_heights = {}
+        for project, lane_tasks in project_tasks.items():
+            cached_lane = data["lanes"].get(project)
+            if cached_lane is not None and cached_lane["fingerprint"] == self.lane_fingerprint(lane_tasks):
+                lane_heights[project] = [tuple(heights) for heights in cached_lane["heights"]]
+
+        return columns, lane_heights
+
+    """
+    Store the geometry of a board and write the cache file if it changed.
+
+    Args:
+        tasks (List[Task]): All tasks in file order
+        project_tasks (Dict[str, List[Task]]): Tasks per lane in display order
+        columns (Dict[str, int]): Column per task ID
+        lane_heights (Dict[str, List[Tuple[int, int]]]): Heights per lane,
+            lanes without known heights are left out
+    """
+    def save(self, tasks, project_tasks, columns, lane_heights) -> None:
+        data = self._load_file()
+        changed = False
+
+        columns_fingerprint = self.columns_fingerprint(tasks)
+        if data["columns"].get("fingerprint") != columns_fingerprint:
+            data["columns"] = {"fingerprint": columns_fingerprint,
+                               "values": [columns[task.task_id] for task in tasks]}
+            changed = True
+
+        lanes = {}
+        for project, lane_tasks in project_tasks.items():
+            fingerprint = self.lane_fingerprint(lane_tasks)
+            cached_lane = data["lanes"].get(project)
+            if cached_lane is not None and cached_lane["fingerprint"] == fingerprint:
+                lanes[project] = cached_lane
+            elif project in lane_heights:
+                lanes[project] = {"fingerprint": fingerprint, "heights": [list(heights) for heights in lane_heights[project]]}
+                changed = True
+        if lanes.keys() != data["lanes"].keys():
+            changed = True
+        data["lanes"] = lanes
+
+        if changed:
+            self._write_file()
+
+    def _write_file(self) -> None:
+        """Replace the cache file atomically, the cache is optional so errors are ignored."""
+        try:
+            temp_file = tempfile.NamedTemporaryFile('w', encoding='utf-8', delete=False, dir=self.cache_path.parent,
+                                                    prefix=f"{self.cache_path.name}.", suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with temp_file:
+                json.dump(self.data, temp_file, separators=(",", ":"))
+            copy_file_mode(self.cache_path, temp_file.name)
+            os.replace(temp_file.name, self.cache_path)
+        except OSError:
+            try:
+                os.unlink(temp_file.name)
+            except OSError:
+                pass
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+import html
+import json
+from pathlib import Path
+from typing import TextIO
+from task_list import TaskList
+from task_layout import calculate_task_positions_parallel
+
+# Tasks per embedded data block, each block is parsed and drawn on its own
+CHUNK_TASKS = 500
+
+# Geometry of the task boxes in pixels, like the boxes of the board
+BOX_WIDTH = 200
+BOX_HEIGHT = 100
+SPACING = 12
+ROW_HEIGHT = BOX_HEIGHT + SPACING
+
+PAGE_STYLE = """
+body { margin: 0; font-family: sans-serif; font-size: 12px; background: #fff; }
+header { position: sticky; top: 0; z-index: 3; padding: 6px 12px; background: #f4f4f4;
+         border-bottom: 1px solid #ccc; }
+header h1 { display: inline; font-size: 16px; margin-right: 16px; }
+header select { margin-left: 8px; }
+.lane { width: max-content; min-width: 100%; padding: 0 50px 38px 50px; box-sizing: border-box;
+        border-bottom: 1px solid #ddd; }
+.lane-header { position: sticky; left: 12px; display: inline-block; margin: 14px 0 10px -38px;
+               cursor: pointer; user-select: none; }
+.lane-header b { font-size: 20px; }
+.lane-header span { color: #555; margin-left: 10px; }
+.lane.collapsed .chunk { display: none; }
+.lane.collapsed .lane-header b::before { content: "\\25B8  "; }
+.lane:not(.collapsed) .lane-header b::before { content: "\\25BE  "; }
+.chunk { position: relative; }
+.task { position: absolute; width: 190px; height: 94px; padding: 3px; border: 1px solid #000;
+        overflow: hidden; background: #fff; cursor: pointer; }
+.task .time { color: #006400; }
+.task .text { height: 48px; overflow: hidden; }
+.task .bar { position: absolute; left: 3px; right: 3px; bottom: 4px; height: 12px; border: 1px solid #888; }
+.task .bar div { height: 100%; background: rgb(200, 215, 255); }
+.task.selected { outline: 4px solid rgb(255, 140, 0); }
+.task.upstream { outline: 3px solid rgb(0, 120, 215); }
+.task.downstream { outline: 3px solid rgb(200, 0, 0); }
+#info { position: fixed; right: 12px; bottom: 12px; z-index: 3; max-width: 360px; max-height: 40vh;
+        overflow: auto; padding: 8px; background: #fff; border: 1px solid #888; display: none; }
+"""
+
+# Lanes and task records are embedded as JSON blocks next to empty
+# placeholders of their final size. Only the blocks near the viewport are
+# parsed and drawn, blocks far away are emptied again.
+PAGE_SCRIPT = """
+(function () {
+  var BOX_WIDTH = %(box_width)d, ROW_HEIGHT = %(row_height)d;
+  var selected = null, upstream = {}, downstream = {};
+
+  function classOf(id) {
+    return "task" + (id === selected ? " selected" : upstream[id] ? " upstream" :
+                     downstream[id] ? " downstream" : "");
+  }
+
+  function box(record, row) {
+    var id = record[0], progress = parseInt(record[4], 10) || 0;
+    var div = document.createElement("div");
+    div.className = classOf(id);
+    div.dataset.id = id;
+    div.dataset.deps = record[7].join(" ");
+    div.dataset.dependents = record[8].join(" ");
+    div.style.left = (record[5] * BOX_WIDTH) + "px";
+    // The chunk placeholder already sits below the earlier chunks of the lane
+    div.style.top = (row * ROW_HEIGHT) + "px";
+    div.title = id + ": " + record[1] +
+      (record[6] ? "\\nDepartments: " + record[6] : "") +
+      (record[7].length ? "\\nDepends on: " + record[7].join(" ") : "");
+    var time = document.createElement("div");
+    time.className = "time";
+    time.textContent = id + "  " + record[3] + " / " + record[2] + " h";
+    var text = document.createElement("div");
+    text.className = "text";
+    text.textContent = record[1];
+    var bar = document.createElement("div");
+    bar.className = "bar";
+    var fill = document.createElement("div");
+    fill.style.width = Math.max(0, Math.min(progress, 100)) + "%%";
+    bar.appendChild(fill);
+    div.append(time, text, bar);
+    return div;
+  }
+
+  function draw(chunk) {
+    var records = JSON.parse(document.getElementById(chunk.dataset.source).textContent);
+    var fragment = document.createDocumentFragment();
+    for (var i = 0; i < records.length; i++) {
+      fragment.appendChild(box(records[i], i));
+    }
+    chunk.appendChild(fragment);
+  }
+
+  var observer = new IntersectionObserver(function (entries) {
+    entries.forEach(function (entry) {
+      var chunk = entry.target;
+      if (entry.isIntersecting && !chunk.firstChild) {
+        draw(chunk);
+      } else if (!entry.isIntersecting && chunk.firstChild) {
+        chunk.replaceChildren();
+      }
+    });
+  }, {rootMargin: "1500px"});
+  document.querySelectorAll(".chunk").forEach(function (chunk) { observer.observe(chunk); });
+
+  function mark() {
+    document.querySelectorAll(".task").forEach(function (div) {
+      div.className = classOf(div.dataset.id);
+    });
+  }
+
+  document.addEventListener("click", function (event) {
+    var header = event.target.closest(".lane-header");
+    if (header) {
+      header.parentNode.classList.toggle("collapsed");
+      return;
+    }
+    var task = event.target.closest(".task");
+    if (!task) {
+      return;
+    }
+    var info = document.getElementById("info");
+    upstream = {};
+    downstream = {};
+    if (selected === task.dataset.id) {
+      selected = null;
+      info.style.display = "none";
+    } else {
+      selected = task.dataset.id;
+      var deps = task.dataset.deps, dependents = task.dataset.dependents;
+      deps.split(" ").forEach(function (id) { if (id) upstream[id] = true; });
+      dependents.split(" ").forEach(function (id) { if (id) downstream[id] = true; });
+      info.textContent = task.title + "\\nDepending on it: " + (dependents || "-");
+      info.style.whiteSpace = "pre-wrap";
+      info.style.display = "block";
+    }
+    mark();
+  });
+
+  document.getElementById("lane-select").addEventListener("change", function (event) {
+    var lane = document.getElementById(event.target.value);
+    if (lane) {
+      lane.classList.remove("collapsed");
+      lane.scrollIntoView();
+    }
+  });
+})();
+"""
+
+"""
+Return a JSON text that can be embedded in a script element.
+"""
+def _script_json(value) -> str:
+    # "<" is escaped so a task text cannot close the script element
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).replace("<", "\\u003c")
+
+"""
+Write a board as one self-contained HTML page: lanes, task boxes with
+their times and progress, and the dependencies of every task. The page
+needs neither Qt nor network access. Tasks are placed in the dependency
+columns of the board, one row per task like in the board.
+
+The tasks are streamed lane by lane in chunks of CHUNK_TASKS from the
+task list and each chunk is written before the next one is encoded, so
+besides the task list and its layout only one chunk is held in memory.
+The browser draws only the chunks near the viewport.
+
+Args:
+    task_list (TaskList): Tasks of the board
+    output_path (Path): HTML file to write
+    title (str): Page title, defaults to the name of the task file
+
+Returns:
+    int: Number of exported tasks
+"""
+def export_html(task_list: TaskList, output_path, title: str = None) -> int:
+    output_path = Path(output_path)
+    if title is None:
+        title = task_list.file_path.name if task_list.file_path is not None else "Task Board"
+    positions = calculate_task_positions_parallel(task_list.tasks)
+    summaries = task_list.summary()
+
+    with open(output_path, 'w', encoding='utf-8', newline='\n') as file:
+        _write_head(file, title, summaries)
+        exported = 0
+        lane_number = None
+        for lane, tasks, first_row in task_list.project_chunks(CHUNK_TASKS):
+            if first_row == 0:
+                if lane_number is not None:
+                    file.write('</section>\n')
+                lane_number = 0 if lane_number is None else lane_number + 1
+                _write_lane_header(file, lane_number, lane, summaries[lane])
+
+            records = [(task.task_id, task.task, task.time_required, task.time_spent, task.progress,
+                        positions.get(task.task_id, 0), " ".join(task.other_departments),
+                        task.depends_on_task, task_list.dependents.get(task.task_id, []))
+                       for task in tasks]
+            width = (max(record[5] for record in records) + 1) * BOX_WIDTH
+            source = f'chunk-{lane_number}-{first_row}'
+            file.write(f'<div class="chunk" data-source="{source}" '
+                       f'style="width:{width}px;height:{len(records) * ROW_HEIGHT}px"></div>\n'
+                       f'<script type="application/json" id="{source}">{_script_json(records)}</script>\n')
+            exported += len(records)
+
+        if lane_number is not None:
+            file.write('</section>\n')
+        file.write('<div id="info"></div>\n<script>')
+        file.write(PAGE_SCRIPT % {"box_width": BOX_WIDTH, "row_height": ROW_HEIGHT})
+        file.write('</script>\n</body>\n</html>\n')
+    return exported
+
+def _write_head(file: TextIO, title: str, summaries) -> None:
+    """Write the page head, the title bar and the lane selection."""
+    task_count = sum(summary['tasks'] for summary in summaries.values())
+    options = "".join(f'<option value="lane-{number}">{html.escape(lane)}</option>'
+                      for number, lane in enumerate(summaries))
+    file.write('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+               f'<title>{html.escape(title)}</title>\n<style>{PAGE_STYLE}</style>\n</head>\n<body>\n'
+               f'<header><h1>{html.escape(title)}</h1>{task_count} tasks in {len(summaries)} lanes'
+               f'<select id="lane-select"><option value="">Go to lane</option>{options}</select></header>\n')
+
+def _write_lane_header(file: TextIO, number: int, lane: str, summary) -> None:
+    """Open the section of a lane and write its sticky header."""
+    file.write(f'<section class="lane" id="lane-{number}"><div class="lane-header"><b>{html.escape(lane)}</b>'
+               f'<span>{summary["tasks"]} tasks, {summary["time_spent"]} / {summary["time_required"]} h, '
+               f'{summary["progress"]}%</span></div>\n')
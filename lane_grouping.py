@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+from typing import Dict, List
+from task_list import Task
+
+# Selectable lane groupings
+GROUPINGS = ["project", "department", "progress"]
+
+# Lane of the tasks without other departments in the department grouping
+NO_DEPARTMENT = "No department"
+
+# Progress bands in display order: lane name, lowest and highest progress
+PROGRESS_BANDS = [("Not started", 0, 0), ("Started", 1, 49), ("Advanced", 50, 99), ("Done", 100, 100)]
+INVALID_PROGRESS = "Invalid progress"
+
+"""
+Return the progress band of a progress value.
+"""
+def progress_band(progress: str) -> str:
+    try:
+        value = int(progress)
+    except ValueError:
+        return INVALID_PROGRESS
+    for band, low, high in PROGRESS_BANDS:
+        if low <= value <= high:
+            return band
+    return INVALID_PROGRESS
+
+"""
+Return the lanes of a task in a grouping. In the department grouping a task
+is shown in the lane of each of its departments.
+"""
+def lanes_of(task: Task, grouping: str) -> List[str]:
+    if grouping == "project":
+        return [task.project]
+    if grouping == "department":
+        # A department listed twice still gets only one box
+        return list(dict.fromkeys(task.other_departments)) or [NO_DEPARTMENT]
+    if grouping == "progress":
+        return [progress_band(task.progress)]
+    raise ValueError(f"Unknown lane grouping: {grouping}")
+
+def _progress_lanes(band_tasks: Dict[str, List[Task]]) -> Dict[str, List[Task]]:
+    """Return the non-empty progress bands in band order."""
+    order = [band for band, _, _ in PROGRESS_BANDS] + [INVALID_PROGRESS]
+    return {band: band_tasks[band] for band in order if band_tasks.get(band)}
+
+class LaneGroups:
+    """
+    Tasks per lane for every grouping, built in one pass when the tasks are
+    loaded. Switching the grouping only selects another index. Within a
+    lane the tasks keep their file order.
+
+    Projects keep the order of their first task, departments are sorted by
+    name and progress bands are ordered from not started to done.
+    """
+
+    def __init__(self, tasks: List[Task]):
+        projects = {}
+        departments = {}
+        bands = {}
+        for task in tasks:
+            projects.setdefault(task.project, []).append(task)
+            for department in lanes_of(task, "department"):
+                departments.setdefault(department, []).append(task)
+            bands.setdefault(progress_band(task.progress), []).append(task)
+
+        department_names = sorted(name for name in departments if name != NO_DEPARTMENT)
+        if NO_DEPARTMENT in departments:
+            department_names.append(NO_DEPARTMENT)
+
+        self.positions = {task: position for position, task in enumerate(tasks)}  # Task -> file position
+        self.indexes = {
+            "project": projects,
+            "department": {name: departments[name] for name in department_names},
+            "progress": _progress_lanes(bands),
+        }
+
+    def lanes(self, grouping: str) -> Dict[str, List[Task]]:
+        """Return the tasks per lane of a grouping, in display order."""
+        return self.indexes[grouping]
+
+    """
+    Move a task to its new progress band after its progress was edited.
+
+    Args:
+        task (Task): Edited task, with the new progress
+        old_band (str): Band of the task before the edit
+
+    Returns:
+        bool: True if the task changed its band
+    """
+    def move_progress(self, task: Task, old_band: str) -> bool:
+        new_band = progress_band(task.progress)
+        if new_band == old_band:
+            return False
+
+        band_tasks = dict(self.indexes["progress"])
+        band_tasks[old_band] = [other for other in band_tasks[old_band] if other is not task]
+        new_lane = band_tasks.get(new_band, [])
+        position = self.positions[task]
+        index = 0
+        while index < len(new_lane) and self.positions[new_lane[index]] < position:
+            index += 1
+        band_tasks[new_band] = new_lane[:index] + [task] + new_lane[index:]
+        self.indexes["progress"] = _progress_lanes(band_tasks)
+        return True
@@ -3,13 +3,34 @@
 @author: Jan-Eric-P
 """
 
-from PyQt5.QtWidgets import QMainWindow, QGraphicsView, QGraphicsScene, QGraphicsTextItem, QToolBar, QAction, QStyle, QGraphicsItem, QGraphicsLineItem, QMessageBox, QDialog, QVBoxLayout, QTextEdit, QPushButton, QHBoxLayout, QLabel
-from PyQt5.QtCore import Qt, QRectF, QLineF, QSize
-from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QFont, QTextOption, QIcon, QPixmap
-from task_list import TaskList
+from PyQt5.QtWidgets import QMainWindow, QGraphicsView, QGraphicsScene, QGraphicsTextItem, QToolBar, QAction, QStyle, QGraphicsItem, QGraphicsLineItem, QMessageBox, QDialog, QVBoxLayout, QTextEdit, QPushButton, QHBoxLayout, QLabel, QFormLayout, QLineEdit, QSpinBox, QDialogButtonBox, QDockWidget, QFileDialog, QComboBox, QToolButton, QMenu, QInputDialog
+from PyQt5.QtCore import Qt, QRectF, QPointF, QSize, QSettings, QTimer, pyqtSignal
+from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QFont, QTextOption, QIcon, QPixmap, QPolygonF
+from task_list import TaskList, summarize_tasks, find_format
+from lane_grouping import GROUPINGS, LaneGroups, lanes_of, progress_band
+from task_layout import calculate_task_positions_parallel, update_task_positions, calculate_task_schedule, update_task_schedule
+from board_scene import BoardScene, LaneHeader
+from board_view import BoardView, BoardViewPanel, painting_view
+from minimap import MinimapWidget
+from text_cache import StaticTextCache
+from reachability import ReachabilityIndex
+from geometry_cache import GeometryCache
+from snapshot_diff import SnapshotDiff
+from progress_history import ProgressHistory
+from scenario import Scenario, SCENARIO_SUFFIX
+import memory_report
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import resources_rc
 import os
+from pathlib import Path
+
+try:
+    from workload import Workload
+    from workload_view import WorkloadHeatmap
+except ImportError:
+    # NumPy is optional, the workload panel is left out without it
+    Workload = None
 
 class TaskGraphicsItem(QGraphicsItem):
     """
@@ -17,20 +38,178 @@ class TaskGraphicsItem(QGraphicsItem):
     Encapsulates the drawing of the task box, time information, task text, and progress bar.
     """
     
+    # Labels shared by all task boxes
+    text_cache = StaticTextCache()
+    
+    # Frame of highlighted boxes
+    HIGHLIGHT_PENS = {
+        "selected": QPen(QColor(255, 140, 0), 4),
+        "upstream": QPen(QColor(0, 120, 215), 3),
+        "downstream": QPen(QColor(200, 0, 0), 3),
+    }
+    
+    # Snapshot comparison badge on the top edge of the box
+    BADGE_HEIGHT = 16
+    BADGE_COLOR = QColor(180, 95, 0)
+    
     def __init__(self, task, box_width=200, min_box_height=100, text_padding=10, 
-                 progress_bar_height=20, progress_bar_margin=10, vertical_spacing=15):
+                 progress_bar_height=20, progress_bar_margin=10, vertical_spacing=15, box_heights=None):
         super().__init__()
         self.task = task
         self.box_width = box_width
+        self.default_box_width = box_width  # Width the cached heights belong to
         self.min_box_height = min_box_height
         self.text_padding = text_padding
         self.progress_bar_height = progress_bar_height
         self.progress_bar_margin = progress_bar_margin
         self.vertical_spacing = vertical_spacing
         self.compressed_mode = False  # Default to normal mode
+        self.edit_handler = None  # Called with the task on double click
+        self.click_handler = None  # Called with the task on click
+        self.double_clicked = False  # The next release ends a double click and is no click
+        self.highlight = None  # None, "selected", "upstream" or "downstream"
+        self.cached_heights = box_heights  # (normal, compressed) height if known from the geometry cache
+        self.badge = None  # Change against a compared snapshot, e.g. "NEW" or "+20%"
+        self.history_handler = None  # Returns the recorded progress of a task, shows the sparkline if set
+        self.sparkline = None  # Recorded progress values, read on first paint
+        self.lane = None  # Lane the box is shown in, a task can be shown in several lanes
         
         # Calculate the required height for this task
-        self.box_height = self._calculate_box_height()
+        self.box_height = self._box_height()
+    
+    def refresh(self) -> bool:
+        """
+        Redraw the item after its task data changed.
+        
+        Returns:
+            bool: True if the box height changed
+        """
+        self.cached_heights = None
+        self.sparkline = None
+        return self._apply_box_height()
+    
+    def box_heights(self):
+        """Return the box height in normal and in compressed mode."""
+        if self.cached_heights is None:
+            compressed, box_width = self.compressed_mode, self.box_width
+            self.box_width = self.default_box_width
+            heights = []
+            for mode in (False, True):
+                self.compressed_mode = mode
+                heights.append(self._calculate_box_height())
+            self.compressed_mode, self.box_width = compressed, box_width
+            self.cached_heights = tuple(heights)
+        return self.cached_heights
+    
+    def _box_height(self):
+        """Return the height for the current mode, from the cached heights if known."""
+        if self.cached_heights is not None and self.box_width == self.default_box_width:
+            return self.cached_heights[int(self.compressed_mode)]
+        return self._calculate_box_height()
+    
+    def _apply_box_height(self) -> bool:
+        """Update the box height and redraw, return True if the height changed."""
+        box_height = self._box_height()
+        height_changed = box_height != self.box_height
+        if height_changed:
+            self.prepareGeometryChange()
+            self.box_height = box_height
+        self.update()
+        return height_changed
+    
+    def set_task(self, task, box_heights=None) -> bool:
+        """
+        Bind the item to new task data, used when items are reused for a reloaded board.
+        
+        Args:
+            task (Task): New task data
+            box_heights (tuple): (normal, compressed) height if known from the geometry cache
+        
+        Returns:
+            bool: True if the box height changed
+        """
+        self.task = task
+        self.cached_heights = box_heights
+        self.sparkline = None
+        return self._apply_box_height()
+    
+    def set_box_width(self, box_width):
+        """
+        Change the width of the box, used by the time-scaled mode.
+        
+        Args:
+            box_width (float): New width in scene units
+        """
+        if self.box_width != box_width:
+            self.prepareGeometryChange()
+            self.box_width = box_width
+            self.box_height = self._box_height()
+            self.update()
+    
+    def set_highlight(self, highlight):
+        """
+        Mark the item as part of a highlighted dependency chain.
+        
+        Args:
+            highlight (str): None, "selected", "upstream" or "downstream"
+        """
+        if self.highlight != highlight:
+            self.highlight = highlight
+            self.update()
+    
+    def set_badge(self, badge):
+        """
+        Mark the item as changed against a compared snapshot.
+        
+        Args:
+            badge (str): Short change text, None to remove the badge
+        """
+        if self.badge != badge:
+            # The badge reaches above the box
+            self.prepareGeometryChange()
+            self.badge = badge
+            self.update()
+    
+    def set_history_handler(self, history_handler):
+        """
+        Show or hide the progress sparkline.
+        
+        Args:
+            history_handler (callable): Returns the (timestamp, progress) pairs of a task ID,
+                                        None to hide the sparkline
+        """
+        self.history_handler = history_handler
+        self.sparkline = None
+        self.update()
+    
+    def mousePressEvent(self, event):
+        """Accept presses so the item also receives the release and the double click."""
+        self.double_clicked = False
+        if self.edit_handler is not None or self.click_handler is not None:
+            event.accept()
+        else:
+            super().mousePressEvent(event)
+    
+    def mouseReleaseEvent(self, event):
+        """Report a left click to the click handler, not the release that ends a double click."""
+        if event.button() == Qt.LeftButton and self.click_handler is not None:
+            if self.double_clicked:
+                self.double_clicked = False
+            else:
+                self.click_handler(self.task)
+            event.accept()
+        else:
+            super().mouseReleaseEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        """Open the task editor on double click."""
+        if self.edit_handler is not None:
+            # The first click of the pair was already reported on its release
+            self.double_clicked = event.button() == Qt.LeftButton
+            self.edit_handler(self.task)
+            event.accept()
+        else:
+            super().mouseDoubleClickEvent(event)
     
     def set_compressed_mode(self, compressed: bool):
         """
@@ -41,7 +220,8 @@ class TaskGraphicsItem(QGraphicsItem):
         """
         if self.compressed_mode != compressed:
             self.compressed_mode = compressed
-            self.box_height = self._calculate_box_height()
+            self.prepareGeometryChange()
+            self.box_height = self._box_height()
             # Trigger a redraw
             self.update()
     
@@ -64,7 +244,8 @@ class TaskGraphicsItem(QGraphicsItem):
             
             # Estimate text height based on text length and wrapping (same font size as normal mode)
             text_width = self.box_width - 2 * compressed_text_padding
-            estimated_chars_per_line = int(text_width / 8)  # Rough estimate
+            # Narrow boxes of the time-scaled mode still hold at least one character per line
+            estimated_chars_per_line = max(1, int(text_width / 8))  # Rough estimate
             estimated_lines = max(1, len(task_text) // estimated_chars_per_line + 1)
             text_height = estimated_lines * 16  # Same line height as normal mode
             
@@ -86,7 +267,8 @@ class TaskGraphicsItem(QGraphicsItem):
             
             # Estimate text height based on text length and wrapping
             text_width = self.box_width - 2 * self.text_padding
-            estimated_chars_per_line = int(text_width / 8)  # Rough estimate
+            # Narrow boxes of the time-scaled mode still hold at least one character per line
+            estimated_chars_per_line = max(1, int(text_width / 8))  # Rough estimate
             estimated_lines = max(1, len(task_text) // estimated_chars_per_line + 1)
             text_height = estimated_lines * 16  # Approximate line height
             
@@ -103,33 +285,70 @@ class TaskGraphicsItem(QGraphicsItem):
     
     def boundingRect(self):
         """Return the bounding rectangle of the task item."""
+        if self.badge is not None:
+            top = self.BADGE_HEIGHT / 2
+            return QRectF(0, -top, self.box_width, self.box_height + top)
         return QRectF(0, 0, self.box_width, self.box_height)
     
     def paint(self, painter, option, widget):
         """Paint the task item with all its visual elements."""
+        # Additional board views can hide projects or draw the compact style
+        view = painting_view(widget)
+        if view is not None:
+            if not view.shows(self.lane):
+                return
+            if view.interacting:
+                self._paint_outline(painter)
+                return
+        # The compact style of a view is drawn inside the shared geometry of the normal mode
+        self._paint_box(painter, self.compressed_mode or (view is not None and view.compact))
+    
+    def _paint_outline(self, painter):
+        """Paint only the box and the progress fill, used while the view is zoomed."""
+        painter.setPen(self.HIGHLIGHT_PENS.get(self.highlight, QPen(Qt.black, 1)))
+        painter.setBrush(QBrush(Qt.white))
+        painter.drawRect(0, 0, self.box_width, self.box_height)
+        try:
+            progress = min(max(int(self.task.progress), 0), 100)
+        except ValueError:
+            return
+        if not self.compressed_mode:
+            bar_y = self.box_height - self.progress_bar_height - self.progress_bar_margin
+            bar_width = self.box_width - 2 * self.text_padding
+            painter.fillRect(QRectF(self.text_padding, bar_y, bar_width, self.progress_bar_height), Qt.lightGray)
+            painter.fillRect(QRectF(self.text_padding, bar_y, bar_width * progress / 100, self.progress_bar_height), Qt.blue)
+    
+    def _paint_box(self, painter, compressed):
+        """Paint the box, texts, progress bar, sparkline and badge, in compressed style if requested."""
         painter.setRenderHint(QPainter.Antialiasing)
         
-        # Draw the main task box
-        painter.setPen(QPen(Qt.black, 1))
+        # Draw the main task box, highlighted boxes get a colored frame
+        painter.setPen(self.HIGHLIGHT_PENS.get(self.highlight, QPen(Qt.black, 1)))
         painter.setBrush(QBrush(Qt.white))
         painter.drawRect(0, 0, self.box_width, self.box_height)
         
         # Draw time information
-        self._draw_time_info(painter)
+        self._draw_time_info(painter, compressed)
         
         # Draw task text
-        self._draw_task_text(painter)
+        self._draw_task_text(painter, compressed)
         
         # Draw progress bar
-        self._draw_progress_bar(painter)
+        self._draw_progress_bar(painter, compressed)
+        
+        # Draw progress history
+        self._draw_sparkline(painter, compressed)
+        
+        # Draw snapshot comparison badge
+        self._draw_badge(painter)
     
-    def _draw_time_info(self, painter):
+    def _draw_time_info(self, painter, compressed):
         """Draw the time required and time spent information."""
         # Don't draw time info in compressed mode
-        if self.compressed_mode:
+        if compressed:
             return
             
-        if self.compressed_mode:
+        if compressed:
             # Compressed mode: smaller padding, same font size
             text_padding = 5
             font_size = 9  # Same as normal mode
@@ -140,14 +359,18 @@ class TaskGraphicsItem(QGraphicsItem):
             font_size = 9
             y_offset = 15
         
+        font = self.text_cache.font("Arial", font_size)
+        baseline = text_padding + y_offset
+        
         # Time required (top left)
-        time_required_text = f"Required: {self.task.time_required}"
+        time_required_text = self.text_cache.get(f"Required: {self.task.time_required}", font, painter.device())
         painter.setPen(Qt.black)
-        painter.setFont(QFont("Arial", font_size))
-        painter.drawText(text_padding, text_padding + y_offset, time_required_text)
+        painter.setFont(font)
+        painter.drawStaticText(QPointF(text_padding, baseline - time_required_text.ascent),
+                               time_required_text.static_text)
         
         # Time spent (top right)
-        time_spent_text = f"Spent: {self.task.time_spent}"
+        time_spent_text = self.text_cache.get(f"Spent: {self.task.time_spent}", font, painter.device())
         try:
             if int(self.task.time_spent) > int(self.task.time_required):
                 painter.setPen(Qt.red)
@@ -157,13 +380,12 @@ class TaskGraphicsItem(QGraphicsItem):
             painter.setPen(Qt.black)
         
         # Calculate position for right-aligned text
-        text_rect = painter.fontMetrics().boundingRect(time_spent_text)
-        text_x = int(self.box_width - text_padding - text_rect.width())
-        painter.drawText(text_x, text_padding + y_offset, time_spent_text)
+        text_x = int(self.box_width - text_padding - time_spent_text.width)
+        painter.drawStaticText(QPointF(text_x, baseline - time_spent_text.ascent), time_spent_text.static_text)
     
-    def _draw_task_text(self, painter):
+    def _draw_task_text(self, painter, compressed):
         """Draw the task name with department abbreviations."""
-        if self.compressed_mode:
+        if compressed:
             # Compressed mode: smaller padding, same font size, no time info
             text_padding = 5
             font_size = 10  # Same as normal mode
@@ -184,7 +406,7 @@ class TaskGraphicsItem(QGraphicsItem):
         painter.setFont(QFont("Arial", font_size))
         
         # Calculate text position (centered horizontally, below time info)
-        if self.compressed_mode:
+        if compressed:
             # Compressed mode: no time info, no progress bar, so text can extend to full height
             text_rect = QRectF(text_padding, 
                               text_padding,
@@ -200,13 +422,13 @@ class TaskGraphicsItem(QGraphicsItem):
         # Draw text with word wrapping and center alignment
         painter.drawText(text_rect, Qt.AlignCenter | Qt.TextWordWrap, task_text)
     
-    def _draw_progress_bar(self, painter):
+    def _draw_progress_bar(self, painter, compressed):
         """Draw the progress bar at the bottom of the task box."""
         # Don't draw progress bar in compressed mode
-        if self.compressed_mode:
+        if compressed:
             return
             
-        if self.compressed_mode:
+        if compressed:
             # Compressed mode: smaller progress bar
             text_padding = 5
             progress_bar_height = 12
@@ -240,54 +462,360 @@ class TaskGraphicsItem(QGraphicsItem):
             painter.drawRect(bar_x, bar_y, progress_width, progress_bar_height)
             
             # Draw progress text
-            progress_text = f"{progress}%"
+            font = self.text_cache.font("Arial", font_size, QFont.Bold)
+            progress_text = self.text_cache.get(f"{progress}%", font, painter.device())
             painter.setPen(Qt.white)
-            painter.setFont(QFont("Arial", font_size, QFont.Bold))
+            painter.setFont(font)
             
             # Center progress text on the bar
-            text_rect = painter.fontMetrics().boundingRect(progress_text)
-            text_x = int(bar_x + (self.box_width - 2 * text_padding - text_rect.width()) / 2)
-            text_y = int(bar_y + (progress_bar_height - text_rect.height()) / 2 + text_rect.height())
-            painter.drawText(text_x, text_y, progress_text)
+            text_x = int(bar_x + (self.box_width - 2 * text_padding - progress_text.width) / 2)
+            text_y = int(bar_y + (progress_bar_height - progress_text.height) / 2 + progress_text.height)
+            painter.drawStaticText(QPointF(text_x, text_y - progress_text.ascent), progress_text.static_text)
             
         except ValueError:
             pass  # Skip progress bar if progress value is invalid
+    
+    def _draw_sparkline(self, painter, compressed):
+        """Draw the recorded progress as a small line above the progress bar."""
+        # Don't draw the sparkline in compressed mode
+        if compressed or self.history_handler is None:
+            return
+        
+        # The history is only read for boxes that are actually painted
+        if self.sparkline is None:
+            self.sparkline = [progress for _, progress in self.history_handler(self.task.task_id)]
+        if len(self.sparkline) < 2:
+            return
+        
+        # Strip in the spacing between task text and progress bar
+        bottom = self.box_height - self.progress_bar_height - self.progress_bar_margin - 2
+        height = self.vertical_spacing - 4
+        width = self.box_width - 2 * self.text_padding
+        step = width / (len(self.sparkline) - 1)
+        points = [QPointF(self.text_padding + index * step, bottom - height * min(max(progress, 0), 100) / 100)
+                  for index, progress in enumerate(self.sparkline)]
+        
+        painter.setPen(QPen(QColor(0, 120, 215), 1))
+        painter.drawPolyline(QPolygonF(points))
+    
+    def _draw_badge(self, painter):
+        """Draw the snapshot comparison badge centered on the top edge."""
+        if self.badge is None:
+            return
+        
+        font = self.text_cache.font("Arial", 8, QFont.Bold)
+        badge_text = self.text_cache.get(self.badge, font, painter.device())
+        badge_width = badge_text.width + 10
+        badge_rect = QRectF((self.box_width - badge_width) / 2, -self.BADGE_HEIGHT / 2, badge_width, self.BADGE_HEIGHT)
+        
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QBrush(self.BADGE_COLOR))
+        painter.drawRoundedRect(badge_rect, 4, 4)
+        painter.setPen(Qt.white)
+        painter.setFont(font)
+        painter.drawStaticText(QPointF(badge_rect.x() + 5, badge_rect.y() + (self.BADGE_HEIGHT - badge_text.height) / 2),
+                               badge_text.static_text)
+
+class LaneSummaryItem(QGraphicsItem):
+    """
+    One-line summary bar shown instead of the tasks of a collapsed lane.
+    Shows the task count, the summed times and the average progress.
+    """
+    
+    def __init__(self, lane, summary, bar_width=600, bar_height=30):
+        super().__init__()
+        self.lane = lane
+        self.summary = summary
+        self.bar_width = bar_width
+        self.bar_height = bar_height
+    
+    def set_summary(self, summary):
+        """Replace the shown summary values."""
+        self.summary = summary
+        self.update()
+    
+    def boundingRect(self):
+        """Return the bounding rectangle of the summary bar."""
+        return QRectF(0, 0, self.bar_width, self.bar_height)
+    
+    def paint(self, painter, option, widget):
+        """Paint the bar with the average progress as background fill."""
+        view = painting_view(widget)
+        if view is not None and not view.shows(self.lane):
+            return
+        
+        painter.setPen(QPen(Qt.black, 1))
+        painter.setBrush(QBrush(Qt.white))
+        painter.drawRect(0, 0, self.bar_width, self.bar_height)
+        
+        # Average progress as light fill
+        progress_width = int(self.bar_width * min(max(self.summary['progress'], 0), 100) / 100)
+        painter.fillRect(QRectF(1, 1, max(progress_width - 1, 0), self.bar_height - 1), QColor(200, 215, 255))
+        
+        text = (f"{self.summary['tasks']} tasks  |  Required: {self.summary['time_required']}  |  "
+                f"Spent: {self.summary['time_spent']}  |  Progress: {self.summary['progress']}%")
+        painter.setPen(Qt.black)
+        painter.setFont(QFont("Arial", 9))
+        painter.drawText(QRectF(10, 0, self.bar_width - 20, self.bar_height), Qt.AlignVCenter | Qt.AlignLeft, text)
+
+class LaneSeparatorItem(QGraphicsLineItem):
+    """
+    Horizontal line below a lane, hidden in views that do not show the lane.
+    """
+
+    def __init__(self, lane):
+        super().__init__()
+        self.lane = lane
+        self.setPen(QPen(Qt.black, 2))
+
+    def paint(self, painter, option, widget):
+        """Paint the line unless the view filters out the lane."""
+        view = painting_view(widget)
+        if view is not None and not view.shows(self.lane):
+            return
+        super().paint(painter, option, widget)
+
+class ScenarioGhostItem(QGraphicsItem):
+    """
+    Dashed outline of a task at its place in a what-if scenario, drawn beside
+    the box of the task in the task file.
+    """
+
+    PEN = QPen(QColor(180, 95, 0), 2, Qt.DashLine)
+    FILL = QColor(255, 235, 210, 140)
+
+    def __init__(self, lane, label, box_width, box_height):
+        super().__init__()
+        self.lane = lane
+        self.label = label
+        self.box_width = box_width
+        self.box_height = box_height
+        self.setZValue(1)
+
+    def set_box(self, label, box_width, box_height):
+        """Change the label and the size of the outline."""
+        if (box_width, box_height) != (self.box_width, self.box_height):
+            self.prepareGeometryChange()
+            self.box_width = box_width
+            self.box_height = box_height
+        self.label = label
+        self.update()
+
+    def boundingRect(self):
+        """Return the bounding rectangle including the pen width."""
+        return QRectF(-1, -1, self.box_width + 2, self.box_height + 2)
+
+    def paint(self, painter, option, widget):
+        """Paint the dashed outline with the task ID and the scenario changes."""
+        view = painting_view(widget)
+        if view is not None and not view.shows(self.lane):
+            return
+
+        painter.setPen(self.PEN)
+        painter.setBrush(QBrush(self.FILL))
+        painter.drawRect(QRectF(0, 0, self.box_width, self.box_height))
+        painter.setPen(QColor(120, 60, 0))
+        painter.setFont(QFont("Arial", 9))
+        painter.drawText(QRectF(5, 3, self.box_width - 10, self.box_height - 6),
+                         Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, self.label)
+
+class TaskEditDialog(QDialog):
+    """
+    Dialog for editing the progress, times and dependencies of a single task.
+    """
+    
+    def __init__(self, task, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Edit {task.task_id}")
+        self.setModal(True)
+        
+        self.time_required_edit = QLineEdit(task.time_required)
+        self.time_spent_edit = QLineEdit(task.time_spent)
+        self.progress_spin = QSpinBox()
+        self.progress_spin.setRange(0, 100)
+        self.progress_spin.setSuffix("%")
+        try:
+            self.progress_spin.setValue(int(task.progress))
+        except ValueError:
+            pass
+        self.depends_on_edit = QLineEdit(" ".join(task.depends_on_task))
+        
+        form_layout = QFormLayout()
+        form_layout.addRow(QLabel(f"<b>{task.task}</b>"))
+        form_layout.addRow("Required:", self.time_required_edit)
+        form_layout.addRow("Spent:", self.time_spent_edit)
+        form_layout.addRow("Progress:", self.progress_spin)
+        form_layout.addRow("Depends on:", self.depends_on_edit)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        form_layout.addRow(buttons)
+        self.setLayout(form_layout)
+    
+    def changes(self) -> dict:
+        """Return the edited values as keyword arguments for TaskList.update_task."""
+        return {
+            'time_required': self.time_required_edit.text().strip(),
+            'time_spent': self.time_spent_edit.text().strip(),
+            'progress': str(self.progress_spin.value()),
+            'depends_on_task': self.depends_on_edit.text().split(),
+        }
+
+class MemorySettings:
+    """
+    Settings that only live as long as the window, for windows that must not
+    read or change the settings stored for the user.
+    """
+
+    def __init__(self):
+        self.values = {}
+
+    def value(self, key, default=None, type=None):
+        return self.values.get(key, default)
+
+    def setValue(self, key, value):
+        self.values[key] = value
 
 class MainWindow(QMainWindow):
     """
     Main window of the application containing a QGraphicsView as central widget.
+    A window that is not persistent uses default settings and writes neither
+    settings nor progress history nor layout cache, e.g. for batch rendering.
     """
-    def __init__(self, task_list: TaskList):
+    # Task box and lane dimensions
+    BOX_WIDTH = 200
+    MIN_BOX_HEIGHT = 100  # Minimum height for task boxes
+    SPACING = 12  # Reduced from 50 to 12 (25% of original)
+    LANE_SPACING = 50  # Doubled from 25 to 50 for better visual separation
+    MARGIN = 50  # Margin from the edges
+    HORIZONTAL_SPACING = 0  # Space between task boxes horizontally
+    LANE_HEADER_HEIGHT = 60  # Space for the project name above the tasks
+
+    # Time-scaled mode, 40 hours are as wide as a task box in dependency mode
+    PIXELS_PER_HOUR = 5
+    MIN_TIME_BOX_WIDTH = 40  # Width of tasks with few or no hours, room for the text padding
+
+    # Shown for edits of tasks that are not written back, e.g. from a remote source
+    READ_ONLY_MESSAGE = ("The tasks are read-only, changes would be lost with the next update "
+                         "of the task source. Open a scenario to try changes.")
+
+    # Interval of the memory budget check in milliseconds
+    MEMORY_CHECK_INTERVAL = 30000
+
+    # Emitted from the fetch thread with the finished future of a remote poll
+    remote_fetched = pyqtSignal(object)
+
+    def __init__(self, task_list: TaskList, memory_budget_mb: float = None, remote_source=None,
+                 poll_seconds: float = 60, persistent: bool = True):
         super().__init__()
         
         # Store task list
         self.task_list = task_list
+        self.persistent = persistent
+        self.memory_budget_mb = memory_budget_mb
+
+        # Task file published over HTTP, polled in a background thread
+        self.remote_source = remote_source
+        self.remote_executor = None
+        self.remote_future = None
+        
+        # Layout state of the displayed board, filled by display_tasks
+        self.lane_groups = None  # Tasks per lane of every grouping, built on load
+        self.lane_tasks = {}  # Lane -> tasks of the lane in display order, for the current grouping
+        self.global_positions = {}  # Task ID -> dependency column
+        self.schedule = None  # Task ID -> (start, duration) in hours, calculated for the time-scaled mode
+        self.task_items = {}  # (Lane, task) -> TaskGraphicsItem
+        self.lane_diff_summaries = {}  # Project -> changes against the compared snapshot, shown in the lane header
+        self.separator_items = {}  # Lane -> separator line below the lane
+        self.lane_geometry = {}  # Lane -> (lane y, lane extent including spacing)
+        self.summary_items = {}  # Lane -> summary bar of a collapsed lane
+
+        # Geometry of unchanged boards is loaded instead of calculated
+        self.geometry_cache = None
+        self.geometry_cache_path = None
+
+        # Transitive dependencies for the chain highlighting
+        self.reachability = ReachabilityIndex()
+        self.highlighted_task_id = None
+        self.highlighted_items = []
+
+        # Changes against a compared older snapshot of the task file
+        self.snapshot_diff = None
+
+        # Recorded progress and spent time, shown as sparklines
+        self.progress_history = None
+        self.progress_history_path = None
+
+        # What-if scenarios over the loaded tasks, the active one is shown
+        # instead of the task file or beside it
+        self.scenarios = []
+        self.scenario = None
+        self.ghost_items = {}  # (Lane, task) -> outline of the task in the active scenario
+
+        # Grouping and collapsed lanes are remembered between sessions
+        self.settings = QSettings("Jan-Eric-P", "TaskTool") if persistent else MemorySettings()
+        self.grouping = self.settings.value("grouping", "project")
+        if self.grouping not in GROUPINGS:
+            self.grouping = "project"
+        self.collapsed_lanes = set(self.settings.value(self._collapsed_key(), [], type=list))
         
         # Set window properties
         self.setWindowTitle("Task Tool")
         self.resize(800, 600)
         
         # Create graphics scene and view
-        self.scene = QGraphicsScene()
-        self.view = QGraphicsView(self.scene)
-        
-        # Configure view
-        self.view.setRenderHint(QPainter.Antialiasing)
-        self.view.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
-        self.view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
-        self.view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
-        self.view.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
-        self.view.setResizeAnchor(QGraphicsView.AnchorUnderMouse)
+        self.scene = BoardScene()
+        self.scene.lane_header_handler = self.toggle_lane
+        self.view = BoardView(self.scene)
         
         # Set view as central widget
         self.setCentralWidget(self.view)
 
+        # Create minimap dock next to the view
+        self.minimap = MinimapWidget(self.view)
+        self.minimap_dock = QDockWidget("Overview", self)
+        self.minimap_dock.setObjectName("OverviewDock")
+        self.minimap_dock.setWidget(self.minimap)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.minimap_dock)
+
+        # Create department workload dock below the view
+        self.workload = None
+        self.workload_dock = None
+        if Workload is not None:
+            self.workload_heatmap = WorkloadHeatmap()
+            self.workload_dock = QDockWidget("Workload", self)
+            self.workload_dock.setObjectName("WorkloadDock")
+            self.workload_dock.setWidget(self.workload_heatmap)
+            self.addDockWidget(Qt.BottomDockWidgetArea, self.workload_dock)
+
+        # Additional views of the same scene, each in its own dock
+        self.view_panels = []
+
+        # Caches that report their size and can shrink under the memory budget
+        self.memory_caches = {"minimap": self.minimap, "static_text": TaskGraphicsItem.text_cache}
+
         # Create toolbar
         self.create_toolbar()
 
         # Display tasks
         self.display_tasks()
 
+        # Keep the memory use below the configured budget
+        if self.memory_budget_mb is not None:
+            self.memory_timer = QTimer(self)
+            self.memory_timer.timeout.connect(self.check_memory_budget)
+            self.memory_timer.start(self.MEMORY_CHECK_INTERVAL)
+            QTimer.singleShot(0, self.check_memory_budget)
+
+        # Poll the remote task source, the signal delivers the result in the GUI thread
+        if self.remote_source is not None:
+            self.remote_executor = ThreadPoolExecutor(max_workers=1)
+            self.remote_fetched.connect(self.apply_remote_fetch)
+            self.remote_timer = QTimer(self)
+            self.remote_timer.timeout.connect(self.poll_remote_source)
+            self.remote_timer.start(int(poll_seconds * 1000))
+
     """
     Create toolbar with zoom controls.
     """
@@ -316,6 +844,29 @@ class MainWindow(QMainWindow):
         # Add separator
         toolbar.addSeparator()
 
+        # Reload action
+        reload_action = QAction(self.style().standardIcon(QStyle.SP_BrowserReload), "Reload", self)
+        reload_action.setStatusTip("Reload the task file")
+        reload_action.triggered.connect(self.reload_tasks)
+        toolbar.addAction(reload_action)
+
+        # Compare with snapshot action
+        self.compare_action = QAction("Compare", self)
+        self.compare_action.setStatusTip("Mark the changes against an older snapshot of the task file")
+        self.compare_action.setCheckable(True)
+        self.compare_action.triggered.connect(self.toggle_snapshot_compare)
+        toolbar.addAction(self.compare_action)
+
+        # Toggle progress history action
+        self.history_action = QAction("History", self)
+        self.history_action.setStatusTip("Show the recorded progress of each task as sparkline")
+        self.history_action.setCheckable(True)
+        self.history_action.triggered.connect(self.toggle_history)
+        toolbar.addAction(self.history_action)
+
+        # Add separator
+        toolbar.addSeparator()
+
         # Toggle compressed mode action
         self.toggle_compressed_action = QAction(QIcon(":/icons/compress_24dp.png"), "Compressed Mode", self)
         self.toggle_compressed_action.setStatusTip("Toggle compressed/compact view")
@@ -323,6 +874,69 @@ class MainWindow(QMainWindow):
         self.toggle_compressed_action.triggered.connect(self.toggle_compressed_mode)
         toolbar.addAction(self.toggle_compressed_action)
 
+        # Toggle time-scaled mode action
+        self.time_scale_action = QAction("Time Scale", self)
+        self.time_scale_action.setStatusTip("Place and size the tasks by their required hours on a time axis")
+        self.time_scale_action.setCheckable(True)
+        self.time_scale_action.triggered.connect(self.toggle_time_scale)
+        toolbar.addAction(self.time_scale_action)
+
+        # Lane grouping selection
+        self.grouping_combo = QComboBox()
+        self.grouping_combo.setToolTip("Group the lanes by project, by department or by progress")
+        for grouping in GROUPINGS:
+            self.grouping_combo.addItem(f"By {grouping}", grouping)
+        self.grouping_combo.setCurrentIndex(self.grouping_combo.findData(self.grouping))
+        self.grouping_combo.currentIndexChanged.connect(
+            lambda index: self.set_grouping(self.grouping_combo.itemData(index)))
+        toolbar.addWidget(self.grouping_combo)
+
+        # What-if scenario selection and actions
+        self.scenario_combo = QComboBox()
+        self.scenario_combo.setToolTip("Show the task file or a what-if scenario, edits change only the scenario")
+        self.scenario_combo.addItem("Task file")
+        self.scenario_combo.currentIndexChanged.connect(
+            lambda index: self.set_scenario(self.scenarios[index - 1] if index > 0 else None))
+        toolbar.addWidget(self.scenario_combo)
+
+        scenario_menu = QMenu(self)
+        scenario_menu.addAction("New Scenario...", self.new_scenario)
+        scenario_menu.addAction("Open Scenario...", self.open_scenario)
+        self.save_scenario_action = scenario_menu.addAction("Save Scenario...", self.save_scenario)
+        self.close_scenario_action = scenario_menu.addAction("Close Scenario", self.close_scenario)
+        scenario_menu.addSeparator()
+        self.scenario_beside_action = scenario_menu.addAction("Beside Task File")
+        self.scenario_beside_action.setStatusTip("Show the task file with the scenario places of the affected tasks as outlines")
+        self.scenario_beside_action.setCheckable(True)
+        self.scenario_beside_action.triggered.connect(self.toggle_scenario_beside)
+        for action in (self.save_scenario_action, self.close_scenario_action):
+            action.setEnabled(False)
+        scenario_button = QToolButton()
+        scenario_button.setText("Scenario")
+        scenario_button.setToolTip("Create, open and save what-if scenarios")
+        scenario_button.setPopupMode(QToolButton.InstantPopup)
+        scenario_button.setMenu(scenario_menu)
+        toolbar.addWidget(scenario_button)
+
+        # Toggle overview action
+        toolbar.addAction(self.minimap_dock.toggleViewAction())
+
+        # Add board view action
+        add_view_action = QAction("Add View", self)
+        add_view_action.setStatusTip("Open another view of the board with its own zoom, project filter and style")
+        add_view_action.triggered.connect(self.add_board_view)
+        toolbar.addAction(add_view_action)
+
+        # Toggle workload action
+        if self.workload_dock is not None:
+            toolbar.addAction(self.workload_dock.toggleViewAction())
+
+        # Memory report action
+        memory_action = QAction("Memory", self)
+        memory_action.setStatusTip("Show memory use per subsystem")
+        memory_action.triggered.connect(self.show_memory_report)
+        toolbar.addAction(memory_action)
+
         # Add separator
         toolbar.addSeparator()
 
@@ -342,13 +956,13 @@ class MainWindow(QMainWindow):
     Zoom in by scaling the view.
     """
     def zoom_in(self):
-        self.view.scale(1.2, 1.2)
+        self.view.zoom_by(self.view.ZOOM_STEP)
 
     """
     Zoom out by scaling the view.
     """
     def zoom_out(self):
-        self.view.scale(1/1.2, 1/1.2)
+        self.view.zoom_by(1 / self.view.ZOOM_STEP)
 
     """
     Reset zoom level to 1.0.
@@ -363,127 +977,48 @@ class MainWindow(QMainWindow):
         """Toggle between compressed and normal display modes for all task items."""
         compressed = self.toggle_compressed_action.isChecked()
         
-        # Find all TaskGraphicsItem objects in the scene
-        for item in self.scene.items():
-            if isinstance(item, TaskGraphicsItem):
-                item.set_compressed_mode(compressed)
+        for item in self.task_items.values():
+            item.set_compressed_mode(compressed)
         
         # Recalculate vertical positioning for all task items
         self.reposition_task_items()
         
         # Update the scene to reflect the changes
         self.scene.update()
-        
-        # Adjust scene rect to show all items with padding
-        self.scene.setSceneRect(self.scene.itemsBoundingRect().adjusted(-50, -50, 50, 50))
 
     """
     Reposition all task items after compressed mode changes.
     """
     def reposition_task_items(self):
         """Recalculate and update the vertical positions of all task items."""
-        # Task box dimensions
-        box_width = 200
-        spacing = 12  # Reduced from 50 to 12 (25% of original)
-        lane_spacing = 50  # Doubled from 25 to 50 for better visual separation
-        margin = 50
-        horizontal_spacing = 0
-
-        # Group tasks by project
-        project_tasks = defaultdict(list)
-        for task in self.task_list.tasks:
-            project_tasks[task.project].append(task)
+        self.relayout_lanes()
 
-        # Calculate global positions for all tasks
-        global_positions = self.calculate_task_positions(self.task_list.tasks)
-
-        # Collect all separator lines first
-        separator_lines = [item for item in self.scene.items() if isinstance(item, QGraphicsLineItem)]
-        line_index = 0
-
-        # Reposition tasks in each lane
-        current_y = margin
-        for project, tasks in project_tasks.items():
-            # Find project name item
-            project_items = [item for item in self.scene.items() 
-                           if isinstance(item, QGraphicsTextItem) and item.toPlainText() == project]
-            if project_items:
-                project_text = project_items[0]
-                project_text.setPos(margin, current_y)
-
-            # Reposition tasks in this lane
-            task_y = current_y + 60  # Increased from 40 to 60 to accommodate larger project name
-            max_x = margin
-            lane_height = 0
-            
-            for task in tasks:
-                # Find the task item
-                task_items = [item for item in self.scene.items() 
-                            if isinstance(item, TaskGraphicsItem) and item.task.task_id == task.task_id]
-                if task_items:
-                    task_item = task_items[0]
-                    
-                    # Calculate horizontal position using global positions
-                    x_pos = margin + global_positions[task.task_id] * (box_width + horizontal_spacing)
-                    
-                    # Update position
-                    task_item.setPos(x_pos, task_y)
-                    
-                    # Update tracking variables
-                    max_x = max(max_x, x_pos + box_width)
-                    lane_height = max(lane_height, task_y + task_item.box_height - (current_y + 60))
-                    
-                    task_y += task_item.box_height + spacing
-
-            # Update separator line position (if not the last project)
-            if project != list(project_tasks.keys())[-1] and line_index < len(separator_lines):
-                line = separator_lines[line_index]
-                line_y = current_y + 60 + lane_height + 25  # Updated to use 60 instead of 40
-                line.setLine(margin, line_y, max_x + 50, line_y)
-                line_index += 1
-
-            # Move to next lane
-            current_y += 60 + lane_height + lane_spacing
+    """
+    Switch between columns by dependency depth and the time-scaled mode. The
+    existing task items are only moved and resized.
+    """
+    def toggle_time_scale(self):
+        if self.time_scale_action.isChecked():
+            if self.schedule is None:
+                self.schedule = calculate_task_schedule(self.task_list.tasks)
+            if self.scenario is not None and self.scenario.schedule is None:
+                self.scenario.attach_layout(self.global_positions, self.schedule)
+            self.scene.set_time_axis(self.MARGIN, self.PIXELS_PER_HOUR)
+        else:
+            self.scene.set_time_axis(None)
+        self.relayout_lanes()
 
     def calculate_task_positions(self, all_tasks):
         """
         Calculate horizontal positions for all tasks based on their dependencies (project-overarching).
         Returns a dictionary mapping task IDs to their x-positions.
+        Large boards are laid out per connected component in parallel processes.
         """
-        # Create task lookup dictionary
-        task_dict = {task.task_id: task for task in all_tasks}
-        positions = {}
-        # To avoid infinite recursion in case of circular dependencies
-        visited = set()
-
-        def get_position(task):
-            if task.task_id in positions:
-                return positions[task.task_id]
-            if task.task_id in visited:
-                # Circular dependency fallback
-                return 0
-            visited.add(task.task_id)
-            if not task.depends_on_task:
-                pos = 0
-            else:
-                dep_positions = []
-                for dep_id in task.depends_on_task:
-                    dep_task = task_dict.get(dep_id)
-                    if dep_task:
-                        dep_positions.append(get_position(dep_task))
-                if dep_positions:
-                    pos = max(dep_positions) + 1
-                else:
-                    pos = 0
-            positions[task.task_id] = pos
-            return pos
-
-        for task in all_tasks:
-            get_position(task)
-        return positions
+        return calculate_task_positions_parallel(all_tasks)
 
     """
-    Display tasks as rectangles with centered text, grouped by project in swim lanes.
+    Display tasks as rectangles with centered text, grouped in swim lanes by
+    project, department or progress band.
     Each task box shows:
     - Time information (Required/Spent) in the upper corners
     - Task name with department abbreviations in the center
@@ -491,70 +1026,989 @@ class MainWindow(QMainWindow):
     Tasks are arranged horizontally based on their dependencies.
     """
     def display_tasks(self):
-        # Clear existing items
-        self.scene.clear()
-
-        # Task box dimensions
-        box_width = 200
-        min_box_height = 100  # Minimum height for task boxes
-        spacing = 12  # Reduced from 50 to 12 (25% of original)
-        lane_spacing = 50  # Doubled from 25 to 50 for better visual separation
-        margin = 50  # Margin from the edges
-        horizontal_spacing = 0  # Space between task boxes horizontally
-
-        # Group tasks by project
-        project_tasks = defaultdict(list)
-        for task in self.task_list.tasks:
-            project_tasks[task.project].append(task)
+        # Record the changed progress and spent times of this load
+        self.record_history(self.task_list.tasks)
+
+        # The lanes of all groupings are indexed once, switching only selects another index
+        self.lane_groups = LaneGroups(self.task_list.tasks)
+        project_tasks = self.lane_groups.lanes("project")
+
+        # Take unchanged geometry from the cache, calculate the rest
+        geometry_cache = self._geometry_cache()
+        columns, lane_heights = None, {}
+        if geometry_cache is not None:
+            columns, lane_heights = geometry_cache.load(self.task_list.tasks, project_tasks)
 
         # Calculate global positions for all tasks
-        global_positions = self.calculate_task_positions(self.task_list.tasks)
-
-        # Draw swim lanes for each project
-        current_y = margin
-        for project, tasks in project_tasks.items():
-            # Draw project name
-            project_text = QGraphicsTextItem(project)
-            font = QFont()
-            font.setBold(True)
-            font.setPointSize(20)  # Doubled from default ~10 to 20
-            project_text.setFont(font)
-            project_text.setDefaultTextColor(Qt.black)
-            project_text.setPos(margin, current_y)
-            self.scene.addItem(project_text)
-
-            # Draw tasks in this lane
-            task_y = current_y + 60  # Increased from 40 to 60 to accommodate larger project name
-            max_x = margin  # Track the rightmost position in this lane
-            lane_height = 0  # Track the total height of this lane
-            
-            for task in tasks:
-                # Calculate horizontal position using global positions
-                x_pos = margin + global_positions[task.task_id] * (box_width + horizontal_spacing)
-                
-                # Create and add the task graphics item
-                task_item = TaskGraphicsItem(task, box_width, min_box_height)
-                task_item.setPos(x_pos, task_y)
-                self.scene.addItem(task_item)
-                
-                # Update tracking variables
-                max_x = max(max_x, x_pos + box_width)
-                lane_height = max(lane_height, task_y + task_item.box_height - (current_y + 60))  # Height from project name to bottom of this task
-                
-                task_y += task_item.box_height + spacing
+        if columns is not None:
+            self.global_positions = columns
+        else:
+            self.global_positions = self.calculate_task_positions(self.task_list.tasks)
+        self.reachability.update(self.task_list.tasks)
+        self.schedule = calculate_task_schedule(self.task_list.tasks) if self.time_scale_action.isChecked() else None
+
+        # Scenarios keep their changes on top of the new tasks
+        for scenario in self.scenarios:
+            scenario.rebase(self.task_list)
+        if self.scenario is not None:
+            self.scenario.attach_layout(self.global_positions, self.schedule)
+
+        self.show_lanes(lane_heights)
+        self.update_workload(rebuild=True)
+
+        # Store the geometry of the project lanes that had to be calculated
+        if geometry_cache is not None:
+            for project, tasks in project_tasks.items():
+                if project not in lane_heights:
+                    task_items = [self.task_item_of(task) for task in tasks]
+                    if None not in task_items:
+                        lane_heights[project] = [task_item.box_heights() for task_item in task_items]
+            geometry_cache.save(self.task_list.tasks, project_tasks, self.global_positions, lane_heights)
+
+    """
+    Create or reuse the items of the lanes of the current grouping and lay
+    them out. Task items are reused by TaskId, so reloading or switching the
+    grouping keeps their measured box heights. Only tasks that are shown in
+    more lanes than before get new items.
+
+    Args:
+        lane_heights (dict): Per project lane the (normal, compressed) height
+                             of each task from the geometry cache
+    """
+    def show_lanes(self, lane_heights=None):
+        task_pool = defaultdict(list)
+        for task_item in self.task_items.values():
+            task_pool[task_item.task.task_id].append(task_item)
+        separator_pool = self.separator_items
+        summary_pool = self.summary_items
+
+        self.task_items = {}
+        self.separator_items = {}
+        self.lane_geometry = {}
+        self.summary_items = {}
+        self.lane_tasks = self.lane_groups.lanes(self.grouping)
+
+        # Create or reuse the items of each swim lane, they are positioned by relayout_lanes
+        lanes = list(self.lane_tasks.keys())
+        for lane, tasks in self.lane_tasks.items():
+            # Draw tasks in this lane, or only the summary bar if it is collapsed
+            if lane in self.collapsed_lanes:
+                summary_item = summary_pool.pop(lane, None)
+                if summary_item is None:
+                    self._create_summary_item(lane)
+                else:
+                    summary_item.set_summary(summarize_tasks(tasks))
+                    self.summary_items[lane] = summary_item
+            else:
+                heights = lane_heights.get(lane) if lane_heights and self.grouping == "project" else None
+                for index, task in enumerate(tasks):
+                    shown_task = self.shown_task(task)
+                    # Cached heights belong to the task file data
+                    box_heights = heights[index] if heights is not None and shown_task is task else None
+                    pooled_items = task_pool.get(task.task_id)
+                    if pooled_items:
+                        task_item = pooled_items.pop()
+                        # Items of the same task object keep their measured heights
+                        if task_item.task is not shown_task or box_heights is not None:
+                            task_item.set_task(shown_task, box_heights)
+                        task_item.lane = lane
+                        self.task_items[(lane, task)] = task_item
+                    else:
+                        self._create_task_item(lane, task, box_heights)
 
             # Draw horizontal separator line
-            if project != list(project_tasks.keys())[-1]:  # Don't draw line after last project
-                line_y = current_y + 60 + lane_height + 25  # Updated to use 60 instead of 40
-                line = QLineF(margin, line_y, 
-                            max_x + 50, line_y)  # Line extends to the rightmost task plus padding
-                self.scene.addLine(line, QPen(Qt.black, 2))
+            if lane != lanes[-1]:  # Don't draw line after last lane
+                line = separator_pool.pop(lane, None)
+                if line is None:
+                    line = LaneSeparatorItem(lane)
+                    self.scene.addItem(line)
+                self.separator_items[lane] = line
+
+        # Remove the items that were not reused
+        for pooled_items in task_pool.values():
+            for task_item in pooled_items:
+                self.scene.removeItem(task_item)
+        for pool in (separator_pool, summary_pool):
+            for item in pool.values():
+                self.scene.removeItem(item)
+
+        # Show the highlighted chain with the new data
+        if self.highlighted_task_id is not None:
+            self.highlight_chain(self.highlighted_task_id)
+
+        self.apply_snapshot_diff()
+        self.relayout_lanes()
+
+    """
+    Switch the lane grouping. The board is not laid out again: the lanes are
+    taken from the prebuilt index and the existing task items are reused.
+
+    Args:
+        grouping (str): One of GROUPINGS
+    """
+    def set_grouping(self, grouping):
+        if grouping == self.grouping:
+            return
+        self.grouping = grouping
+        self.settings.setValue("grouping", grouping)
+        self.collapsed_lanes = set(self.settings.value(self._collapsed_key(), [], type=list))
+        if self.grouping_combo.currentData() != grouping:
+            self.grouping_combo.setCurrentIndex(self.grouping_combo.findData(grouping))
+        self.show_lanes()
+
+    def _collapsed_key(self):
+        """Return the settings key of the collapsed lanes of the current grouping."""
+        return "collapsed_projects" if self.grouping == "project" else f"collapsed_{self.grouping}_lanes"
 
-            # Move to next lane: project name (60) + lane height + spacing
-            current_y += 60 + lane_height + lane_spacing
+    def task_items_of(self, task):
+        """Return the items of a task in all its lanes, tasks of collapsed lanes have none."""
+        return [self.task_items[(lane, task)] for lane in lanes_of(task, self.grouping) if (lane, task) in self.task_items]
+
+    def task_item_of(self, task):
+        """Return one item of a task, None if all its lanes are collapsed."""
+        task_items = self.task_items_of(task)
+        return task_items[0] if task_items else None
+
+    def shows_scenario(self):
+        """Return True if the boxes show the active scenario instead of the task file."""
+        return self.scenario is not None and not self.scenario_beside_action.isChecked()
+
+    def shown_task(self, task):
+        """Return the data the items of a task show, the scenario copy of a changed task if the scenario is shown."""
+        return self.scenario.changed_tasks.get(task.task_id, task) if self.shows_scenario() else task
+
+    def board_layout(self):
+        """Return the columns and the schedule the boxes are placed by."""
+        if self.shows_scenario():
+            return self.scenario.positions, self.scenario.schedule
+        return self.global_positions, self.schedule
+
+    def badge_of(self, task_id):
+        """Return the badge of a task: its scenario changes, otherwise its snapshot changes."""
+        badge = self.scenario.badge(task_id) if self.scenario is not None else None
+        if badge is None and self.snapshot_diff is not None:
+            badge = self.snapshot_diff.badge(task_id)
+        return badge
+
+    """
+    Aggregate the department workload and show it in the heatmap.
+
+    Args:
+        rebuild (bool): True after loading the tasks
+        task (Task): Task whose times were edited
+        moved (set): IDs of the tasks whose dependency column changed
+    """
+    def update_workload(self, rebuild=False, task=None, moved=()):
+        if Workload is None:
+            return
+        if rebuild or self.workload is None:
+            self.workload = Workload(self.task_list.tasks, self.global_positions)
+        else:
+            if task is not None:
+                self.workload.update_task(task)
+            self.workload.update_columns(self.global_positions, moved)
+            self.workload.aggregate()
+        self.workload_heatmap.set_workload(self.workload)
+
+    """
+    Return the geometry cache of the current task file, None if the tasks
+    were not read from a file or the window is not persistent.
+    """
+    def _geometry_cache(self):
+        if self.task_list.file_path is None or not self.persistent:
+            return None
+        if self.geometry_cache is None or self.geometry_cache_path != self.task_list.file_path:
+            layout_params = {"box_width": self.BOX_WIDTH, "min_box_height": self.MIN_BOX_HEIGHT}
+            self.geometry_cache = GeometryCache(self.task_list.file_path, layout_params)
+            self.geometry_cache_path = self.task_list.file_path
+        return self.geometry_cache
+
+    """
+    Return the progress history of the current task file, None if the tasks
+    were not read from a file or the window is not persistent.
+    """
+    def _progress_history(self):
+        if self.task_list.file_path is None or not self.persistent:
+            return None
+        if self.progress_history is None or self.progress_history_path != self.task_list.file_path:
+            if self.progress_history is not None:
+                self.progress_history.close()
+            self.progress_history = ProgressHistory(self.task_list.file_path)
+            self.progress_history_path = self.task_list.file_path
+        return self.progress_history
+
+    """
+    Append the changed values of tasks to the progress history. The history
+    is optional, so write errors only show a status message.
+
+    Args:
+        tasks (List[Task]): Tasks to compare with their last recorded values
+    """
+    def record_history(self, tasks):
+        progress_history = self._progress_history()
+        if progress_history is None:
+            return
+        try:
+            progress_history.record(tasks)
+        except OSError as error:
+            self.statusBar().showMessage(f"Progress history not saved: {error}")
+
+    """
+    Return the recorded (timestamp, progress) pairs of a task.
+    """
+    def progress_series(self, task_id):
+        progress_history = self._progress_history()
+        if progress_history is None:
+            return []
+        return progress_history.progress_series(task_id)
+
+    """
+    Show or hide the progress sparklines of all task boxes.
+    """
+    def toggle_history(self):
+        history_handler = self.progress_series if self.history_action.isChecked() else None
+        for task_item in self.task_items.values():
+            task_item.set_history_handler(history_handler)
+
+    """
+    Read the task file again and update the board. Items of tasks that still
+    exist are reused.
+    """
+    def reload_tasks(self):
+        # A remote source is fetched now instead of waiting for the next poll
+        if self.remote_source is not None:
+            self.poll_remote_source()
+            return
+        try:
+            self.task_list.read(self.task_list.file_path, self.task_list.file_format)
+        except (OSError, ValueError) as error:
+            QMessageBox.warning(self, "Task Tool - Reload", str(error))
+            return
+        self.refresh_snapshot_diff()
+        self.display_tasks()
+
+    """
+    Fetch the remote task source in the background thread. A poll is skipped
+    while the previous one is still running.
+    """
+    def poll_remote_source(self):
+        if self.remote_future is not None and not self.remote_future.done():
+            return
+        self.remote_future = self.remote_executor.submit(self.remote_source.fetch)
+        self.remote_future.add_done_callback(self.remote_fetched.emit)
+
+    """
+    Show the tasks of a finished remote poll. An unchanged source keeps the
+    board as it is, errors keep the current tasks and show a status message.
+
+    Args:
+        future (Future): Finished fetch of the remote source
+    """
+    def apply_remote_fetch(self, future):
+        try:
+            task_list = future.result()
+        except (OSError, ValueError) as error:
+            self.statusBar().showMessage(f"Task source not updated: {error}")
+            return
+        if task_list is None:
+            return
+        self.task_list = task_list
+        self.refresh_snapshot_diff()
+        self.display_tasks()
+        self.statusBar().showMessage(f"Tasks updated from {self.remote_source.url}", 5000)
+
+    """
+    Stop polling the remote task source when the window closes.
+    """
+    def closeEvent(self, event):
+        if self.remote_executor is not None:
+            self.remote_timer.stop()
+            self.remote_executor.shutdown(wait=False, cancel_futures=True)
+        super().closeEvent(event)
+
+    """
+    Start comparing with an older snapshot of the task file, or stop it.
+    """
+    def toggle_snapshot_compare(self):
+        if not self.compare_action.isChecked():
+            self.snapshot_diff = None
+            self.apply_snapshot_diff()
+            self.statusBar().clearMessage()
+            return
+
+        file_path = None
+        if self.task_list.file_path is not None:
+            file_path, _ = QFileDialog.getOpenFileName(self, "Compare with Snapshot", os.path.dirname(self.task_list.file_path),
+                                                       "Task files (*.csv *.jsonl *.ndjson *.tcol);;All files (*)")
+        if not file_path or not self.compare_snapshot(file_path):
+            self.compare_action.setChecked(False)
+
+    """
+    Compare the task file with an older snapshot and mark the changes.
+
+    Args:
+        old_path (str): Path of the older snapshot
+
+    Returns:
+        bool: True if the snapshot could be compared
+    """
+    def compare_snapshot(self, old_path):
+        try:
+            self.snapshot_diff = SnapshotDiff(old_path, self.task_list.file_path, self.task_list.file_format,
+                                              self.snapshot_format(old_path))
+        except (OSError, ValueError) as error:
+            QMessageBox.warning(self, "Task Tool - Compare", str(error))
+            return False
+        self.apply_snapshot_diff()
+
+        changes = list(self.snapshot_diff.changes.values())
+        added = sum(1 for change in changes if change.status == "added")
+        self.statusBar().showMessage(f"Compared with {os.path.basename(old_path)}: {added} added, "
+                                     f"{len(self.snapshot_diff.removed)} removed, {len(changes) - added} changed")
+        return True
+
+    """
+    Return the format of a snapshot: the format of the task file, which may
+    be configured or overridden, for a snapshot with the same or an unknown
+    suffix, otherwise the format of its suffix.
+    """
+    def snapshot_format(self, old_path):
+        old_path = Path(old_path)
+        if self.task_list.file_path is not None and old_path.suffix != self.task_list.file_path.suffix:
+            try:
+                return find_format(old_path)
+            except ValueError:
+                pass
+        return self.task_list.file_format
+
+    """
+    Compare the written or reloaded task file again with the same snapshot.
+    """
+    def refresh_snapshot_diff(self):
+        if self.snapshot_diff is not None and not self.compare_snapshot(self.snapshot_diff.old_path):
+            self.snapshot_diff = None
+            self.compare_action.setChecked(False)
+            self.apply_snapshot_diff()
+
+    """
+    Compare an edited task again with the snapshot, without reading the
+    files again. Only the badges of the task and the lane headers change.
+    """
+    def update_snapshot_diff(self, task):
+        if self.snapshot_diff is None or not self.snapshot_diff.update_task(task):
+            return
+        for task_item in self.task_items_of(task):
+            task_item.set_badge(self.badge_of(task.task_id))
+        if self.grouping == "project":
+            self.lane_diff_summaries = self.snapshot_diff.project_summary()
+            self.update_lane_headers()
+
+    """
+    Show the current snapshot comparison as badges on the task items and as
+    change counts in the lane headers.
+    """
+    def apply_snapshot_diff(self):
+        project_summary = self.snapshot_diff.project_summary() if self.snapshot_diff is not None else {}
+        for (lane, task), task_item in self.task_items.items():
+            task_item.set_badge(self.badge_of(task.task_id))
+        # The change counts are per project, other groupings show only the badges
+        self.lane_diff_summaries = project_summary if self.grouping == "project" else {}
+        self.update_lane_headers()
+
+    """
+    Create an empty scenario over the loaded tasks and show it.
+    """
+    def new_scenario(self):
+        name, accepted = QInputDialog.getText(self, "Task Tool - New Scenario", "Name:",
+                                              text=f"Scenario {len(self.scenarios) + 1}")
+        if accepted and name.strip():
+            self.add_scenario(Scenario(self.task_list, name.strip()))
+
+    """
+    Open a scenario delta file and show it.
+    """
+    def open_scenario(self):
+        directory = os.path.dirname(self.task_list.file_path) if self.task_list.file_path is not None else ""
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open Scenario", directory,
+                                                   f"Scenarios (*{SCENARIO_SUFFIX});;All files (*)")
+        if not file_path:
+            return
+        scenario = Scenario(self.task_list)
+        try:
+            scenario.read(file_path)
+        except (OSError, ValueError) as error:
+            QMessageBox.warning(self, "Task Tool - Open Scenario", str(error))
+            return
+        self.add_scenario(scenario)
+
+    """
+    Write the changes of the active scenario to its delta file, asks for
+    the file if the scenario was not saved before.
+
+    Returns:
+        bool: True if the scenario was written
+    """
+    def save_scenario(self):
+        scenario = self.scenario
+        if scenario is None:
+            return False
+        file_path = scenario.file_path
+        if file_path is None:
+            directory = os.path.dirname(self.task_list.file_path) if self.task_list.file_path is not None else ""
+            file_path, _ = QFileDialog.getSaveFileName(self, "Save Scenario",
+                                                       os.path.join(directory, f"{scenario.name}{SCENARIO_SUFFIX}"),
+                                                       f"Scenarios (*{SCENARIO_SUFFIX})")
+            if not file_path:
+                return False
+        try:
+            scenario.write(file_path)
+        except (OSError, ValueError) as error:
+            QMessageBox.warning(self, "Task Tool - Save Scenario", str(error))
+            return False
+        self.statusBar().showMessage(f"Scenario {scenario.name} saved to {os.path.basename(file_path)}", 5000)
+        return True
+
+    """
+    Close the active scenario, asks to save unsaved changes, and show the
+    task file again.
+    """
+    def close_scenario(self):
+        scenario = self.scenario
+        if scenario is None:
+            return
+        if scenario.modified:
+            answer = QMessageBox.question(self, "Task Tool - Close Scenario", f"Save the changes of {scenario.name}?",
+                                          QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel)
+            if answer == QMessageBox.Cancel or (answer == QMessageBox.Save and not self.save_scenario()):
+                return
+        index = self.scenarios.index(scenario)
+        self.scenario_combo.setCurrentIndex(0)
+        self.scenarios.pop(index)
+        self.scenario_combo.removeItem(index + 1)
+
+    """
+    Add a scenario to the selection and show it.
+    """
+    def add_scenario(self, scenario):
+        self.scenarios.append(scenario)
+        self.scenario_combo.addItem(scenario.name)
+        self.scenario_combo.setCurrentIndex(len(self.scenarios))
+
+    """
+    Show a scenario instead of the task file, or beside it. Only the tasks
+    changed or placed differently by the previous or the new scenario are
+    updated.
+
+    Args:
+        scenario (Scenario): Scenario to show, None for the task file
+    """
+    def set_scenario(self, scenario):
+        if scenario is self.scenario:
+            return
+        task_ids = self.scenario.affected_task_ids() if self.scenario is not None else set()
+        self.scenario = scenario
+        if scenario is not None:
+            # The task file may have been edited since the scenario was shown
+            scenario.rebase(self.task_list)
+            task_ids |= scenario.attach_layout(self.global_positions, self.schedule)
+        for action in (self.save_scenario_action, self.close_scenario_action):
+            action.setEnabled(scenario is not None)
+        self.apply_scenario(task_ids)
+
+    """
+    Switch between the scenario in place of the task file and the task file
+    with the scenario places as outlines.
+    """
+    def toggle_scenario_beside(self):
+        if self.scenario is not None:
+            self.apply_scenario(self.scenario.affected_task_ids())
+
+    """
+    Change a task in the active scenario. The task file is not written, only
+    the changed task and its downstream subgraph are placed again.
+
+    Args:
+        task_id (str): ID of the task to change
+        **changes: Fields to change, see Scenario.update_task
+    """
+    def edit_scenario_task(self, task_id, **changes):
+        task_ids = {task_id}
+        self.scenario.update_task(task_id, **changes)
+        task_ids |= self.scenario.update_layout(task_id)
+        self.apply_scenario(task_ids)
+
+        changed = len(self.scenario.changed_tasks)
+        moved = len(self.scenario.affected_task_ids()) - changed
+        self.statusBar().showMessage(f"{self.scenario.name}: {changed} tasks changed, {moved} more tasks moved")
+
+    """
+    Show the current scenario data of some tasks: the item data, the
+    badges and the place of the boxes in their lanes.
+
+    Args:
+        task_ids (set): IDs of the tasks to update
+    """
+    def apply_scenario(self, task_ids):
+        task_index = self.task_list.task_index
+        affected_lanes = set()
+        for task_id in task_ids:
+            task = task_index.get(task_id)
+            if task is None:
+                continue
+            shown_task = self.shown_task(task)
+            for task_item in self.task_items_of(task):
+                if task_item.task is not shown_task:
+                    task_item.set_task(shown_task)
+                task_item.set_badge(self.badge_of(task_id))
+            affected_lanes.update(lanes_of(task, self.grouping))
+        self.relayout_lanes(affected_lanes)
+        if self.highlighted_task_id is not None:
+            self.highlight_chain(self.highlighted_task_id)
+
+    """
+    Draw the scenario place of every affected task as outline beside its box
+    while the task file is shown. Outlines are reused by lane and task.
+    """
+    def update_scenario_ghosts(self):
+        ghost_pool = self.ghost_items
+        self.ghost_items = {}
+        if self.scenario is not None and self.scenario_beside_action.isChecked():
+            task_index = self.task_list.task_index
+            positions, schedule = self.scenario.positions, self.scenario.schedule
+            for task_id in self.scenario.affected_task_ids():
+                task = task_index.get(task_id)
+                if task is None:
+                    continue
+                x_pos, width = self._box_place(task_id, positions, schedule)
+                label = f"{task_id} {self.scenario.badge(task_id) or 'moved'}"
+                for task_item in self.task_items_of(task):
+                    if x_pos == task_item.x() and width == task_item.box_width:
+                        continue
+                    key = (task_item.lane, task)
+                    ghost = ghost_pool.pop(key, None)
+                    if ghost is None:
+                        ghost = ScenarioGhostItem(task_item.lane, label, width, task_item.box_height)
+                        self.scene.addItem(ghost)
+                    else:
+                        ghost.set_box(label, width, task_item.box_height)
+                    ghost.setPos(x_pos, task_item.y())
+                    self.ghost_items[key] = ghost
+        for ghost in ghost_pool.values():
+            self.scene.removeItem(ghost)
+
+    """
+    Pass the lane headers to the scene, which draws them pinned to the
+    visible area of each view.
+    """
+    def update_lane_headers(self):
+        lane_headers = []
+        for lane in self.lane_tasks:
+            if lane not in self.lane_geometry:
+                continue
+            lane_y, extent = self.lane_geometry[lane]
+            arrow = "\u25b6" if lane in self.collapsed_lanes else "\u25bc"
+            diff_summary = self.lane_diff_summaries.get(lane)
+            note = None
+            if diff_summary is not None:
+                note = (f"+{diff_summary['added']} added, -{diff_summary['removed']} removed, "
+                        f"{diff_summary['changed']} changed")
+            lane_headers.append(LaneHeader(lane, self.MARGIN, lane_y, lane_y + extent - self.LANE_SPACING / 2,
+                                           f"{arrow} {lane}", note))
+        self.scene.set_lane_headers(lane_headers)
+
+    """
+    Create the graphics item of a task and add it to the scene.
+    """
+    def _create_task_item(self, lane, task, box_heights=None):
+        shown_task = self.shown_task(task)
+        task_item = TaskGraphicsItem(shown_task, self.BOX_WIDTH, self.MIN_BOX_HEIGHT,
+                                     box_heights=box_heights if shown_task is task else None)
+        task_item.lane = lane
+        task_item.set_compressed_mode(self.toggle_compressed_action.isChecked())
+        task_item.edit_handler = self.open_edit_dialog
+        task_item.click_handler = self.toggle_highlight
+        if self.history_action.isChecked():
+            task_item.set_history_handler(self.progress_series)
+        self.scene.addItem(task_item)
+        self.task_items[(lane, task)] = task_item
+        task_item.set_badge(self.badge_of(task.task_id))
+        return task_item
+
+    """
+    Create the summary bar of a collapsed lane and add it to the scene.
+    """
+    def _create_summary_item(self, lane):
+        summary_item = LaneSummaryItem(lane, summarize_tasks(self.lane_tasks[lane]))
+        self.scene.addItem(summary_item)
+        self.summary_items[lane] = summary_item
+        return summary_item
+
+    """
+    Collapse or expand a lane. Collapsing removes the task items of the lane
+    from the scene, expanding creates them again. Only this lane is laid out
+    again, the lanes below are moved.
+
+    Args:
+        lane (str): Name of the lane
+    """
+    def toggle_lane(self, lane):
+        if lane in self.collapsed_lanes:
+            self.collapsed_lanes.discard(lane)
+            self.scene.removeItem(self.summary_items.pop(lane))
+            for task in self.lane_tasks[lane]:
+                self._create_task_item(lane, task)
+        else:
+            self.collapsed_lanes.add(lane)
+            for task in self.lane_tasks[lane]:
+                self.scene.removeItem(self.task_items.pop((lane, task)))
+            self._create_summary_item(lane)
+
+        if self.highlighted_task_id is not None:
+            self.highlight_chain(self.highlighted_task_id)
+        self.settings.setValue(self._collapsed_key(), sorted(self.collapsed_lanes))
+        self.relayout_lanes({lane})
+
+    """
+    Place the tasks and the separator line of one lane.
+
+    Args:
+        lane (str): Name of the lane
+        lane_y (float): Top of the lane
+
+    Returns:
+        float: Vertical extent of the lane including the spacing to the next lane
+    """
+    def _layout_lane(self, lane, lane_y):
+        margin = self.MARGIN
+
+        task_y = lane_y + self.LANE_HEADER_HEIGHT
+        max_x = margin  # Track the rightmost position in this lane
+        lane_height = 0  # Track the total height of this lane
+
+        summary_item = self.summary_items.get(lane)
+        if summary_item is not None:
+            # Collapsed lane: only the summary bar
+            summary_item.setPos(margin, task_y)
+            max_x = margin + summary_item.bar_width
+            lane_height = summary_item.bar_height
+
+        positions, schedule = self.board_layout()
+        for task in self.lane_tasks[lane] if summary_item is None else ():
+            task_item = self.task_items[(lane, task)]
+
+            x_pos, width = self._box_place(task.task_id, positions, schedule)
+            task_item.set_box_width(width)
+            task_item.setPos(x_pos, task_y)
+
+            # Update tracking variables
+            max_x = max(max_x, x_pos + task_item.box_width)
+            lane_height = max(lane_height, task_y + task_item.box_height - (lane_y + self.LANE_HEADER_HEIGHT))
+
+            task_y += task_item.box_height + self.SPACING
+
+        line = self.separator_items.get(lane)
+        if line is not None:
+            line_y = lane_y + self.LANE_HEADER_HEIGHT + lane_height + 25
+            line.setLine(margin, line_y, max_x + 50, line_y)  # Line extends to the rightmost task plus padding
+
+        extent = self.LANE_HEADER_HEIGHT + lane_height + self.LANE_SPACING
+        self.lane_geometry[lane] = (lane_y, extent)
+        return extent
+
+    """
+    Return the horizontal place of a task box.
+
+    Args:
+        task_id (str): ID of the task
+        positions (dict): Dependency column per task ID
+        schedule (dict): (start, duration) in hours per task ID, used in the time-scaled mode
+
+    Returns:
+        Tuple[float, float]: Left edge and width of the box
+    """
+    def _box_place(self, task_id, positions, schedule):
+        if self.time_scale_action.isChecked():
+            # Position and width from the schedule in hours
+            start, duration = schedule[task_id]
+            return (self.MARGIN + start * self.PIXELS_PER_HOUR,
+                    max(round(duration * self.PIXELS_PER_HOUR), self.MIN_TIME_BOX_WIDTH))
+        # Calculate horizontal position using global positions
+        return self.MARGIN + positions[task_id] * (self.BOX_WIDTH + self.HORIZONTAL_SPACING), self.BOX_WIDTH
+
+    """
+    Stack the lanes below each other. Affected lanes are laid out again, the
+    other lanes are only moved by the height difference of the lanes above.
+
+    Args:
+        affected_lanes (set): Lanes to lay out again, None for all lanes
+    """
+    def relayout_lanes(self, affected_lanes=None):
+        current_y = self.MARGIN
+        for lane in self.lane_tasks:
+            lane_y, extent = self.lane_geometry.get(lane, (None, None))
+            if affected_lanes is None or lane_y is None or lane in affected_lanes:
+                extent = self._layout_lane(lane, current_y)
+            elif lane_y != current_y:
+                shift = current_y - lane_y
+                if lane in self.summary_items:
+                    self.summary_items[lane].moveBy(0, shift)
+                else:
+                    for task in self.lane_tasks[lane]:
+                        self.task_items[(lane, task)].moveBy(0, shift)
+                line = self.separator_items.get(lane)
+                if line is not None:
+                    line.setLine(line.line().translated(0, shift))
+                self.lane_geometry[lane] = (current_y, extent)
+            current_y += extent
+
+        self.update_scenario_ghosts()
+
+        # Adjust scene rect to show all items and the first lane header with padding
+        items_rect = self.scene.itemsBoundingRect().united(QRectF(self.MARGIN, self.MARGIN, 1, self.LANE_HEADER_HEIGHT))
+        self.scene.setSceneRect(items_rect.adjusted(-50, -50, 50, 50))
+
+        self.update_lane_headers()
+
+        self.update_minimap()
+        self.update_board_views()
+
+    """
+    Open another view of the board in a dock. It shows the items of the main
+    scene, so it needs no layout of its own and follows every change.
+    """
+    def add_board_view(self):
+        panel = BoardViewPanel(self.scene)
+        panel.set_lane_names(list(self.lane_tasks))
+        panel.view.set_lanes(self.lane_rects())
+
+        dock = QDockWidget(f"View {len(self.view_panels) + 2}", self)
+        dock.setObjectName(f"BoardViewDock{len(self.view_panels) + 2}")
+        dock.setAttribute(Qt.WA_DeleteOnClose)
+        dock.setWidget(panel)
+        dock.destroyed.connect(lambda: self.view_panels.remove(panel) if panel in self.view_panels else None)
+        self.addDockWidget(Qt.RightDockWidgetArea, dock)
+        self.view_panels.append(panel)
+        return panel
+
+    def lane_rects(self):
+        """Return the scene area of each lane, from its header to the separator line."""
+        scene_rect = self.scene.sceneRect()
+        return {lane: QRectF(scene_rect.left(), lane_y, scene_rect.width(), extent - self.LANE_SPACING / 2)
+                for lane, (lane_y, extent) in self.lane_geometry.items()}
+
+    """
+    Pass the lane geometry and the projects to the additional board views.
+    """
+    def update_board_views(self):
+        if not self.view_panels:
+            return
+        lane_rects = self.lane_rects()
+        lanes = list(self.lane_tasks)
+        for panel in self.view_panels:
+            panel.set_lane_names(lanes)
+            panel.view.set_lanes(lane_rects)
+
+    """
+    Pass the current board geometry to the minimap, which regenerates its
+    cached render from it.
+    """
+    def update_minimap(self):
+        boxes = []
+        for (lane, task), task_item in self.task_items.items():
+            try:
+                progress = min(max(int(task.progress), 0), 100) / 100
+            except ValueError:
+                progress = 0
+            boxes.append((task_item.sceneBoundingRect(), progress))
+        for summary_item in self.summary_items.values():
+            boxes.append((summary_item.sceneBoundingRect(), min(max(summary_item.summary['progress'], 0), 100) / 100))
+        lines = [line.line() for line in self.separator_items.values()]
+        self.minimap.set_layout(self.scene.sceneRect(), boxes, lines)
+
+    """
+    Edit a task, update only the affected parts of the board and write the
+    task file back.
+
+    Args:
+        task_id (str): ID of the task to edit
+        **changes: Fields to change, see TaskList.update_task
+
+    Raises:
+        ValueError: The tasks are read-only, e.g. a copy of a remote source
+    """
+    def edit_task(self, task_id, **changes):
+        if self.task_list.read_only:
+            raise ValueError(self.READ_ONLY_MESSAGE)
+        old_task = self.task_list.task_index.get(task_id)
+        old_band = progress_band(old_task.progress) if old_task is not None else None
+        task = self.task_list.update_task(task_id, **changes)
+        task_index = self.task_list.task_index
+
+        # A task whose progress band changed moves to another lane of the progress grouping
+        regroup = False
+        if changes.get('progress') is not None:
+            regroup = self.lane_groups.move_progress(task, old_band) and self.grouping == "progress"
+
+        affected_lanes = set()
+        moved = set()
+        for task_item in self.task_items_of(task):
+            if task_item.refresh():
+                affected_lanes.add(task_item.lane)
+
+        for lane in lanes_of(task, self.grouping):
+            summary_item = self.summary_items.get(lane)
+            if summary_item is not None:
+                summary_item.set_summary(summarize_tasks(self.lane_tasks[lane]))
+
+        # Only the edited task and its downstream dependents can change columns
+        if changes.get('depends_on_task') is not None:
+            self.reachability.set_dependencies(task_id, task.depends_on_task)
+            if self.highlighted_task_id is not None:
+                self.highlight_chain(self.highlighted_task_id)
+            moved = update_task_positions(self.global_positions, task_index,
+                                          self.task_list.dependents, task_id)
+            affected_lanes.update(lane for moved_id in moved for lane in lanes_of(task_index[moved_id], self.grouping))
+
+        # In the time-scaled mode changed hours also move the downstream tasks
+        if self.schedule is not None and (changes.get('depends_on_task') is not None
+                                          or changes.get('time_required') is not None):
+            if self.time_scale_action.isChecked():
+                # Like the columns, only the edited task and its downstream dependents are rescheduled
+                rescheduled = update_task_schedule(self.schedule, task_index, self.task_list.dependents, task_id)
+                affected_lanes.update(lane for changed_id in rescheduled
+                                      for lane in lanes_of(task_index[changed_id], self.grouping))
+            else:
+                self.schedule = None
+
+        if regroup:
+            self.show_lanes()
+        elif affected_lanes:
+            self.relayout_lanes(affected_lanes)
+        elif changes.get('progress') is not None:
+            self.update_minimap()
+        self.update_workload(task=task, moved=moved)
+
+        self.task_list.write()
+        self.record_history([task])
+        self.update_snapshot_diff(task)
+
+    """
+    Highlight the clicked task with its upstream and downstream chain, or
+    remove the highlighting if the task is already highlighted.
+    """
+    def toggle_highlight(self, task):
+        if task.task_id == self.highlighted_task_id:
+            self.highlight_chain(None)
+        else:
+            self.highlight_chain(task.task_id)
+
+    """
+    Highlight a task, everything it transitively depends on and everything
+    that transitively depends on it, across all projects.
+
+    Args:
+        task_id (str): Task to highlight, None to remove the highlighting
+    """
+    def highlight_chain(self, task_id):
+        for task_item in self.highlighted_items:
+            task_item.set_highlight(None)
+        self.highlighted_items = []
+        self.highlighted_task_id = task_id
+
+        if task_id is None or task_id not in self.task_list.task_index:
+            self.highlighted_task_id = None
+            return
+
+        task_index = self.task_list.task_index
+        # A shown scenario can have other dependencies than the task file
+        reachability = self.scenario if self.shows_scenario() else self.reachability
+        chain = [(task_id, "selected")]
+        chain.extend((upstream_id, "upstream") for upstream_id in reachability.upstream(task_id))
+        chain.extend((downstream_id, "downstream") for downstream_id in reachability.downstream(task_id))
+        for chain_id, highlight in chain:
+            # Tasks of collapsed lanes have no item
+            for task_item in self.task_items_of(task_index[chain_id]):
+                task_item.set_highlight(highlight)
+                self.highlighted_items.append(task_item)
+
+    """
+    Show the edit dialog for a task and apply the changes.
+    """
+    def open_edit_dialog(self, task):
+        # While a scenario is active the changes go into the scenario
+        if self.scenario is not None:
+            task = self.scenario.changed_tasks.get(task.task_id, task)
+        elif self.task_list.read_only:
+            QMessageBox.information(self, "Task Tool - Edit", self.READ_ONLY_MESSAGE)
+            return
+        dialog = TaskEditDialog(task, self)
+        if dialog.exec_() == QDialog.Accepted:
+            try:
+                if self.scenario is not None:
+                    self.edit_scenario_task(task.task_id, **dialog.changes())
+                    return
+                self.edit_task(task.task_id, **dialog.changes())
+            except (OSError, ValueError) as error:
+                QMessageBox.warning(self, "Task Tool - Edit", str(error))
+
+    """
+    Reduce memory use while the budget is exceeded. The budget is checked
+    against the resident size of the process. The caches are shrunk first,
+    compressed mode is the last step.
+    """
+    def check_memory_budget(self):
+        if self.memory_budget_mb is None:
+            return
+
+        # Measure once, every shrink step is then counted by the size the cache reports
+        excess = memory_report.total_bytes(self) - self.memory_budget_mb * 1024 * 1024
+        for cache in self.memory_caches.values():
+            while excess > 0:
+                cache_bytes = cache.memory_bytes()
+                if not cache.shrink():
+                    break
+                excess -= cache_bytes - cache.memory_bytes()
+        if excess > 0 and not self.toggle_compressed_action.isChecked():
+            self.toggle_compressed_action.setChecked(True)
+            self.toggle_compressed_mode()
+            self.statusBar().showMessage("Memory budget exceeded, switched to compressed mode")
+
+    def show_memory_report(self):
+        """Show the memory use per subsystem with an option to save it as JSON."""
+        report = memory_report.measure(self.task_list, self)
+        # Later reports attribute the Python allocations made from now on
+        memory_report.start_tracing()
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Task Tool - Memory")
+        dialog.resize(450, 400)
+        
+        layout = QVBoxLayout()
+        text_edit = QTextEdit()
+        text_edit.setHtml(memory_report.report_to_html(report))
+        text_edit.setReadOnly(True)
+        layout.addWidget(text_edit)
+        
+        button_layout = QHBoxLayout()
+        save_button = QPushButton("Save JSON")
+        save_button.clicked.connect(lambda: self.save_memory_report(report))
+        button_layout.addWidget(save_button)
+        button_layout.addStretch()
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(dialog.accept)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+        dialog.setLayout(layout)
+        
+        dialog.exec_()
 
-        # Adjust scene rect to show all items with padding
-        self.scene.setSceneRect(self.scene.itemsBoundingRect().adjusted(-50, -50, 50, 50))
+    def save_memory_report(self, report):
+        """Ask for a file name and save the memory report as JSON."""
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Memory Report", "memory_report.json",
+                                                   "JSON files (*.json)")
+        if file_path:
+            with open(file_path, 'w', encoding='utf-8') as report_file:
+                report_file.write(memory_report.report_to_json(report))
 
     def show_help(self):
         """Show Help dialog for the application."""
@@ -572,6 +2026,13 @@ class MainWindow(QMainWindow):
         <li><b>Progress Bars:</b> Visual progress indication for each task</li>
         <li><b>Compressed Mode:</b> Compact view for overview of many tasks</li>
         <li><b>Zoom Controls:</b> Zoom in, out, and reset view</li>
+        <li><b>Overview:</b> Minimap of the whole board, click or drag to navigate</li>
+        <li><b>Multiple Views:</b> Additional views of the same board with their own zoom, project filter and compact style</li>
+        <li><b>Workload:</b> Heatmap of the remaining hours per department and dependency column</li>
+        <li><b>Collapsible Lanes:</b> Click a project name to collapse its lane into a summary bar</li>
+        <li><b>Sticky Lane Headers:</b> Project names stay visible at the left and top edge of the view while scrolling</li>
+        <li><b>Snapshot Comparison:</b> Badges for new tasks, progress changes (e.g. +20%) and changed dependencies (DEP), change counts per lane</li>
+        <li><b>What-If Scenarios:</b> Try changed times, progress or dependencies without changing the task file</li>
         </ul>
         
         <h3>Toolbar Buttons:</h3>
@@ -579,16 +2040,26 @@ class MainWindow(QMainWindow):
         <li><b>Zoom In:</b> Magnify the view to see details better</li>
         <li><b>Zoom Out:</b> Reduce the view to see more content</li>
         <li><b>Reset Zoom:</b> Return to the original zoom level</li>
+        <li><b>Reload:</b> Read the task file again</li>
+        <li><b>Compare:</b> Mark added and changed tasks against an older snapshot of the task file</li>
+        <li><b>History:</b> Show the recorded progress of each task as sparkline</li>
         <li><b>Compressed Mode:</b> Toggle between normal and compact task view</li>
+        <li><b>Time Scale:</b> Place and size the tasks by their required hours on a time axis</li>
+        <li><b>Group By:</b> Group the lanes by project, department or progress</li>
+        <li><b>Scenario:</b> Create, open, save and select what-if scenarios, shown instead of or beside the task file</li>
+        <li><b>Overview:</b> Show or hide the minimap</li>
+        <li><b>Add View:</b> Open another view of the board in a dock</li>
         <li><b>Help:</b> Show this help dialog with usage instructions</li>
         <li><b>Info:</b> Show application information and license details</li>
         </ul>
         
         <h3>Usage:</h3>
         <ul>
-        <li><b>Zoom In/Out:</b> Use the zoom buttons or mouse wheel</li>
+        <li><b>Zoom In/Out:</b> Use the zoom buttons, the mouse wheel or a pinch gesture, Shift+wheel scrolls</li>
         <li><b>Compressed Mode:</b> Toggle for compact task view</li>
         <li><b>Navigation:</b> Scroll to view different projects and tasks</li>
+        <li><b>Impact:</b> Click a task to highlight its upstream (blue) and downstream (red) chain</li>
+        <li><b>Editing:</b> Double-click a task to edit its times, progress and dependencies, while a scenario is selected only the scenario is changed</li>
         <li><b>Help:</b> Click the help button (?) for detailed instructions</li>
         <li><b>Info:</b> Click the info button (i) for application details and license</li>
         </ul>
@@ -706,6 +2177,7 @@ class MainWindow(QMainWindow):
         <h3>Third-Party Libraries:</h3>
         <ul>
         <li><b>PyQt5:</b> Cross-platform application framework for desktop applications</li>
+        <li><b>NumPy (optional):</b> Array computing for the department workload</li>
         <li><b>Python Standard Library:</b> Built-in modules (csv, pathlib, collections, etc.)</li>
         <li><b>Google Material Icons:</b> Icon set for the user interface</li>
         </ul>
@@ -713,6 +2185,7 @@ class MainWindow(QMainWindow):
         <h3>Library Licenses:</h3>
         <ul>
         <li><b>PyQt5:</b> GPL v3 or Commercial License</li>
+        <li><b>NumPy:</b> BSD License</li>
         <li><b>Python:</b> PSF License (compatible with MIT)</li>
         <li><b>Google Material Icons:</b> Apache License 2.0</li>
         </ul>
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+import json
+import os
+import sys
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+# Source files whose Python allocations are attributed to each subsystem
+SUBSYSTEM_FILES = {
+    "task_list": ["task.py", "task_list.py", "task_formats.py"],
+    "layout": ["task_layout.py"],
+    "scene_items": ["main_window.py", "minimap.py"],
+}
+
+"""
+Start tracing Python allocations. Only allocations made after this call are
+attributed, so it has to run before the task file is read. Tracing stores a
+trace per live allocation, so it is only started for memory reports.
+"""
+def start_tracing() -> None:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+"""
+Return the resident set size of the process: Python objects, Qt scene
+items and caches alike. Read from /proc where available, otherwise the peak
+resident size is used.
+
+Returns:
+    int: Size in bytes, None if the platform provides neither
+"""
+def process_rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+"""
+Measure the memory use per subsystem.
+
+Python allocations are taken from a tracemalloc snapshot and attributed by
+the source file that made them. Qt keeps scene items in C++, which
+tracemalloc cannot see, so the scene is reported as item counts per type.
+Caches report their own size through memory_bytes().
+
+Args:
+    task_list (TaskList): Loaded task list
+    main_window (MainWindow): Window whose scene and caches are measured,
+                              None for headless use
+
+Returns:
+    dict: The report, see report_to_json for the layout
+"""
+def measure(task_list, main_window=None) -> dict:
+    report = {
+        "tracemalloc": tracemalloc.is_tracing(),
+        "tasks": len(task_list.tasks),
+        "subsystems": {},
+        "qt_items": {},
+        "caches": {},
+    }
+
+    if tracemalloc.is_tracing():
+        file_sizes = Counter()
+        for stat in tracemalloc.take_snapshot().statistics("filename"):
+            file_sizes[Path(stat.traceback[0].filename).name] += stat.size
+
+        attributed = 0
+        for subsystem, file_names in SUBSYSTEM_FILES.items():
+            size = sum(file_sizes[file_name] for file_name in file_names)
+            report["subsystems"][subsystem] = size
+            attributed += size
+        report["subsystems"]["other"] = sum(file_sizes.values()) - attributed
+        report["python_bytes"] = tracemalloc.get_traced_memory()[0]
+    else:
+        report["python_bytes"] = None
+    report["rss_bytes"] = process_rss_bytes()
+
+    if main_window is not None:
+        report["qt_items"] = dict(Counter(type(item).__name__ for item in main_window.scene.items()))
+        report["caches"] = {name: cache.memory_bytes() for name, cache in main_window.memory_caches.items()}
+
+    report["total_bytes"] = (report["python_bytes"] or 0) + sum(report["caches"].values())
+    return report
+
+"""
+Return the memory use a budget is checked against: the resident set size
+of the process, which includes the Qt scene and the caches. Cheap enough to
+check periodically and needs no tracing. Without a resident size the
+traced Python allocations and the sizes the caches report are added up.
+
+Args:
+    main_window (MainWindow): Window whose caches are counted, None for headless use
+
+Returns:
+    int: Total size in bytes
+"""
+def total_bytes(main_window=None) -> int:
+    rss_bytes = process_rss_bytes()
+    if rss_bytes is not None:
+        return rss_bytes
+    python_bytes = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+    if main_window is None:
+        return python_bytes
+    return python_bytes + sum(cache.memory_bytes() for cache in main_window.memory_caches.values())
+
+"""
+Return the report as JSON text.
+"""
+def report_to_json(report: dict) -> str:
+    return json.dumps(report, indent=2)
+
+"""
+Return the report as an HTML table for the GUI.
+"""
+def report_to_html(report: dict) -> str:
+    def mb(size):
+        return "n/a" if size is None else f"{size / (1024 * 1024):.2f} MB"
+
+    rows = [f"<tr><td>{name}</td><td align='right'>{mb(size)}</td></tr>"
+            for name, size in report["subsystems"].items()]
+    rows += [f"<tr><td>cache: {name}</td><td align='right'>{mb(size)}</td></tr>"
+             for name, size in report["caches"].items()]
+    rows += [f"<tr><td>Qt {name}</td><td align='right'>{count} items</td></tr>"
+             for name, count in sorted(report["qt_items"].items())]
+
+    html = (f"<h3>Memory</h3><p>{report['tasks']} tasks, total {mb(report['total_bytes'])}, "
+            f"process {mb(report['rss_bytes'])}</p>")
+    if not report["tracemalloc"]:
+        html += ("<p>Python allocations were not traced, tracing starts now. Start with --memory-report "
+                 "to attribute the loaded board as well.</p>")
+    return html + "<table cellspacing='4'>" + "".join(rows) + "</table>"
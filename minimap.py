@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+from PyQt5.QtWidgets import QWidget, QGraphicsView
+from PyQt5.QtCore import Qt, QRectF, QPointF, QSize
+from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QPixmap
+
+class MinimapWidget(QWidget):
+    """
+    Overview of the whole board with the visible part of the view marked.
+    The board is drawn from the box geometry into a low resolution pixmap
+    that is only regenerated when the layout changes, the real task items
+    are never painted for the minimap. Clicking or dragging centers the
+    view on the clicked position.
+    """
+
+    def __init__(self, view: QGraphicsView, parent=None):
+        super().__init__(parent)
+        self.view = view
+
+        # Board geometry, set by set_layout
+        self.scene_rect = QRectF()
+        self.boxes = []  # (scene rect, progress 0..1) per task
+        self.lines = []  # Separator lines in scene coordinates
+
+        # Cached render of the board, None when it must be regenerated
+        self.pixmap = None
+        self.resolution = 1.0  # Pixmap size relative to the widget size
+
+        self.setMinimumSize(150, 100)
+        self.setCursor(Qt.PointingHandCursor)
+
+        # Follow scrolling and zooming of the view
+        for scroll_bar in (view.horizontalScrollBar(), view.verticalScrollBar()):
+            scroll_bar.valueChanged.connect(self.update)
+            scroll_bar.rangeChanged.connect(self.update)
+
+    def sizeHint(self):
+        """Return the preferred size of the minimap."""
+        return QSize(250, 200)
+
+    def set_layout(self, scene_rect: QRectF, boxes, lines):
+        """
+        Store new board geometry and drop the cached render.
+
+        Args:
+            scene_rect (QRectF): Rectangle of the whole board
+            boxes (list): (QRectF, progress fraction) per task box
+            lines (list): QLineF per lane separator
+        """
+        self.scene_rect = QRectF(scene_rect)
+        self.boxes = boxes
+        self.lines = lines
+        self.pixmap = None
+        self.update()
+
+    def _scale_and_offset(self):
+        """Return the scale and offset that fit the board into the widget."""
+        if self.scene_rect.isEmpty():
+            return 1.0, QPointF()
+        scale = min(self.width() / self.scene_rect.width(), self.height() / self.scene_rect.height())
+        offset = QPointF((self.width() - self.scene_rect.width() * scale) / 2,
+                         (self.height() - self.scene_rect.height() * scale) / 2)
+        return scale, offset
+
+    def memory_bytes(self) -> int:
+        """Return the size of the cached render."""
+        if self.pixmap is None:
+            return 0
+        return self.pixmap.width() * self.pixmap.height() * self.pixmap.depth() // 8
+
+    def shrink(self) -> bool:
+        """
+        Halve the resolution of the cached render to save memory.
+        
+        Returns:
+            bool: False if the lowest resolution is already reached
+        """
+        if self.resolution <= 0.25:
+            return False
+        self.resolution /= 2
+        self.pixmap = None
+        self.update()
+        return True
+
+    def _render_board(self):
+        """Render the board geometry into the cached pixmap."""
+        self.pixmap = QPixmap(max(1, int(self.width() * self.resolution)),
+                              max(1, int(self.height() * self.resolution)))
+        self.pixmap.fill(QColor(240, 240, 240))
+        if self.scene_rect.isEmpty():
+            return
+
+        scale, offset = self._scale_and_offset()
+        painter = QPainter(self.pixmap)
+        painter.scale(self.resolution, self.resolution)
+        painter.translate(offset)
+        painter.scale(scale, scale)
+        painter.translate(-self.scene_rect.topLeft())
+
+        # Background of the board
+        painter.fillRect(self.scene_rect, Qt.white)
+
+        # Lane separators
+        painter.setPen(QPen(Qt.black, 0))
+        for line in self.lines:
+            painter.drawLine(line)
+
+        # Task boxes with their progress as a filled part
+        box_brush = QBrush(Qt.lightGray)
+        progress_brush = QBrush(Qt.blue)
+        for rect, progress in self.boxes:
+            painter.fillRect(rect, box_brush)
+            if progress > 0:
+                painter.fillRect(QRectF(rect.x(), rect.y(), rect.width() * progress, rect.height()), progress_brush)
+
+        painter.end()
+
+    def _visible_rect(self) -> QRectF:
+        """Return the part of the board that is visible in the view, in minimap coordinates."""
+        visible = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        scale, offset = self._scale_and_offset()
+        return QRectF(offset.x() + (visible.x() - self.scene_rect.x()) * scale,
+                      offset.y() + (visible.y() - self.scene_rect.y()) * scale,
+                      visible.width() * scale, visible.height() * scale)
+
+    def paintEvent(self, event):
+        """Draw the cached board and the viewport rectangle on top."""
+        if self.pixmap is None or self.pixmap.width() != max(1, int(self.width() * self.resolution)) \
+                or self.pixmap.height() != max(1, int(self.height() * self.resolution)):
+            self._render_board()
+
+        painter = QPainter(self)
+        painter.drawPixmap(self.rect(), self.pixmap)
+
+        if not self.scene_rect.isEmpty():
+            painter.setPen(QPen(Qt.red, 2))
+            painter.setBrush(QBrush(QColor(255, 0, 0, 30)))
+            painter.drawRect(self._visible_rect())
+
+    def _center_view(self, pos):
+        """Center the view on the board position under a minimap position."""
+        if self.scene_rect.isEmpty():
+            return
+        scale, offset = self._scale_and_offset()
+        self.view.centerOn(self.scene_rect.x() + (pos.x() - offset.x()) / scale,
+                           self.scene_rect.y() + (pos.y() - offset.y()) / scale)
+
+    def mousePressEvent(self, event):
+        """Move the view to the clicked position."""
+        if event.button() == Qt.LeftButton:
+            self._center_view(event.pos())
+
+    def mouseMoveEvent(self, event):
+        """Move the view while dragging."""
+        if event.buttons() & Qt.LeftButton:
+            self._center_view(event.pos())
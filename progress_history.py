@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+import gc
+import math
+import mmap
+import os
+import struct
+import tempfile
+import time
+from array import array
+from collections import namedtuple
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from task_list import copy_file_mode
+
+# File header, increase the version when the segment layout changes
+HISTORY_MAGIC = b"TTPH\x01\x00\x00\x00"
+
+# Merge the segments into one when a file has more than this many
+COMPACT_SEGMENTS = 16
+
+# Bits of the change mask, which fields of a row were recorded
+PROGRESS_CHANGED = 1
+TIME_SPENT_CHANGED = 2
+
+# Marker, row count, length of the ID block
+_SEGMENT_HEADER = struct.Struct("<4sII")
+_SEGMENT_MARKER = b"SEGM"
+
+# Positions of the columns of one segment in the file
+_Segment = namedtuple("_Segment", ["rows", "offsets", "ids", "timestamps", "masks", "progress", "time_spent", "end"])
+
+"""
+Return the byte offsets of the columns of a segment with the given row count
+and ID block length, starting at the segment header.
+"""
+def _segment_layout(start, rows, ids_length) -> _Segment:
+    offsets = start + _SEGMENT_HEADER.size
+    ids = offsets + 4 * (rows + 1)
+    timestamps = ids + ids_length
+    masks = timestamps + 8 * rows
+    progress = masks + rows
+    time_spent = progress + 2 * rows
+    end = time_spent + 8 * rows
+    return _Segment(rows, offsets, ids, timestamps, masks, progress, time_spent, end)
+
+def _progress_value(value) -> Optional[int]:
+    """Return the progress as number, None if it is not a valid percentage."""
+    try:
+        progress = int(value)
+    except ValueError:
+        return None
+    return progress if 0 <= progress <= 100 else None
+
+def _time_value(value) -> Optional[float]:
+    """Return the spent time as number, None if it is not a number."""
+    try:
+        time_spent = float(value)
+    except ValueError:
+        return None
+    return None if math.isnan(time_spent) else time_spent
+
+class ProgressHistory:
+    """
+    Append-only history of the Progress and TimeSpent values of a board,
+    stored in a hidden `.<task file>.history` file next to the task file.
+
+    Each recording appends one segment with only the tasks whose values
+    changed since the last recording. A segment stores its rows sorted by
+    task ID in columns (ID offsets, IDs, timestamps, change masks, progress,
+    spent time), so the rows of one task are found by a binary search over
+    the memory mapped file without reading the rest of the history. When
+    the file has more than COMPACT_SEGMENTS segments, they are merged into a
+    single sorted segment.
+    """
+
+    def __init__(self, task_file_path):
+        task_file_path = Path(task_file_path)
+        self.history_path = task_file_path.with_name(f".{task_file_path.name}.history")
+        self.mapped = None  # Memory map of the history file, opened on first use
+        self.segments: List[_Segment] = []
+        self.valid_end = len(HISTORY_MAGIC)  # End of the last complete segment
+        self.latest = None  # Last recorded values per task ID, replayed on the first recording
+        self.latest_end = None  # File size the latest values belong to
+
+    def _open(self) -> bool:
+        """Map the history file and find its segments, return False if there is no history."""
+        if self.mapped is not None:
+            return True
+        try:
+            with open(self.history_path, 'rb') as history_file:
+                mapped = mmap.mmap(history_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Missing or empty file
+            return False
+        if mapped[:len(HISTORY_MAGIC)] != HISTORY_MAGIC:
+            mapped.close()
+            return False
+
+        # A segment cut off by an interrupted write is ignored and overwritten by the next one
+        segments = []
+        position = len(HISTORY_MAGIC)
+        while position + _SEGMENT_HEADER.size <= len(mapped):
+            marker, rows, ids_length = _SEGMENT_HEADER.unpack_from(mapped, position)
+            segment = _segment_layout(position, rows, ids_length)
+            if marker != _SEGMENT_MARKER or segment.end > len(mapped):
+                break
+            segments.append(segment)
+            position = segment.end
+
+        self.mapped = mapped
+        self.segments = segments
+        self.valid_end = position
+        return True
+
+    def close(self) -> None:
+        """Release the memory map, it is opened again on the next access."""
+        if self.mapped is not None:
+            self.mapped.close()
+            self.mapped = None
+            self.segments = []
+
+    def _read_segment(self, segment) -> Tuple[List[str], array, bytes, array, array]:
+        """Read all columns of a segment."""
+        mapped = self.mapped
+        ids = mapped[segment.ids:segment.timestamps].decode('utf-8').split('\x00')[:-1]
+        timestamps = array('d')
+        timestamps.frombytes(mapped[segment.timestamps:segment.masks])
+        masks = mapped[segment.masks:segment.progress]
+        progress = array('h')
+        progress.frombytes(mapped[segment.progress:segment.time_spent])
+        time_spent = array('d')
+        time_spent.frombytes(mapped[segment.time_spent:segment.end])
+        return ids, timestamps, masks, progress, time_spent
+
+    def _latest(self) -> Dict[str, Tuple[Optional[int], Optional[float]]]:
+        """Replay the history and return the last recorded values per task ID."""
+        latest = {}
+        if not self._open():
+            return latest
+        for segment in self.segments:
+            ids, _, masks, progress, time_spent = self._read_segment(segment)
+            for row, task_id in enumerate(ids):
+                last_progress, last_time_spent = latest.get(task_id, (None, None))
+                mask = masks[row]
+                if mask & PROGRESS_CHANGED:
+                    last_progress = progress[row] if progress[row] >= 0 else None
+                if mask & TIME_SPENT_CHANGED:
+                    last_time_spent = None if math.isnan(time_spent[row]) else time_spent[row]
+                latest[task_id] = (last_progress, last_time_spent)
+        return latest
+
+    """
+    Append the values that changed since the last recording.
+
+    Args:
+        tasks (List[Task]): All tasks, for duplicate IDs the last one counts
+        timestamp (float): Time of the recording, defaults to now
+
+    Returns:
+        int: Number of recorded tasks
+    """
+    def record(self, tasks, timestamp: float = None) -> int:
+        if timestamp is None:
+            timestamp = time.time()
+
+        # The value tuples are no reference cycles, pausing the cyclic
+        # garbage collector avoids repeated scans while the dictionaries grow
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            # The history is only replayed again if the file was changed by someone else
+            has_history = self._open()
+            if self.latest is None or self.latest_end != (self.valid_end if has_history else None):
+                self.latest = self._latest()
+
+            current = {}
+            for task in tasks:
+                current[task.task_id] = (_progress_value(task.progress), _time_value(task.time_spent))
+
+            rows = []
+            latest = self.latest
+            for task_id, values in current.items():
+                last = latest.get(task_id)
+                if last == values:
+                    continue
+                mask = 0
+                if last is None or last[0] != values[0]:
+                    mask |= PROGRESS_CHANGED
+                if last is None or last[1] != values[1]:
+                    mask |= TIME_SPENT_CHANGED
+                rows.append((task_id.encode('utf-8'), timestamp, mask, values[0], values[1]))
+                latest[task_id] = values
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if not rows:
+            return 0
+
+        rows.sort(key=lambda row: row[0])
+        segment_data = self._segment_bytes(rows)
+
+        segment_count = len(self.segments)
+        self.close()
+        if has_history:
+            with open(self.history_path, 'r+b') as history_file:
+                history_file.seek(self.valid_end)
+                history_file.write(segment_data)
+                history_file.truncate()
+                self.latest_end = history_file.tell()
+        else:
+            # Missing or unreadable history, start a new one
+            with open(self.history_path, 'wb') as history_file:
+                history_file.write(HISTORY_MAGIC + segment_data)
+                self.latest_end = history_file.tell()
+
+        if segment_count + 1 > COMPACT_SEGMENTS:
+            self.compact()
+        return len(rows)
+
+    @staticmethod
+    def _segment_bytes(rows) -> bytes:
+        """Serialize rows (ID bytes, timestamp, mask, progress, spent time) sorted by ID."""
+        offsets = array('I')
+        id_block = bytearray()
+        for row in rows:
+            offsets.append(len(id_block))
+            id_block += row[0] + b"\x00"
+        offsets.append(len(id_block))
+
+        timestamps = array('d', (row[1] for row in rows))
+        masks = bytes(row[2] for row in rows)
+        progress = array('h', (-1 if row[3] is None else row[3] for row in rows))
+        time_spent = array('d', (math.nan if row[4] is None else row[4] for row in rows))
+
+        return b"".join([_SEGMENT_HEADER.pack(_SEGMENT_MARKER, len(rows), len(id_block)),
+                         offsets.tobytes(), bytes(id_block), timestamps.tobytes(), masks,
+                         progress.tobytes(), time_spent.tobytes()])
+
+    """
+    Merge all segments into a single segment sorted by task ID and time. The
+    file is replaced atomically.
+    """
+    def compact(self) -> None:
+        if not self._open() or len(self.segments) <= 1:
+            return
+
+        rows = []
+        for segment in self.segments:
+            ids, timestamps, masks, progress, time_spent = self._read_segment(segment)
+            for row, task_id in enumerate(ids):
+                rows.append((task_id.encode('utf-8'), timestamps[row], masks[row],
+                             progress[row] if progress[row] >= 0 else None,
+                             None if math.isnan(time_spent[row]) else time_spent[row]))
+        # Stable sort, rows of one task stay in recording order
+        rows.sort(key=lambda row: row[0])
+        segment_data = self._segment_bytes(rows)
+        self.close()
+
+        temp_file = tempfile.NamedTemporaryFile('wb', delete=False, dir=self.history_path.parent,
+                                                prefix=f"{self.history_path.name}.", suffix=".tmp")
+        try:
+            with temp_file:
+                temp_file.write(HISTORY_MAGIC + segment_data)
+            copy_file_mode(self.history_path, temp_file.name)
+            os.replace(temp_file.name, self.history_path)
+            self.latest_end = len(HISTORY_MAGIC) + len(segment_data)
+        except BaseException:
+            try:
+                os.unlink(temp_file.name)
+            except OSError:
+                pass
+            raise
+
+    def _find_rows(self, segment, key: bytes) -> range:
+        """Return the rows of a task ID in a segment by binary search over its sorted IDs."""
+        mapped = self.mapped
+
+        def id_at(row):
+            start, end = struct.unpack_from("<II", mapped, segment.offsets + 4 * row)
+            return mapped[segment.ids + start:segment.ids + end - 1]
+
+        low, high = 0, segment.rows
+        while low < high:
+            middle = (low + high) // 2
+            if id_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        first = low
+        while low < segment.rows and id_at(low) == key:
+            low += 1
+        return range(first, low)
+
+    """
+    Return the recorded progress values of a task in time order. Only the
+    rows of this task are read from the file.
+
+    Args:
+        task_id (str): ID of the task
+
+    Returns:
+        List[Tuple[float, int]]: (timestamp, progress) pairs
+    """
+    def progress_series(self, task_id: str) -> List[Tuple[float, int]]:
+        if not self._open():
+            return []
+
+        key = task_id.encode('utf-8')
+        series = []
+        for segment in self.segments:
+            for row in self._find_rows(segment, key):
+                if self.mapped[segment.masks + row] & PROGRESS_CHANGED:
+                    progress, = struct.unpack_from("<h", self.mapped, segment.progress + 2 * row)
+                    if progress >= 0:
+                        timestamp, = struct.unpack_from("<d", self.mapped, segment.timestamps + 8 * row)
+                        series.append((timestamp, progress))
+        return series
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Set, Tuple
+
+class ReachabilityIndex:
+    """
+    Answers which tasks a task transitively depends on (upstream) and which
+    tasks transitively depend on it (downstream). Each answer is computed
+    once by a depth-first search and cached, so repeated queries are
+    dictionary lookups. When the dependencies change, only the cached
+    answers that can be affected by the changed edges are dropped.
+    """
+
+    def __init__(self, max_cached=10000):
+        self.max_cached = max_cached
+        self.depends: Dict[str, Tuple[str, ...]] = {}  # Task ID -> IDs of known dependencies
+        self.dependents: Dict[str, Set[str]] = {}  # Task ID -> IDs of tasks depending on it
+        self.upstream_cache = OrderedDict()  # Task ID -> frozenset of upstream IDs
+        self.downstream_cache = OrderedDict()  # Task ID -> frozenset of downstream IDs
+
+    """
+    Bring the index in line with a (re)loaded task list. Edges are compared
+    with the previous state and only the affected cache entries are dropped.
+
+    Args:
+        tasks (List[Task]): All tasks
+    """
+    def update(self, tasks) -> None:
+        task_ids = {task.task_id for task in tasks}
+        new_depends = {}
+        for task in tasks:
+            new_depends[task.task_id] = tuple(dep_id for dep_id in task.depends_on_task if dep_id in task_ids)
+
+        added, removed = set(), set()
+        for task_id in self.depends.keys() | new_depends.keys():
+            old_edges = set(self.depends.get(task_id, ()))
+            new_edges = set(new_depends.get(task_id, ()))
+            if old_edges != new_edges:
+                added.update((dep_id, task_id) for dep_id in new_edges - old_edges)
+                removed.update((dep_id, task_id) for dep_id in old_edges - new_edges)
+
+        # Removed tasks must not stay in cached answers either
+        removed_ids = self.depends.keys() - new_depends.keys()
+
+        self.depends = new_depends
+        self.dependents = {task_id: set() for task_id in new_depends}
+        for task_id, dep_ids in new_depends.items():
+            for dep_id in dep_ids:
+                self.dependents[dep_id].add(task_id)
+
+        self._invalidate(added | removed, removed_ids)
+
+    """
+    Change the dependencies of a single task.
+
+    Args:
+        task_id (str): ID of the edited task
+        depends_on_task (List[str]): New dependency IDs
+    """
+    def set_dependencies(self, task_id: str, depends_on_task) -> None:
+        if task_id not in self.depends:
+            return
+
+        old_edges = set(self.depends[task_id])
+        new_edges = {dep_id for dep_id in depends_on_task if dep_id in self.depends}
+        if old_edges == new_edges:
+            return
+
+        for dep_id in old_edges - new_edges:
+            self.dependents[dep_id].discard(task_id)
+        for dep_id in new_edges - old_edges:
+            self.dependents[dep_id].add(task_id)
+        self.depends[task_id] = tuple(dep_id for dep_id in depends_on_task if dep_id in self.depends)
+
+        changed_edges = {(dep_id, task_id) for dep_id in old_edges ^ new_edges}
+        self._invalidate(changed_edges, set())
+
+    """
+    Drop the cached answers a set of changed edges can affect. An edge from
+    a dependency to a dependent task changes the downstream sets containing
+    the dependency and the upstream sets containing the dependent task.
+    """
+    def _invalidate(self, edges, removed_ids) -> None:
+        if not edges and not removed_ids:
+            return
+
+        sources = {dep_id for dep_id, _ in edges} | removed_ids
+        targets = {task_id for _, task_id in edges} | removed_ids
+
+        for task_id in [task_id for task_id, downstream in self.downstream_cache.items()
+                        if task_id in sources or not sources.isdisjoint(downstream)]:
+            del self.downstream_cache[task_id]
+        for task_id in [task_id for task_id, upstream in self.upstream_cache.items()
+                        if task_id in targets or not targets.isdisjoint(upstream)]:
+            del self.upstream_cache[task_id]
+
+    def _search(self, task_id, neighbours, cache) -> FrozenSet[str]:
+        """Return the cached search result or run a depth-first search."""
+        result = cache.get(task_id)
+        if result is not None:
+            cache.move_to_end(task_id)
+            return result
+
+        reached = set()
+        stack = list(neighbours.get(task_id, ()))
+        while stack:
+            current = stack.pop()
+            if current in reached:
+                continue
+            reached.add(current)
+            # Reuse finished searches of other tasks
+            cached = cache.get(current)
+            if cached is not None:
+                reached.update(cached)
+                continue
+            stack.extend(neighbours.get(current, ()))
+        reached.discard(task_id)
+
+        result = frozenset(reached)
+        cache[task_id] = result
+        if len(cache) > self.max_cached:
+            cache.popitem(last=False)
+        return result
+
+    """
+    Return the IDs of all tasks the task transitively depends on.
+    """
+    def upstream(self, task_id: str) -> FrozenSet[str]:
+        return self._search(task_id, self.depends, self.upstream_cache)
+
+    """
+    Return the IDs of all tasks that transitively depend on the task.
+    """
+    def downstream(self, task_id: str) -> FrozenSet[str]:
+        return self._search(task_id, self.dependents, self.downstream_cache)
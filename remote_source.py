@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+import json
+import os
+import sys
+import tempfile
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Optional
+from task_list import TaskList
+
+# Size of the blocks the response is copied in
+CHUNK_SIZE = 1024 * 1024
+
+# Default time limit of one request in seconds
+DEFAULT_TIMEOUT = 30
+
+"""
+Return True if a task file path from the configuration is an HTTP(S) URL.
+"""
+def is_url(path) -> bool:
+    return str(path).startswith(("http://", "https://"))
+
+"""
+Return the default cache file of a URL in a directory. The cache keeps the
+file name of the URL, so the task file format is found by its suffix.
+"""
+def default_cache_path(url: str, directory) -> Path:
+    name = Path(urllib.parse.urlparse(url).path).name or "tasks.csv"
+    return Path(directory) / f".remote-{name}"
+
+class RemoteTaskSource:
+    """
+    Task file published over HTTP, mirrored into a local cache file.
+
+    Every fetch is a conditional request with the ETag and Last-Modified
+    values of the cached copy, so an unchanged source only costs a 304
+    response. A changed file is streamed in blocks into a temporary file
+    next to the cache, parsed, and only then replaces the cache. The cache
+    therefore always holds the last good copy, which is used when the
+    source cannot be reached.
+
+    The returned task lists are read-only: the next changed upstream file
+    replaces the cache, so edits written into it would be lost silently.
+    """
+
+    def __init__(self, url: str, cache_path, file_format: str = None, timeout: float = DEFAULT_TIMEOUT):
+        self.url = url
+        self.cache_path = Path(cache_path)
+        self.file_format = file_format
+        self.timeout = timeout
+        # ETag and Last-Modified of the cached copy
+        self.state_path = self.cache_path.with_name(f"{self.cache_path.name}.remote.json")
+
+    def _load_state(self) -> dict:
+        """Return the validators of the cached copy, empty if there is no usable copy."""
+        if not self.cache_path.exists():
+            return {}
+        try:
+            state = json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) and state.get("url") == self.url else {}
+
+    def _save_state(self, etag, last_modified) -> None:
+        """Store the validators of the new cached copy."""
+        self.state_path.write_text(json.dumps({"url": self.url, "etag": etag, "last_modified": last_modified}))
+
+    """
+    Fetch the task file if it changed since the cached copy.
+
+    Returns:
+        TaskList: The new tasks, read from the cache file, or None if the
+                  source is unchanged (304)
+
+    Raises:
+        OSError: The source cannot be reached or answers with an error
+        ValueError: The fetched file is no valid task file, the cache is kept
+    """
+    def fetch(self) -> Optional[TaskList]:
+        state = self._load_state()
+        request = urllib.request.Request(self.url)
+        if state.get("etag"):
+            request.add_header("If-None-Match", state["etag"])
+        if state.get("last_modified"):
+            request.add_header("If-Modified-Since", state["last_modified"])
+
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as error:
+            if error.code == 304:
+                return None
+            raise
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = tempfile.NamedTemporaryFile('wb', delete=False, dir=self.cache_path.parent,
+                                                prefix=f".{self.cache_path.name}.", suffix=self.cache_path.suffix)
+        try:
+            with response, temp_file:
+                while True:
+                    chunk = response.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    temp_file.write(chunk)
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+
+            # Parse before replacing, a broken download must not overwrite the last good copy
+            task_list = TaskList()
+            task_list.read(temp_file.name, self.file_format)
+            os.replace(temp_file.name, self.cache_path)
+        except BaseException:
+            try:
+                os.unlink(temp_file.name)
+            except OSError:
+                pass
+            raise
+
+        task_list.file_path = self.cache_path
+        task_list.read_only = True
+        self._save_state(etag, last_modified)
+        return task_list
+
+    """
+    Return the current tasks: fetched if the source changed, otherwise or
+    when the source cannot be reached or serves a broken file read from the
+    cached copy.
+
+    Raises:
+        OSError: The source cannot be reached and there is no cached copy
+        ValueError: The fetched file is no valid task file and there is no cached copy
+    """
+    def read(self) -> TaskList:
+        try:
+            task_list = self.fetch()
+        except OSError as error:
+            if not self.cache_path.exists():
+                raise
+            sys.stderr.write(f"Task source not reachable ({error}), using the cached copy {self.cache_path}\n")
+            task_list = None
+        except ValueError as error:
+            if not self.cache_path.exists():
+                raise
+            sys.stderr.write(f"Task source serves no valid task file ({error}), using the cached copy {self.cache_path}\n")
+            task_list = None
+
+        if task_list is None:
+            task_list = TaskList()
+            task_list.read(self.cache_path, self.file_format)
+            task_list.read_only = True
+        return task_list
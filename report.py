@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+import csv
+import json
+import sys
+from typing import List, Sequence, TextIO
+
+# Supported output formats
+OUTPUT_FORMATS = ["table", "csv", "json"]
+
+"""
+Write rows of string values as one bulk write in the requested format.
+
+Args:
+    header (Sequence[str]): Column names
+    rows (List[Sequence[str]]): Row values, one entry per column
+    output_format (str): "table", "csv" or "json"
+    file (TextIO): Output stream, defaults to sys.stdout
+"""
+def write_rows(header: Sequence[str], rows: List[Sequence[str]], output_format: str = "table",
+               file: TextIO = None) -> None:
+    if file is None:
+        file = sys.stdout
+
+    if output_format == "table":
+        file.write(format_table(header, rows))
+    elif output_format == "csv":
+        writer = csv.writer(file, delimiter=';', lineterminator='\n')
+        writer.writerow(header)
+        writer.writerows(rows)
+    elif output_format == "json":
+        file.write(json.dumps([dict(zip(header, row)) for row in rows], indent=2, ensure_ascii=False))
+        file.write("\n")
+    else:
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    file.flush()
+
+"""
+Format rows as a text table with auto-fitted column widths.
+
+Args:
+    header (Sequence[str]): Column names
+    rows (List[Sequence[str]]): Row values, one entry per column
+
+Returns:
+    str: The complete table including the header and a trailing newline
+"""
+def format_table(header: Sequence[str], rows: List[Sequence[str]]) -> str:
+    # Each column is as wide as its longest value
+    widths = [max(map(len, column)) for column in zip(header, *rows)]
+    row_format = " | ".join(f"{{:<{width}}}" for width in widths)
+
+    header_line = row_format.format(*header)
+    lines = [header_line, "-" * len(header_line)]
+    lines.extend(row_format.format(*row) for row in rows)
+    lines.append("")
+    return "\n".join(lines)
@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+import copy
+import json
+import os
+import tempfile
+from collections import ChainMap
+from pathlib import Path
+from typing import Dict, List, Set
+from task_list import Task, TaskList, copy_file_mode
+from task_layout import update_task_positions, update_task_schedule
+
+# Task fields a scenario can change, with their column names in the delta file
+SCENARIO_FIELDS = {"time_required": "TimeRequired", "time_spent": "TimeSpent", "progress": "Progress"}
+
+# Column of the changed dependencies in the delta file, with "add" and "remove" lists
+DEPENDENCY_COLUMN = "DependsOnTask"
+
+# Suffix of the delta files
+SCENARIO_SUFFIX = ".scenario.json"
+
+def _number(value):
+    """Return a time or progress value as float, None if it is not a number."""
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+class Scenario:
+    """
+    What-if variant of a task list that records only its differences.
+
+    The base TaskList is shared and never changed. A scenario keeps per
+    task only the changed fields and the added and removed dependencies,
+    and a changed copy of just these tasks. Task lookup, reverse
+    dependencies, columns and schedule are ChainMaps with the few changed
+    entries in front of the data of the base, so a scenario of a board with
+    hundreds of thousands of tasks costs memory in proportion to its
+    changes. After a change only the downstream subgraph of the changed
+    task is laid out again.
+
+    The changes are saved as small JSON delta files with the task file
+    column names, e.g. {"T3": {"TimeRequired": "80"}} or
+    {"T5": {"DependsOnTask": {"add": [], "remove": ["T2"]}}}.
+    """
+
+    def __init__(self, base: TaskList, name: str = "Scenario"):
+        self.name = name
+        self.file_path = None
+        self.modified = False  # Changes not yet written to the delta file
+
+        # Task ID -> changed fields, "add_dependencies" and "remove_dependencies".
+        # Changes of tasks missing in the base are kept for a later reload.
+        self.deltas: Dict[str, dict] = {}
+
+        # Layout over the base layout, set by attach_layout
+        self.positions = None  # Task ID -> dependency column
+        self.schedule = None  # Task ID -> (start, duration) in hours, None without a base schedule
+
+        self.rebase(base)
+
+    """
+    Apply the changes to another version of the base tasks, e.g. after the
+    task file was reloaded. The layout has to be attached again.
+
+    Args:
+        base (TaskList): New base tasks
+    """
+    def rebase(self, base: TaskList) -> None:
+        self.base = base
+        self.changed_tasks: Dict[str, Task] = {}  # Task ID -> changed copy of the base task
+        self.changed_dependents: Dict[str, List[str]] = {}  # Task ID -> dependents that differ from the base
+        self.task_index = ChainMap(self.changed_tasks, base.task_index)
+        self.dependents = ChainMap(self.changed_dependents, base.dependents)
+        self.positions = None
+        self.schedule = None
+        for task_id in self.deltas:
+            self._apply(task_id, None)
+
+    def _apply(self, task_id: str, old_delta) -> None:
+        """Rebuild the changed copy of a task and the reverse dependencies it touches."""
+        self.changed_tasks.pop(task_id, None)
+        delta = self.deltas.get(task_id)
+        base_task = self.base.task_index.get(task_id)
+        if delta and base_task is not None:
+            task = copy.copy(base_task)
+            for field in SCENARIO_FIELDS:
+                if field in delta:
+                    setattr(task, field, delta[field])
+            removed = delta.get("remove_dependencies", [])
+            depends_on_task = [dep_id for dep_id in base_task.depends_on_task if dep_id not in removed]
+            depends_on_task.extend(dep_id for dep_id in delta.get("add_dependencies", [])
+                                   if dep_id not in depends_on_task)
+            task.depends_on_task = depends_on_task
+            self.changed_tasks[task_id] = task
+
+        touched = set()
+        for edges in (old_delta or {}, delta or {}):
+            touched.update(edges.get("add_dependencies", ()))
+            touched.update(edges.get("remove_dependencies", ()))
+        for dep_id in touched:
+            self._refresh_dependents(dep_id)
+
+    def _refresh_dependents(self, dep_id: str) -> None:
+        """Rebuild the dependents of a task from the base and the changed dependencies."""
+        base_dependents = self.base.dependents.get(dep_id, [])
+        dependents = [task_id for task_id in base_dependents if dep_id in self.task_index[task_id].depends_on_task]
+        dependents.extend(task_id for task_id, delta in self.deltas.items()
+                          if task_id in self.changed_tasks and dep_id in delta.get("add_dependencies", ()))
+        if dependents == base_dependents:
+            self.changed_dependents.pop(dep_id, None)
+        else:
+            self.changed_dependents[dep_id] = dependents
+
+    """
+    Change fields of a single task in the scenario. The values are compared
+    with the base task, only differences are recorded and a task changed
+    back to its base values is dropped from the scenario. Arguments left at
+    None are not changed.
+
+    Args:
+        task_id (str): ID of the task to change
+        time_required (str): New required time
+        time_spent (str): New spent time
+        progress (str): New progress percentage
+        depends_on_task (List[str]): New dependency IDs
+
+    Returns:
+        Task: The task as seen in the scenario
+    """
+    def update_task(self, task_id: str, time_required: str = None, time_spent: str = None,
+                    progress: str = None, depends_on_task: List[str] = None) -> Task:
+        base_task = self.base.task_index.get(task_id)
+        if base_task is None:
+            raise ValueError(f"Unknown task: {task_id}")
+
+        old_delta = self.deltas.get(task_id)
+        delta = dict(old_delta or {})
+        for field, value in (("time_required", time_required), ("time_spent", time_spent), ("progress", progress)):
+            if value is None:
+                continue
+            if value == getattr(base_task, field):
+                delta.pop(field, None)
+            else:
+                delta[field] = value
+        if depends_on_task is not None:
+            delta.pop("add_dependencies", None)
+            delta.pop("remove_dependencies", None)
+            added = [dep_id for dep_id in dict.fromkeys(depends_on_task) if dep_id not in base_task.depends_on_task]
+            removed = [dep_id for dep_id in base_task.depends_on_task if dep_id not in depends_on_task]
+            if added:
+                delta["add_dependencies"] = added
+            if removed:
+                delta["remove_dependencies"] = removed
+
+        if delta != (old_delta or {}):
+            if delta:
+                self.deltas[task_id] = delta
+            else:
+                self.deltas.pop(task_id, None)
+            self._apply(task_id, old_delta)
+            self.modified = True
+        return self.task_index[task_id]
+
+    """
+    Lay out the scenario on top of the layout of the base: the changed tasks
+    and their downstream subgraphs are placed again, all other tasks keep
+    the base values.
+
+    Args:
+        base_positions (Dict[str, int]): Dependency column per task ID of the base
+        base_schedule (Dict[str, Tuple[float, float]]): Schedule of the base, None
+                                                        if no schedule is needed
+
+    Returns:
+        Set[str]: IDs of the tasks placed differently than in the base
+    """
+    def attach_layout(self, base_positions, base_schedule=None) -> Set[str]:
+        self.positions = ChainMap({}, base_positions)
+        self.schedule = ChainMap({}, base_schedule) if base_schedule is not None else None
+        for task_id in self.deltas:
+            self.update_layout(task_id)
+        return self.affected_task_ids()
+
+    """
+    Place a changed task and its downstream subgraph again.
+
+    Returns:
+        Set[str]: IDs of the tasks whose column or schedule changed
+    """
+    def update_layout(self, task_id: str) -> Set[str]:
+        moved = update_task_positions(self.positions, self.task_index, self.dependents, task_id)
+        if self.schedule is not None:
+            moved |= update_task_schedule(self.schedule, self.task_index, self.dependents, task_id)
+        return moved
+
+    """
+    Return the IDs of the tasks that are changed or placed differently than
+    in the base.
+    """
+    def affected_task_ids(self) -> Set[str]:
+        task_ids = set(self.changed_tasks)
+        for layout in (self.positions, self.schedule):
+            if layout is not None:
+                changed, base = layout.maps
+                task_ids.update(task_id for task_id, value in changed.items() if base.get(task_id) != value)
+        return task_ids
+
+    """
+    Return a short badge text for a changed task, e.g. "+40h DEP", None if
+    the scenario does not change it.
+    """
+    def badge(self, task_id: str):
+        task = self.changed_tasks.get(task_id)
+        if task is None:
+            return None
+        base_task = self.base.task_index[task_id]
+        delta = self.deltas[task_id]
+        parts = []
+        for field, unit in (("time_required", "h"), ("progress", "%")):
+            if field in delta:
+                new, old = _number(getattr(task, field)), _number(getattr(base_task, field))
+                parts.append(f"{new - old:+g}{unit}" if new is not None and old is not None else "CHG")
+        if "time_spent" in delta:
+            parts.append("SPENT")
+        if "add_dependencies" in delta or "remove_dependencies" in delta:
+            parts.append("DEP")
+        return " ".join(parts)
+
+    def upstream(self, task_id: str) -> Set[str]:
+        """Return the IDs of all tasks a task transitively depends on in the scenario."""
+        return self._search(task_id, lambda current: self.task_index[current].depends_on_task)
+
+    def downstream(self, task_id: str) -> Set[str]:
+        """Return the IDs of all tasks transitively depending on a task in the scenario."""
+        return self._search(task_id, lambda current: self.dependents.get(current, ()))
+
+    def _search(self, task_id, neighbours) -> Set[str]:
+        """Collect the tasks reachable from a task, without the task itself."""
+        found = set()
+        stack = [task_id]
+        while stack:
+            for neighbour in neighbours(stack.pop()):
+                if neighbour not in found and neighbour != task_id and neighbour in self.task_index:
+                    found.add(neighbour)
+                    stack.append(neighbour)
+        return found
+
+    """
+    Read the changes from a delta file. The scenario is named after the
+    file unless the file contains a name.
+
+    Raises:
+        OSError: The file cannot be read
+        ValueError: The file is no valid delta file
+    """
+    def read(self, file_path) -> None:
+        file_path = Path(file_path)
+        try:
+            data = json.loads(file_path.read_text(encoding='utf-8'))
+        except ValueError as error:
+            raise ValueError(f"Invalid scenario file {file_path}: {error}") from None
+        tasks = data.get("tasks") if isinstance(data, dict) else None
+        if not isinstance(tasks, dict):
+            raise ValueError(f"Invalid scenario file {file_path}: no tasks")
+
+        deltas = {}
+        for task_id, columns in tasks.items():
+            if not isinstance(columns, dict):
+                raise ValueError(f"Invalid scenario file {file_path}: {task_id}")
+            delta = {field: str(columns[column]) for field, column in SCENARIO_FIELDS.items() if column in columns}
+            edges = columns.get(DEPENDENCY_COLUMN, {})
+            if not isinstance(edges, dict):
+                raise ValueError(f"Invalid scenario file {file_path}: {task_id} {DEPENDENCY_COLUMN}")
+            for key, field in (("add", "add_dependencies"), ("remove", "remove_dependencies")):
+                if edges.get(key):
+                    delta[field] = [str(dep_id) for dep_id in edges[key]]
+            if delta:
+                deltas[task_id] = delta
+
+        if file_path.name.endswith(SCENARIO_SUFFIX):
+            default_name = file_path.name[:-len(SCENARIO_SUFFIX)]
+        else:
+            default_name = file_path.stem
+        self.name = data.get("name") or default_name
+        self.deltas = deltas
+        self.file_path = file_path
+        self.modified = False
+        self.rebase(self.base)
+
+    """
+    Write the changes to a delta file, through a temporary file next to it.
+    An existing file keeps its file mode.
+
+    Args:
+        file_path (str): Target file, defaults to the file that was read or written
+    """
+    def write(self, file_path=None) -> None:
+        target = Path(file_path) if file_path is not None else self.file_path
+        if target is None:
+            raise ValueError("No scenario file to write to")
+
+        tasks = {}
+        for task_id, delta in self.deltas.items():
+            columns = {column: delta[field] for field, column in SCENARIO_FIELDS.items() if field in delta}
+            if "add_dependencies" in delta or "remove_dependencies" in delta:
+                columns[DEPENDENCY_COLUMN] = {"add": delta.get("add_dependencies", []),
+                                              "remove": delta.get("remove_dependencies", [])}
+            tasks[task_id] = columns
+        base_path = self.base.file_path
+        data = {"name": self.name, "base": base_path.name if base_path is not None else None, "tasks": tasks}
+
+        temp_file = tempfile.NamedTemporaryFile('w', encoding='utf-8', delete=False, dir=target.parent,
+                                                prefix=f".{target.name}.", suffix=".tmp")
+        try:
+            with temp_file:
+                json.dump(data, temp_file, indent=2)
+                temp_file.write("\n")
+            copy_file_mode(target, temp_file.name)
+            os.replace(temp_file.name, target)
+        except BaseException:
+            os.unlink(temp_file.name)
+            raise
+        self.file_path = target
+        self.modified = False
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+import csv
+import gc
+from collections import namedtuple
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, List
+from task_list import REQUIRED_COLUMNS, TASK_FORMATS, find_format
+
+# Change of one task between two snapshots
+#   status: "added", "removed" or "changed"
+#   progress_delta: new minus old progress, None if unknown or unchanged
+#   dependencies_changed: True if DependsOnTask differs
+TaskChange = namedtuple("TaskChange", ["task_id", "project", "status", "progress_delta", "dependencies_changed"])
+
+# Marker for a progress value that is not a number 0..254
+_NO_PROGRESS = 255
+
+_HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
+"""
+Read a task file row by row. Only the required columns are kept. CSV files
+are streamed, other formats are read through their registered reader.
+
+Args:
+    file_path (Path): Path of the task file
+    file_format (str): Explicitly selected format, None to choose by suffix
+
+Yields:
+    Tuple[str, ...]: Values in the order of REQUIRED_COLUMNS
+"""
+def _rows(file_path, file_format: str = None):
+    file_format = find_format(Path(file_path), file_format)
+    if file_format != "csv":
+        for task in TASK_FORMATS[file_format].reader(Path(file_path)):
+            yield _task_values(task)
+        return
+
+    with open(file_path, 'r', encoding='utf-8', newline='') as csvfile:
+        reader = csv.reader(csvfile, delimiter=';')
+        header = next(reader, None) or []
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in header]
+        if missing_columns:
+            raise ValueError(f"Missing required columns in {file_path}: {', '.join(missing_columns)}")
+
+        column_index = {name: index for index, name in enumerate(header)}
+        indexes = [column_index[col] for col in REQUIRED_COLUMNS]
+        select = itemgetter(*indexes)
+        min_fields = max(indexes) + 1
+        for row in reader:
+            if len(row) >= min_fields:
+                yield select(row)
+
+def _progress(value) -> int:
+    """Return the progress as number for packing, _NO_PROGRESS if invalid."""
+    try:
+        progress = int(value)
+    except ValueError:
+        return _NO_PROGRESS
+    return progress if 0 <= progress < _NO_PROGRESS else _NO_PROGRESS
+
+def _task_values(task) -> tuple:
+    """Return the values of a task like _rows returns them for its written row."""
+    return (task.task_id, task.project, task.task, task.time_required, task.time_spent, task.progress,
+            " ".join(task.other_departments), " ".join(task.depends_on_task))
+
+def _dependencies_hash(value) -> int:
+    """Return a 32-bit hash of a DependsOnTask value, independent of the spacing."""
+    return hash(tuple(value.split())) & 0xFFFFFFFF
+
+class SnapshotDiff:
+    """
+    Differences between two task file snapshots.
+
+    Each file is read in one streaming pass. Of the old file only one packed
+    integer per TaskId is kept (row hash, dependency hash, progress and a
+    project number), the new file is compared row by row against it, so
+    memory stays small even for millions of rows and no Task objects are
+    created. Only changed tasks are stored in the result. The hashes are
+    only compared within one process, so Python's own hash is sufficient.
+
+    The packed integers of the old tasks that still exist are kept, so an
+    edited task can be compared again with update_task without reading
+    the files again.
+    """
+
+    def __init__(self, old_path, new_path, file_format: str = None, old_format: str = None):
+        self.old_path = Path(old_path)
+        self.new_path = Path(new_path)
+        self.file_format = file_format  # Format of the new file like in TaskList.read, None to choose by suffix
+        self.old_format = old_format if old_format is not None else file_format  # Format of the old file
+        self.changes: Dict[str, TaskChange] = {}  # Task ID -> change, added and changed tasks
+        self.removed: List[TaskChange] = []
+        self._old_rows: Dict[str, int] = {}  # Task ID -> packed values of the old tasks that still exist
+        self._compare()
+
+    def _compare(self) -> None:
+        """Stream both files and collect the changes."""
+        projects = []
+        project_numbers = {}
+
+        # The packed integers are no reference cycles, pausing the cyclic
+        # garbage collector avoids repeated scans while the dictionary grows
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            # Pack row hash (64 bit), dependency hash (32 bit), progress (8 bit) and project number
+            old_rows = {}
+            for values in _rows(self.old_path, self.old_format):
+                project_number = project_numbers.get(values[1])
+                if project_number is None:
+                    project_number = project_numbers[values[1]] = len(projects)
+                    projects.append(values[1])
+                old_rows[values[0]] = (hash(values) & _HASH_MASK
+                                       | _dependencies_hash(values[7]) << 64
+                                       | _progress(values[5]) << 96
+                                       | project_number << 104)
+
+            matched_rows = self._old_rows
+            for values in _rows(self.new_path, self.file_format):
+                task_id = values[0]
+                packed = old_rows.pop(task_id, None)
+                if packed is not None:
+                    matched_rows[task_id] = packed
+                change = self._change(values, packed)
+                if change is not None:
+                    self.changes[task_id] = change
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        # What is left of the old file no longer exists
+        self.removed = [TaskChange(task_id, projects[packed >> 104], "removed", None, False)
+                        for task_id, packed in old_rows.items()]
+
+    @staticmethod
+    def _change(values, packed):
+        """Compare the values of a new row with the packed old row, None if it did not change."""
+        if packed is None:
+            return TaskChange(values[0], values[1], "added", None, False)
+        if packed & _HASH_MASK == hash(values) & _HASH_MASK:
+            return None
+
+        old_progress = (packed >> 96) & 0xFF
+        new_progress = _progress(values[5])
+        progress_delta = None
+        if old_progress != _NO_PROGRESS and new_progress != _NO_PROGRESS and old_progress != new_progress:
+            progress_delta = new_progress - old_progress
+        dependencies_changed = (packed >> 64) & 0xFFFFFFFF != _dependencies_hash(values[7])
+        return TaskChange(values[0], values[1], "changed", progress_delta, dependencies_changed)
+
+    """
+    Compare an edited task of the new file again, e.g. after the task file
+    was written. Only the fields of the task change, so the result is the
+    same as comparing the whole written file again.
+
+    Args:
+        task (Task): Edited task
+
+    Returns:
+        bool: True if the change of the task differs from before
+    """
+    def update_task(self, task) -> bool:
+        change = self._change(_task_values(task), self._old_rows.get(task.task_id))
+        if change == self.changes.get(task.task_id):
+            return False
+        if change is None:
+            del self.changes[task.task_id]
+        else:
+            self.changes[task.task_id] = change
+        return True
+
+    """
+    Count the changes per project lane.
+
+    Returns:
+        Dict[str, Dict[str, int]]: Per project the number of added, removed
+                                   and changed tasks
+    """
+    def project_summary(self) -> Dict[str, Dict[str, int]]:
+        summary = {}
+        for change in list(self.changes.values()) + self.removed:
+            counts = summary.setdefault(change.project, {"added": 0, "removed": 0, "changed": 0})
+            counts[change.status] += 1
+        return summary
+
+    """
+    Return a short badge text for a task, None if it did not change.
+    """
+    def badge(self, task_id: str):
+        change = self.changes.get(task_id)
+        if change is None:
+            return None
+        if change.status == "added":
+            return "NEW"
+        parts = []
+        if change.progress_delta is not None:
+            parts.append(f"{change.progress_delta:+d}%")
+        if change.dependencies_changed:
+            parts.append("DEP")
+        return " ".join(parts) if parts else "CHG"
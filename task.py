@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+from typing import Dict, List
+
+# Columns every task file has to provide
+REQUIRED_COLUMNS = ['TaskId', 'Project', 'Task', 'TimeRequired',
+                    'TimeSpent', 'Progress', 'OtherDepartments', 'DependsOnTask']
+
+# Task class
+class Task:
+    def __init__(self, task_id: str, project: str, task: str, time_required: str,
+                 time_spent: str, progress: str, other_departments: List[str], depends_on_task,
+                 extra_columns: Dict[str, str] = None):
+        self.task_id = task_id
+        self.project = project
+        self.task = task
+        self.time_required = time_required
+        self.time_spent = time_spent
+        self.progress = progress
+        self.other_departments = other_departments
+        self.depends_on_task = depends_on_task
+        # Columns of the task file beyond REQUIRED_COLUMNS, kept for writing, None if there are none
+        self.extra_columns = extra_columns
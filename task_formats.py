@@ -0,0 +1,415 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+import csv
+import gc
+import json
+import mmap
+import struct
+from array import array
+from collections import namedtuple
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from task import Task, REQUIRED_COLUMNS
+
+# Reader and writer of a task file format
+#   reader(file_path) returns the tasks in file order
+#   writer(file_path, tasks) writes the tasks
+TaskFormat = namedtuple("TaskFormat", ["suffixes", "reader", "writer"])
+
+# Registered task file formats: format name -> TaskFormat, see register_format
+TASK_FORMATS: Dict[str, TaskFormat] = {}
+
+"""
+Register a task file format. Readers have to return Task objects with the
+same field encoding as the CSV reader: strings for the scalar columns and
+lists of strings for OtherDepartments and DependsOnTask. Columns beyond
+REQUIRED_COLUMNS go into Task.extra_columns, writers have to write them back.
+
+Args:
+    format_name (str): Name used in the configuration and on the command line
+    suffixes (List[str]): File suffixes that select the format, e.g. [".csv"]
+    reader (Callable): reader(file_path) -> List[Task]
+    writer (Callable): writer(file_path, tasks)
+"""
+def register_format(format_name: str, suffixes: List[str], reader: Callable, writer: Callable) -> None:
+    TASK_FORMATS[format_name] = TaskFormat(tuple(suffixes), reader, writer)
+
+"""
+Return the format name of a task file.
+
+Args:
+    file_path (Path): Path of the task file
+    file_format (str): Explicitly selected format, None to choose by suffix
+
+Raises:
+    ValueError: If the format is unknown or no format has the file suffix
+"""
+def find_format(file_path: Path, file_format: str = None) -> str:
+    if file_format is not None:
+        if file_format not in TASK_FORMATS:
+            raise ValueError(f"Unsupported task file format: {file_format}")
+        return file_format
+    for format_name, task_format in TASK_FORMATS.items():
+        if file_path.suffix in task_format.suffixes:
+            return format_name
+    raise ValueError(f"Unsupported file type: {file_path.suffix}")
+
+# Columns holding space-separated lists in the CSV file
+LIST_COLUMNS = ['OtherDepartments', 'DependsOnTask']
+
+# File header of the columnar format, increase the version when the layout changes
+COLUMNAR_MAGIC = b"TTCL\x01\x00\x00\x00"
+
+# Magic, row count, column count, length of the column name block
+_COLUMNAR_HEADER = struct.Struct("<8sIII")
+# Per column: encoding, offset of the data from the file start, data length
+_COLUMN_ENTRY = struct.Struct("<BQQ")
+
+# Column encodings
+PLAIN_ENCODING = 0  # All values NUL-terminated
+DICTIONARY_ENCODING = 1  # Distinct values NUL-terminated, then one uint32 code per row
+
+"""
+Return the values of a task in the order of REQUIRED_COLUMNS, list columns
+joined with spaces like in the CSV file.
+"""
+def _task_values(task: Task) -> tuple:
+    return (task.task_id, task.project, task.task, task.time_required, task.time_spent, task.progress,
+            " ".join(task.other_departments), " ".join(task.depends_on_task))
+
+"""
+Return the names of the extra columns of the tasks in the order they were
+first seen.
+"""
+def _extra_names(tasks: List[Task]) -> List[str]:
+    extra_names = {}
+    for task in tasks:
+        if task.extra_columns:
+            extra_names.update(dict.fromkeys(task.extra_columns))
+    return list(extra_names)
+
+"""
+Read a CSV task file with semicolon separator, through the fast parser if
+the file allows it.
+
+Args:
+    file_path (Path): Path of the task file
+
+Returns:
+    List[Task]: Tasks in file order
+"""
+def read_csv(file_path: Path) -> List[Task]:
+    tasks = _parse_csv_fast(file_path)
+    return tasks if tasks is not None else _parse_csv(file_path)
+
+"""
+Read a CSV task file with the csv module. Handles every CSV feature such as
+quoted fields with embedded separators or line breaks.
+"""
+def _parse_csv(file_path: Path) -> List[Task]:
+    with open(file_path, 'r', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile, delimiter=';')
+        
+        # Verify required columns exist
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in (reader.fieldnames or [])]
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
+        extra_names = [name for name in dict.fromkeys(reader.fieldnames) if name not in REQUIRED_COLUMNS]
+
+        # Read and process each row
+        tasks = []
+        for row in reader:
+            # Handle multiple values in OtherDepartments
+            other_depts = row['OtherDepartments'].strip()
+            other_departments = other_depts.split() if other_depts else []
+            
+            # Handle multiple values in DependsOnTask
+            depends_on = row['DependsOnTask'].strip()
+            depends_on_task = depends_on.split() if depends_on else []
+            
+            # Create Task object
+            task = Task(
+                task_id=row['TaskId'],
+                project=row['Project'],
+                task=row['Task'],
+                time_required=row['TimeRequired'],
+                time_spent=row['TimeSpent'],
+                progress=row['Progress'],
+                other_departments=other_departments,
+                depends_on_task=depends_on_task,
+                # Short rows have no value for the last columns
+                extra_columns={name: row[name] or "" for name in extra_names} if extra_names else None)
+            tasks.append(task)
+        return tasks
+
+"""
+Read a CSV task file through a memory map without the csv module. The whole
+file is decoded and split in bulk and tasks are built from column indexes
+instead of per-row dicts.
+
+Returns:
+    List[Task]: Tasks in file order, None if the file needs the csv module
+                (quotes, NUL bytes, short rows or an empty file)
+"""
+def _parse_csv_fast(file_path: Path) -> Optional[List[Task]]:
+    with open(file_path, 'rb') as taskfile:
+        try:
+            mapped = mmap.mmap(taskfile.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return None
+
+        with mapped:
+            if mapped.find(b'"') != -1 or mapped.find(b'\x00') != -1:
+                return None
+            text = mapped[:].decode('utf-8')
+
+    # Same newline handling as a file opened in text mode
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    lines = text.split('\n')
+
+    # Verify required columns exist
+    fieldnames = lines[0].split(';') if lines[0] else []
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in fieldnames]
+    if missing_columns:
+        raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
+
+    # Later duplicates win, like in csv.DictReader
+    column_index = {name: index for index, name in enumerate(fieldnames)}
+    i_task_id, i_project, i_task, i_time_required, i_time_spent, i_progress, \
+        i_other_departments, i_depends_on_task = [column_index[col] for col in REQUIRED_COLUMNS]
+    extra_indexes = [(name, index) for name, index in column_index.items() if name not in REQUIRED_COLUMNS]
+    min_fields = max(column_index.values()) + 1
+
+    # Pause the cyclic garbage collector, it would otherwise rescan the
+    # growing task list many times while the objects are created
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        tasks = []
+        append = tasks.append
+        for line in lines[1:]:
+            # Blank lines are skipped by csv.DictReader as well
+            if not line:
+                continue
+
+            fields = line.split(';')
+            if len(fields) < min_fields:
+                return None
+
+            append(Task(fields[i_task_id], fields[i_project], fields[i_task],
+                        fields[i_time_required], fields[i_time_spent], fields[i_progress],
+                        fields[i_other_departments].split(), fields[i_depends_on_task].split(),
+                        {name: fields[index] for name, index in extra_indexes} if extra_indexes else None))
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return tasks
+
+"""
+Write a CSV task file with semicolon separator. Extra columns of the tasks
+follow the required columns in the order they were first seen.
+"""
+def write_csv(file_path: Path, tasks: List[Task]) -> None:
+    extra_names = _extra_names(tasks)
+    rows = [_task_values(task) for task in tasks]
+    if extra_names:
+        rows = [row + tuple((task.extra_columns or {}).get(name, "") for name in extra_names)
+                for row, task in zip(rows, tasks)]
+    with open(file_path, 'w', encoding='utf-8', newline='') as csvfile:
+        writer = csv.writer(csvfile, delimiter=';', lineterminator='\n')
+        writer.writerow(REQUIRED_COLUMNS + extra_names)
+        writer.writerows(rows)
+
+"""
+Read a JSON Lines task file: one JSON object per line with the CSV column
+names as keys. List columns may be JSON arrays or space-separated strings,
+numbers are converted to strings. Other keys are kept as extra columns,
+values that are no strings as their JSON text.
+
+Args:
+    file_path (Path): Path of the task file
+
+Returns:
+    List[Task]: Tasks in file order
+"""
+def read_jsonl(file_path: Path) -> List[Task]:
+    text = file_path.read_text(encoding='utf-8')
+    lines = [line for line in text.splitlines() if line.strip()]
+
+    # Parse all lines in one call, only on errors line by line for the line number.
+    # A line holding several comma-separated values would parse as well, the
+    # record count catches it and the line by line parse reports it.
+    try:
+        records = json.loads("[" + ",".join(lines) + "]")
+    except ValueError:
+        records = None
+    if records is None or len(records) != len(lines):
+        records = []
+        for line_number, line in enumerate(text.splitlines(), 1):
+            if line.strip():
+                try:
+                    records.append(json.loads(line))
+                except ValueError as error:
+                    raise ValueError(f"Invalid JSON in line {line_number}: {error}") from None
+
+    tasks = []
+    for line_number, record in enumerate(records, 1):
+        if not isinstance(record, dict):
+            raise ValueError(f"Record {line_number} is not a JSON object")
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in record]
+        if missing_columns:
+            raise ValueError(f"Missing required columns in record {line_number}: {', '.join(missing_columns)}")
+
+        values = []
+        for column in REQUIRED_COLUMNS:
+            value = record[column]
+            if column in LIST_COLUMNS:
+                value = [str(item) for item in value] if isinstance(value, list) else str(value).split()
+            elif not isinstance(value, str):
+                value = "" if value is None else str(value)
+            values.append(value)
+        extra_columns = {key: _extra_value(value) for key, value in record.items() if key not in REQUIRED_COLUMNS}
+        tasks.append(Task(*values, extra_columns=extra_columns or None))
+    return tasks
+
+def _extra_value(value) -> str:
+    """Return the string of an extra JSON value, like the scalar columns."""
+    if isinstance(value, str):
+        return value
+    return "" if value is None else json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+"""
+Write a JSON Lines task file, list columns as JSON arrays. Extra columns
+follow the required columns.
+"""
+def write_jsonl(file_path: Path, tasks: List[Task]) -> None:
+    with open(file_path, 'w', encoding='utf-8', newline='\n') as jsonl_file:
+        for task in tasks:
+            record = dict(zip(REQUIRED_COLUMNS, (task.task_id, task.project, task.task, task.time_required,
+                                                 task.time_spent, task.progress, task.other_departments,
+                                                 task.depends_on_task)))
+            if task.extra_columns:
+                record.update(task.extra_columns)
+            jsonl_file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+def _encode_values(values) -> bytes:
+    """Join values NUL-terminated, NUL bytes cannot be stored."""
+    data = "".join(value + "\x00" for value in values)
+    if data.count("\x00") != len(values):
+        raise ValueError("Task values must not contain NUL characters")
+    return data.encode('utf-8')
+
+def _decode_values(data) -> List[str]:
+    """Split NUL-terminated values."""
+    return data.decode('utf-8').split("\x00")[:-1]
+
+"""
+Write a columnar task file. Each column is stored as one block, columns
+with few distinct values (e.g. Project) are dictionary-encoded. Extra
+columns follow the required columns in the order they were first seen.
+"""
+def write_columnar(file_path: Path, tasks: List[Task]) -> None:
+    extra_names = _extra_names(tasks)
+    rows = [_task_values(task) for task in tasks]
+    if extra_names:
+        rows = [row + tuple((task.extra_columns or {}).get(name, "") for name in extra_names)
+                for row, task in zip(rows, tasks)]
+    names = _encode_values(REQUIRED_COLUMNS + extra_names)
+
+    blocks = []
+    for index in range(len(REQUIRED_COLUMNS) + len(extra_names)):
+        values = [row[index] for row in rows]
+        distinct = dict.fromkeys(values)
+        if len(distinct) <= len(values) // 2:
+            codes_by_value = {value: code for code, value in enumerate(distinct)}
+            dictionary = _encode_values(list(distinct))
+            codes = array('I', (codes_by_value[value] for value in values))
+            blocks.append((DICTIONARY_ENCODING, struct.pack("<I", len(dictionary)) + dictionary + codes.tobytes()))
+        else:
+            blocks.append((PLAIN_ENCODING, _encode_values(values)))
+
+    offset = _COLUMNAR_HEADER.size + len(names) + _COLUMN_ENTRY.size * len(blocks)
+    directory = []
+    for encoding, data in blocks:
+        directory.append(_COLUMN_ENTRY.pack(encoding, offset, len(data)))
+        offset += len(data)
+
+    with open(file_path, 'wb') as columnar_file:
+        columnar_file.write(_COLUMNAR_HEADER.pack(COLUMNAR_MAGIC, len(rows), len(blocks), len(names)))
+        columnar_file.write(names)
+        columnar_file.writelines(directory)
+        for _, data in blocks:
+            columnar_file.write(data)
+
+"""
+Read a columnar task file through a memory map. Every column is decoded
+with one bulk split, columns beyond the required ones become extra columns.
+
+Args:
+    file_path (Path): Path of the task file
+
+Returns:
+    List[Task]: Tasks in file order
+"""
+def read_columnar(file_path: Path) -> List[Task]:
+    with open(file_path, 'rb') as columnar_file:
+        try:
+            mapped = mmap.mmap(columnar_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError(f"Empty task file: {file_path}") from None
+
+    with mapped:
+        if len(mapped) < _COLUMNAR_HEADER.size:
+            raise ValueError(f"Not a columnar task file: {file_path}")
+        magic, row_count, column_count, names_length = _COLUMNAR_HEADER.unpack_from(mapped, 0)
+        if magic != COLUMNAR_MAGIC:
+            raise ValueError(f"Not a columnar task file: {file_path}")
+
+        position = _COLUMNAR_HEADER.size
+        names = _decode_values(mapped[position:position + names_length])
+        position += names_length
+        directory = {}
+        for name in names[:column_count]:
+            directory[name] = _COLUMN_ENTRY.unpack_from(mapped, position)
+            position += _COLUMN_ENTRY.size
+
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in directory]
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
+
+        extra_names = [name for name in directory if name not in REQUIRED_COLUMNS]
+        columns = []
+        for column in REQUIRED_COLUMNS + extra_names:
+            encoding, offset, length = directory[column]
+            if offset + length > len(mapped):
+                raise ValueError(f"Truncated columnar task file: {file_path}")
+            if encoding == DICTIONARY_ENCODING:
+                dictionary_length, = struct.unpack_from("<I", mapped, offset)
+                dictionary = _decode_values(mapped[offset + 4:offset + 4 + dictionary_length])
+                codes = array('I')
+                codes.frombytes(mapped[offset + 4 + dictionary_length:offset + length])
+                values = list(map(dictionary.__getitem__, codes))
+            else:
+                values = _decode_values(mapped[offset:offset + length])
+            if len(values) != row_count:
+                raise ValueError(f"Column {column} has {len(values)} values instead of {row_count}")
+            columns.append(values)
+
+    tasks = [Task(task_id, project, task, time_required, time_spent, progress,
+                  other_departments.split(), depends_on_task.split())
+             for task_id, project, task, time_required, time_spent, progress, other_departments, depends_on_task
+             in zip(*columns[:len(REQUIRED_COLUMNS)])]
+    if extra_names:
+        for task, values in zip(tasks, zip(*columns[len(REQUIRED_COLUMNS):])):
+            task.extra_columns = dict(zip(extra_names, values))
+    return tasks
+
+# Built-in formats
+register_format("csv", [".csv"], read_csv, write_csv)
+register_format("jsonl", [".jsonl", ".ndjson"], read_jsonl, write_jsonl)
+register_format("columnar", [".tcol"], read_columnar, write_columnar)
@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Set, Tuple
+import os
+
+# Boards smaller than this are laid out in-process, a pool would only add startup time
+PARALLEL_LAYOUT_MIN_TASKS = 50000
+
+# The parts of a task the layout needs, cheap to send to worker processes
+LayoutNode = namedtuple("LayoutNode", ["task_id", "depends_on_task"])
+
+"""
+Calculate horizontal positions for all tasks based on their dependencies (project-overarching).
+
+Args:
+    all_tasks (List[Task]): Tasks to place
+
+Returns:
+    Dict[str, int]: Column index per task ID
+"""
+def calculate_task_positions(all_tasks) -> Dict[str, int]:
+    # Create task lookup dictionary
+    task_dict = {task.task_id: task for task in all_tasks}
+    positions = {}
+    # To avoid infinite recursion in case of circular dependencies
+    visited = set()
+
+    def get_position(task):
+        if task.task_id in positions:
+            return positions[task.task_id]
+        if task.task_id in visited:
+            # Circular dependency fallback
+            return 0
+        visited.add(task.task_id)
+        if not task.depends_on_task:
+            pos = 0
+        else:
+            dep_positions = []
+            for dep_id in task.depends_on_task:
+                dep_task = task_dict.get(dep_id)
+                if dep_task:
+                    dep_positions.append(get_position(dep_task))
+            if dep_positions:
+                pos = max(dep_positions) + 1
+            else:
+                pos = 0
+        positions[task.task_id] = pos
+        return pos
+
+    for task in all_tasks:
+        get_position(task)
+    return positions
+
+"""
+Split the tasks into the weakly connected components of the dependency graph
+using union-find. Dependencies on unknown task IDs are ignored, like in
+calculate_task_positions.
+
+Args:
+    all_tasks (List[Task]): Tasks to split
+
+Returns:
+    List[List[Task]]: Components, tasks keep their original order
+"""
+def find_components(all_tasks) -> List[list]:
+    index = {}
+    for task in all_tasks:
+        index.setdefault(task.task_id, len(index))
+
+    parent = list(range(len(index)))
+    size = [1] * len(index)
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]  # Path halving
+            node = parent[node]
+        return node
+
+    for task in all_tasks:
+        root = find(index[task.task_id])
+        for dep_id in task.depends_on_task:
+            dep_node = index.get(dep_id)
+            if dep_node is None:
+                continue
+            dep_root = find(dep_node)
+            if dep_root != root:
+                # Union by size
+                if size[root] < size[dep_root]:
+                    root, dep_root = dep_root, root
+                parent[dep_root] = root
+                size[root] += size[dep_root]
+
+    components = {}
+    for task in all_tasks:
+        components.setdefault(find(index[task.task_id]), []).append(task)
+    return list(components.values())
+
+"""
+Lay out a batch of components in a worker process.
+
+Args:
+    components (List[List[LayoutNode]]): Components of the batch
+
+Returns:
+    Dict[str, int]: Column index per task ID
+"""
+def _layout_components(components) -> Dict[str, int]:
+    positions = {}
+    for component in components:
+        positions.update(calculate_task_positions(component))
+    return positions
+
+"""
+Calculate the same positions as calculate_task_positions, but lay out the
+weakly connected components of the dependency graph in parallel processes.
+Components do not depend on each other, so their columns are merged into
+the global positions as they are.
+
+Args:
+    all_tasks (List[Task]): Tasks to place
+    max_workers (int): Number of processes, defaults to the CPU count
+    min_tasks (int): Smaller boards are laid out in-process
+
+Returns:
+    Dict[str, int]: Column index per task ID
+"""
+def calculate_task_positions_parallel(all_tasks, max_workers: int = None,
+                                      min_tasks: int = PARALLEL_LAYOUT_MIN_TASKS) -> Dict[str, int]:
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if len(all_tasks) < min_tasks or max_workers < 2:
+        return calculate_task_positions(all_tasks)
+
+    components = find_components(all_tasks)
+    if len(components) < 2:
+        return calculate_task_positions(all_tasks)
+
+    # Spread the components over a few batches per worker, largest first
+    batch_count = min(len(components), max_workers * 4)
+    batches = [[] for _ in range(batch_count)]
+    batch_sizes = [0] * batch_count
+    for component in sorted(components, key=len, reverse=True):
+        smallest = batch_sizes.index(min(batch_sizes))
+        batches[smallest].append([LayoutNode(task.task_id, task.depends_on_task) for task in component])
+        batch_sizes[smallest] += len(component)
+
+    positions = {}
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for batch_positions in executor.map(_layout_components, batches):
+                positions.update(batch_positions)
+    except (OSError, BrokenProcessPool):
+        # No worker processes available, lay out in-process instead
+        return calculate_task_positions(all_tasks)
+    return positions
+
+"""
+Recalculate the column of one task and of everything downstream of it after
+its dependencies changed. Only the downstream subgraph found through the
+reverse dependency index is visited, in topological order. Self-dependencies
+are treated like in calculate_task_positions, other cycles are broken at
+their first task.
+
+Args:
+    positions (Dict[str, int]): Column per task ID, updated in place
+    task_index (Dict[str, Task]): Task per task ID
+    dependents (Dict[str, List[str]]): IDs of the tasks depending on each task ID
+    task_id (str): ID of the edited task
+
+Returns:
+    Set[str]: IDs of the tasks whose column changed
+"""
+def update_task_positions(positions: Dict[str, int], task_index, dependents: Dict[str, List[str]],
+                          task_id: str) -> Set[str]:
+    # Collect the edited task and all its transitive dependents, in a stable order
+    affected = {}
+    stack = [task_id]
+    while stack:
+        current = stack.pop()
+        if current in affected or current not in task_index:
+            continue
+        affected[current] = None
+        stack.extend(dependents.get(current, ()))
+
+    # Count the affected dependencies of every affected task, a task depending
+    # on itself is not waiting for itself
+    in_degree = dict.fromkeys(affected, 0)
+    for current in affected:
+        for dependent in dependents.get(current, ()):
+            if dependent in in_degree and dependent != current:
+                in_degree[dependent] += 1
+
+    def column(current):
+        # Like calculate_task_positions, a self-dependency counts as a dependency in column 0
+        dep_positions = [0 if dep_id == current else positions.get(dep_id, 0)
+                         for dep_id in task_index[current].depends_on_task if dep_id in task_index]
+        return max(dep_positions) + 1 if dep_positions else 0
+
+    changed = set()
+    queue = deque(current for current in affected if in_degree[current] == 0)
+    while in_degree:
+        if not queue:
+            # Only circular dependencies are left, break the cycle at its first task
+            queue.append(next(iter(in_degree)))
+        current = queue.popleft()
+        if current not in in_degree:
+            continue
+        del in_degree[current]
+        new_position = column(current)
+        if positions.get(current) != new_position:
+            positions[current] = new_position
+            changed.add(current)
+        for dependent in dependents.get(current, ()):
+            if dependent in in_degree:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+
+    return changed
+
+"""
+Find the circular dependencies among the tasks left when a topological
+order gets stuck: the strongly connected components of the remaining
+dependency graph (Tarjan), of which only those waiting for no other
+remaining task are returned. Breaking these depends on nothing but the
+cycle and its finished dependencies.
+
+Args:
+    pending (Dict[str, int]): Remaining task IDs
+    task_index (Dict[str, Task]): Task per task ID
+
+Returns:
+    List[List[str]]: Task IDs of each cycle
+"""
+def _waiting_cycles(pending, task_index) -> List[List[str]]:
+    number = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    cycles = []
+    for root in pending:
+        if root in number:
+            continue
+        number[root] = low[root] = len(number)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(task_index[root].depends_on_task))]
+        while work:
+            node, deps = work[-1]
+            for dep_id in deps:
+                if dep_id not in pending or dep_id == node:
+                    continue
+                if dep_id not in number:
+                    number[dep_id] = low[dep_id] = len(number)
+                    stack.append(dep_id)
+                    on_stack.add(dep_id)
+                    work.append((dep_id, iter(task_index[dep_id].depends_on_task)))
+                    break
+                if dep_id in on_stack:
+                    low[node] = min(low[node], number[dep_id])
+            else:
+                work.pop()
+                if work:
+                    low[work[-1][0]] = min(low[work[-1][0]], low[node])
+                if low[node] == number[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    cycles.append(component)
+
+    component_of = {task_id: index for index, component in enumerate(cycles) for task_id in component}
+    return [component for index, component in enumerate(cycles)
+            if all(component_of[dep_id] == index for task_id in component
+                   for dep_id in task_index[task_id].depends_on_task if dep_id in pending)]
+
+"""
+Calculate the earliest start of every task on a time axis: a task starts
+when the last of its dependencies is finished and lasts its TimeRequired
+hours. Invalid times count as zero hours. A task depending on itself does
+not wait for itself. A circular dependency is broken at its first task in
+file order, which starts after the dependencies finished by then. Tasks
+waiting for a cycle start after it, like any other dependents.
+
+Args:
+    all_tasks (List[Task]): Tasks to schedule, for duplicate IDs the last one counts
+
+Returns:
+    Dict[str, Tuple[float, float]]: (start, duration) in hours per task ID
+"""
+def calculate_task_schedule(all_tasks) -> Dict[str, Tuple[float, float]]:
+    task_dict = {task.task_id: task for task in all_tasks}
+
+    durations = {}
+    in_degree = {}
+    dependents = {}
+    for task_id, task in task_dict.items():
+        try:
+            durations[task_id] = max(float(task.time_required), 0.0)
+        except ValueError:
+            durations[task_id] = 0.0
+        known_deps = [dep_id for dep_id in task.depends_on_task if dep_id in task_dict and dep_id != task_id]
+        in_degree[task_id] = len(known_deps)
+        for dep_id in known_deps:
+            dependents.setdefault(dep_id, []).append(task_id)
+
+    schedule = {}
+
+    def start(task_id):
+        finishes = [schedule[dep_id][0] + schedule[dep_id][1] for dep_id in task_dict[task_id].depends_on_task
+                    if dep_id != task_id and dep_id in schedule]
+        return max(finishes) if finishes else 0.0
+
+    queue = deque(task_id for task_id, degree in in_degree.items() if degree == 0)
+    file_order = {task_id: order for order, task_id in enumerate(task_dict)}
+    while in_degree:
+        if not queue:
+            # Only cycles and the tasks waiting for them are left, break the cycles at their first task in file order
+            queue.extend(min(cycle, key=file_order.__getitem__) for cycle in _waiting_cycles(in_degree, task_dict))
+        task_id = queue.popleft()
+        if task_id not in in_degree:
+            continue
+        del in_degree[task_id]
+        schedule[task_id] = (start(task_id), durations[task_id])
+        for dependent in dependents.get(task_id, ()):
+            if dependent in in_degree:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+
+    return schedule
+
+"""
+Recalculate the schedule of one task and of everything downstream of it
+after its required time or its dependencies changed. Only the downstream
+subgraph found through the reverse dependency index is visited, in
+topological order. A task depending on itself does not wait for itself,
+like in calculate_task_schedule. Other cycles are broken like there at
+their first task in file order, which starts after the dependencies
+scheduled by then, and the topological order continues from there. Only a
+cycle walks the task index for the file order, so the result equals
+calculate_task_schedule.
+
+Args:
+    schedule (Dict[str, Tuple[float, float]]): (start, duration) per task ID, updated in place
+    task_index (Dict[str, Task]): Task per task ID
+    dependents (Dict[str, List[str]]): IDs of the tasks depending on each task ID
+    task_id (str): ID of the edited task
+
+Returns:
+    Set[str]: IDs of the tasks whose start or duration changed
+"""
+def update_task_schedule(schedule: Dict[str, Tuple[float, float]], task_index, dependents: Dict[str, List[str]],
+                         task_id: str) -> Set[str]:
+    # Collect the edited task and all its transitive dependents, in a stable order
+    affected = {}
+    stack = [task_id]
+    while stack:
+        current = stack.pop()
+        if current in affected or current not in task_index:
+            continue
+        affected[current] = None
+        stack.extend(dependents.get(current, ()))
+
+    # Count the affected dependencies of every affected task, a task depending
+    # on itself is not waiting for itself
+    in_degree = dict.fromkeys(affected, 0)
+    for current in affected:
+        for dependent in dependents.get(current, ()):
+            if dependent in in_degree and dependent != current:
+                in_degree[dependent] += 1
+
+    def timing(current):
+        task = task_index[current]
+        try:
+            duration = max(float(task.time_required), 0.0)
+        except ValueError:
+            duration = 0.0
+        # Dependencies still waiting in a broken cycle are not scheduled yet
+        finishes = [schedule[dep_id][0] + schedule[dep_id][1] for dep_id in task.depends_on_task
+                    if dep_id != current and dep_id not in in_degree and dep_id in task_index and dep_id in schedule]
+        return (max(finishes) if finishes else 0.0, duration)
+
+    changed = set()
+    queue = deque(current for current in affected if in_degree[current] == 0)
+    file_order = None
+    while in_degree:
+        if not queue:
+            # Only cycles and the tasks waiting for them are left, break the cycles at their first task in file order
+            if file_order is None:
+                file_order = {current: order for order, current in enumerate(task_index)}
+            queue.extend(min(cycle, key=file_order.__getitem__) for cycle in _waiting_cycles(in_degree, task_index))
+        current = queue.popleft()
+        if current not in in_degree:
+            continue
+        del in_degree[current]
+        new_timing = timing(current)
+        if schedule.get(current) != new_timing:
+            schedule[current] = new_timing
+            changed.add(current)
+        for dependent in dependents.get(current, ()):
+            if dependent in in_degree:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+
+    return changed
@@ -3,22 +3,17 @@
 @author: Jan-Eric-P
 """
 
-import csv
+import gc
+import os
+import shutil
+import sys
+import tempfile
 from pathlib import Path
-from typing import List
-
-# Task class
-class Task:
-    def __init__(self, task_id: str, project: str, task: str, time_required: str,
-                 time_spent: str, progress: str, other_departments: List[str], depends_on_task):
-        self.task_id = task_id
-        self.project = project
-        self.task = task
-        self.time_required = time_required
-        self.time_spent = time_spent
-        self.progress = progress
-        self.other_departments = other_departments
-        self.depends_on_task = depends_on_task
+from typing import Dict, Iterator, List, TextIO, Tuple
+from report import write_rows
+from task import Task, REQUIRED_COLUMNS
+# The format registry stays importable from this module
+from task_formats import TASK_FORMATS, TaskFormat, find_format, register_format
 
 # TaskList class
 class TaskList:
@@ -27,112 +22,295 @@ class TaskList:
     """
     def __init__(self):
         self.file_path = None
+        self.file_format = None  # Format name of the task file, see TASK_FORMATS
+        self.read_only = False  # The task file must not be written back, e.g. a copy of a remote source
 
         self.tasks: List[Task] = []
 
+        # Lookup indexes, rebuilt after every read
+        self.task_index: Dict[str, Task] = {}
+        self.dependents: Dict[str, List[str]] = {}
+
     """
-    Read a CSV file with semicolon separator and store the data as Task objects.
+    Read a task file and store the data as Task objects.
     
     Args:
-        file_path (str): Path to the CSV file
+        file_path (str): Path to the task file
+        file_format (str): Name of a registered format, by default it is
+                           chosen by the file suffix
     """
-    def read(self, file_path: str) -> None:
+    def read(self, file_path: str, file_format: str = None) -> None:
 
         self.file_path = Path(file_path)
         
         if not self.file_path.exists():
             raise FileNotFoundError(f"Task file not found: {file_path}")
         
-        if self.file_path.suffix != ".csv":
-            raise ValueError(f"Unsupported file type: {file_path.suffix}")
-
-        with open(self.file_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile, delimiter=';')
-            
-            # Verify required columns exist
-            required_columns = ['TaskId', 'Project', 'Task', 'TimeRequired', 
-                              'TimeSpent', 'Progress', 'OtherDepartments', 'DependsOnTask']
-            
-            missing_columns = [col for col in required_columns if col not in reader.fieldnames]
-            if missing_columns:
-                raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
-
-            # Clear existing data
-            self.tasks = []
-
-            # Read and process each row
-            for row in reader:
-                # Handle multiple values in OtherDepartments
-                other_depts = row['OtherDepartments'].strip()
-                other_departments = other_depts.split() if other_depts else []
-                
-                # Handle multiple values in DependsOnTask
-                depends_on = row['DependsOnTask'].strip()
-                depends_on_task = depends_on.split() if depends_on else []
-                
-                # Create Task object
-                task = Task(
-                    task_id=row['TaskId'],
-                    project=row['Project'],
-                    task=row['Task'],
-                    time_required=row['TimeRequired'],
-                    time_spent=row['TimeSpent'],
-                    progress=row['Progress'],
-                    other_departments=other_departments,
-                    depends_on_task=depends_on_task                )
-                self.tasks.append(task) 
-
-    """	
-    Print all tasks in a formatted table on the command line.
-    """
-    def print(self) -> None:
-        """
-        Print all tasks in a formatted table on the command line.
-        """
-        if not self.tasks:
-            print("No tasks available.")
+        self.file_format = find_format(self.file_path, file_format)
+
+        # Pause the cyclic garbage collector, it would otherwise rescan the
+        # new tasks many times while the readers and the indexes create objects
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.tasks = TASK_FORMATS[self.file_format].reader(self.file_path)
+            self._build_indexes()
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    """
+    Build the task ID lookup and the reverse dependency index.
+    """
+    def _build_indexes(self) -> None:
+        self.task_index = {task.task_id: task for task in self.tasks}
+        self.dependents = {}
+        for task in self.tasks:
+            for dep_id in task.depends_on_task:
+                self.dependents.setdefault(dep_id, []).append(task.task_id)
+
+    """
+    Change fields of a single task and keep the indexes up to date.
+    Arguments left at None are not changed.
+
+    Args:
+        task_id (str): ID of the task to edit
+        time_required (str): New required time
+        time_spent (str): New spent time
+        progress (str): New progress percentage
+        depends_on_task (List[str]): New dependency IDs
+
+    Returns:
+        Task: The edited task
+    """
+    def update_task(self, task_id: str, time_required: str = None, time_spent: str = None,
+                    progress: str = None, depends_on_task: List[str] = None) -> Task:
+        task = self.task_index.get(task_id)
+        if task is None:
+            raise ValueError(f"Unknown task: {task_id}")
+
+        if time_required is not None:
+            task.time_required = time_required
+        if time_spent is not None:
+            task.time_spent = time_spent
+        if progress is not None:
+            task.progress = progress
+
+        if depends_on_task is not None:
+            # Move the task between the reverse dependency lists
+            for dep_id in task.depends_on_task:
+                dependents = self.dependents.get(dep_id)
+                if dependents and task_id in dependents:
+                    dependents.remove(task_id)
+            task.depends_on_task = list(depends_on_task)
+            for dep_id in task.depends_on_task:
+                self.dependents.setdefault(dep_id, []).append(task_id)
+
+        return task
+
+    """
+    Write all tasks back to a task file. The data is written to a temporary
+    file next to the target which then replaces the target, so readers never
+    see a partially written file. The target keeps its file mode.
+
+    Args:
+        file_path (str): Target file, defaults to the file that was read
+        file_format (str): Name of a registered format, by default the format
+                           that was read for the same file, otherwise chosen
+                           by the file suffix
+
+    Raises:
+        ValueError: No target, or the target is the read file of a read-only task list
+    """
+    def write(self, file_path: str = None, file_format: str = None) -> None:
+        target = Path(file_path) if file_path is not None else self.file_path
+        if target is None:
+            raise ValueError("No task file to write to")
+        if self.read_only and target == self.file_path:
+            raise ValueError(f"Task file is read-only: {target}")
+        if file_format is None and target == self.file_path:
+            file_format = self.file_format
+        writer = TASK_FORMATS[find_format(target, file_format)].writer
+
+        temp_file = tempfile.NamedTemporaryFile('wb', delete=False, dir=target.parent,
+                                                prefix=f".{target.name}.", suffix=".tmp")
+        temp_file.close()
+        try:
+            writer(Path(temp_file.name), self.tasks)
+            copy_file_mode(target, temp_file.name)
+            os.replace(temp_file.name, target)
+        except BaseException:
+            os.unlink(temp_file.name)
+            raise
+
+    """
+    Print all tasks on the command line. The rows are collected first and
+    written in one bulk write with auto-fitted column widths.
+
+    Args:
+        output_format (str): "table", "csv" or "json"
+        file (TextIO): Output stream, defaults to sys.stdout
+    """
+    def print(self, output_format: str = "table", file: TextIO = None) -> None:
+        if file is None:
+            file = sys.stdout
+
+        if not self.tasks and output_format == "table":
+            file.write("No tasks available.\n")
             return
 
-        # Define column widths
-        col_widths = {
-            'TaskId': 5,
-            'Project': 12,
-            'Task': 20,
-            'TimeRequired': 12,
-            'TimeSpent': 10,
-            'Progress': 8,
-            'OtherDepartments': 15,
-            'DependsOnTask': 12
-        }
-
-        # Print header
-        header = (
-            f"{'TaskId':<{col_widths['TaskId']}} | "
-            f"{'Project':<{col_widths['Project']}} | "
-            f"{'Task':<{col_widths['Task']}} | "
-            f"{'TimeRequired':<{col_widths['TimeRequired']}} | "
-            f"{'TimeSpent':<{col_widths['TimeSpent']}} | "
-            f"{'Progress':<{col_widths['Progress']}} | "
-            f"{'OtherDepts':<{col_widths['OtherDepartments']}} | "
-            f"{'DependsOn':<{col_widths['DependsOnTask']}}"
-        )
-        print(header)
-        print("-" * len(header))
-
-        # Print each task
+        if output_format == "table":
+            # Short labels and "-" placeholders keep the table readable
+            header = ['TaskId', 'Project', 'Task', 'TimeRequired', 'TimeSpent',
+                      'Progress', 'OtherDepts', 'DependsOn']
+            rows = [(task.task_id, task.project, task.task, task.time_required,
+                     task.time_spent, task.progress,
+                     " ".join(task.other_departments) or "-",
+                     " ".join(task.depends_on_task) or "-")
+                    for task in self.tasks]
+        else:
+            # Same columns and list encoding as the task file
+            header = REQUIRED_COLUMNS
+            rows = self._file_rows()
+
+        write_rows(header, rows, output_format, file)
+
+    """
+    Return all tasks as rows of the task file columns.
+    """
+    def _file_rows(self) -> List[tuple]:
+        return [(task.task_id, task.project, task.task, task.time_required,
+                 task.time_spent, task.progress,
+                 " ".join(task.other_departments),
+                 " ".join(task.depends_on_task))
+                for task in self.tasks]
+
+    """
+    Check the task data for problems the CSV structure cannot catch.
+
+    Returns:
+        List[str]: One message per problem, empty if the data is valid
+    """
+    def validate(self) -> List[str]:
+        problems = []
+        task_ids = set()
+
         for task in self.tasks:
-            # Format lists as comma-separated strings
-            other_depts = " ".join(task.other_departments) if task.other_departments else "-"
-            depends_on = " ".join(task.depends_on_task) if task.depends_on_task else "-"
-
-            # Print task row
-            print(
-                f"{task.task_id:<{col_widths['TaskId']}} | "
-                f"{task.project:<{col_widths['Project']}} | "
-                f"{task.task:<{col_widths['Task']}} | "
-                f"{task.time_required:<{col_widths['TimeRequired']}} | "
-                f"{task.time_spent:<{col_widths['TimeSpent']}} | "
-                f"{task.progress:<{col_widths['Progress']}} | "
-                f"{other_depts:<{col_widths['OtherDepartments']}} | "
-                f"{depends_on:<{col_widths['DependsOnTask']}}"
-            ) 
\ No newline at end of file
+            if task.task_id in task_ids:
+                problems.append(f"{task.task_id}: duplicate TaskId")
+            task_ids.add(task.task_id)
+
+            for column, value in (('TimeRequired', task.time_required),
+                                  ('TimeSpent', task.time_spent),
+                                  ('Progress', task.progress)):
+                number = _to_int(value)
+                if number is None:
+                    problems.append(f"{task.task_id}: {column} is not a number: {value!r}")
+                elif number < 0 or (column == 'Progress' and number > 100):
+                    problems.append(f"{task.task_id}: {column} out of range: {number}")
+
+        for task in self.tasks:
+            for dep_id in task.depends_on_task:
+                if dep_id == task.task_id:
+                    problems.append(f"{task.task_id}: depends on itself")
+                elif dep_id not in task_ids:
+                    problems.append(f"{task.task_id}: unknown dependency {dep_id}")
+
+        return problems
+
+    """
+    Summarize the tasks per project.
+
+    Args:
+        projects (List[str]): Projects to summarize, None for all projects
+
+    Returns:
+        Dict[str, Dict[str, float]]: Per project the task count, the summed
+                                     required and spent time and the average
+                                     progress. Invalid numbers are skipped.
+    """
+    def summary(self, projects: List[str] = None) -> Dict[str, Dict[str, float]]:
+        project_tasks = {}
+        if projects is not None:
+            projects = set(projects)
+            project_tasks = {project: [] for project in projects}
+        for task in self.tasks:
+            if projects is not None and task.project not in projects:
+                continue
+            project_tasks.setdefault(task.project, []).append(task)
+        return {project: summarize_tasks(tasks) for project, tasks in project_tasks.items()}
+
+    """
+    Stream the tasks lane by lane in chunks, e.g. to write a large board
+    piece by piece without building its whole output in memory. Projects
+    keep the order of their first task and the tasks keep their file order
+    within the project.
+
+    Args:
+        chunk_size (int): Maximum number of tasks per chunk
+
+    Yields:
+        Tuple[str, List[Task], int]: Project, its next tasks and the position
+                                     of the first of them within the project
+    """
+    def project_chunks(self, chunk_size: int) -> Iterator[Tuple[str, List[Task], int]]:
+        if chunk_size < 1:
+            raise ValueError(f"Invalid chunk size: {chunk_size}")
+        # Only references to the existing tasks are grouped
+        project_tasks = {}
+        for task in self.tasks:
+            project_tasks.setdefault(task.project, []).append(task)
+        for project, tasks in project_tasks.items():
+            for first_row in range(0, len(tasks), chunk_size):
+                yield project, tasks[first_row:first_row + chunk_size], first_row
+
+"""
+Summarize a group of tasks, e.g. the tasks of one lane.
+
+Returns:
+    Dict[str, float]: Task count, summed required and spent time and average
+                      progress. Invalid numbers are skipped.
+"""
+def summarize_tasks(tasks: List[Task]) -> Dict[str, float]:
+    time_required = 0
+    time_spent = 0
+    progress_sum = 0
+    progress_count = 0
+    for task in tasks:
+        time_required += _to_int(task.time_required) or 0
+        time_spent += _to_int(task.time_spent) or 0
+        progress = _to_int(task.progress)
+        if progress is not None:
+            progress_sum += progress
+            progress_count += 1
+    return {'tasks': len(tasks), 'time_required': time_required, 'time_spent': time_spent,
+            'progress': round(progress_sum / progress_count, 1) if progress_count else 0.0}
+
+"""
+Give a freshly written temporary file the mode of the file it replaces.
+Temporary files are created readable by the owner only, a new target gets
+the default mode of new files instead.
+
+Args:
+    target (Path): File that is about to be replaced
+    temp_path (str): Temporary file replacing it
+"""
+def copy_file_mode(target, temp_path) -> None:
+    try:
+        shutil.copymode(target, temp_path)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_path, 0o666 & ~umask)
+
+"""
+Convert a numeric CSV value to int.
+
+Returns:
+    int: The value, or None if it is not an integer
+"""
+def _to_int(value: str):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
@@ -5,37 +5,214 @@
 
 from configuration import Configuration
 from task_list import TaskList
-from main_window import MainWindow
-from PyQt5.QtWidgets import QApplication
+from task_layout import calculate_task_positions
+from report import OUTPUT_FORMATS, write_rows
+from remote_source import RemoteTaskSource, is_url, default_cache_path
+from batch_render import RENDER_FORMATS, DEFAULT_TIMEOUT, render_boards
+from html_export import export_html
+import memory_report
+from pathlib import Path
+import argparse
 import sys
+import time
+
+# Commands that run without a display
+HEADLESS_COMMANDS = ["validate", "summary", "print", "memory", "export"]
+
+# Commands that render boards offscreen in worker processes, without a configuration of their own
+BATCH_COMMANDS = ["render"]
 
 """
-Main function
+Parse the command line arguments.
 """
-def main():
-    # Create application
-    app = QApplication(sys.argv)
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Task Tool")
+    parser.add_argument("command", nargs="?", default="gui", choices=["gui"] + HEADLESS_COMMANDS + BATCH_COMMANDS,
+                        help="gui (default) opens the board, render draws the boards of the sources "
+                             "offscreen, the other commands run without Qt")
+    parser.add_argument("sources", nargs="*", help="configuration or task files of the render command")
+    parser.add_argument("--config", default="config.json", help="configuration file (default: config.json)")
+    parser.add_argument("--task-file", help="task file or HTTP(S) URL, overrides TASK_FILE_PATH from the configuration")
+    parser.add_argument("--task-format", help="task file format (csv, jsonl, columnar), "
+                                              "overrides TASK_FILE_FORMAT, default: by file suffix")
+    parser.add_argument("--format", default="table", choices=OUTPUT_FORMATS, dest="output_format",
+                        help="output format of the print and summary commands")
+    parser.add_argument("--memory-report", action="store_true",
+                        help="trace memory allocations for the memory report of the GUI")
+    parser.add_argument("--output-dir", default="boards", help="directory of the rendered boards (default: boards)")
+    parser.add_argument("--image-format", default="png", choices=RENDER_FORMATS,
+                        help="file format of the rendered boards (default: png)")
+    parser.add_argument("--jobs", type=int, help="number of parallel render processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"time limit per board in seconds (default: {DEFAULT_TIMEOUT})")
+    parser.add_argument("--output", default="board.html", help="HTML file of the export command (default: board.html)")
+    return parser.parse_args(argv)
 
-    # load configuration
+"""
+Load the configuration file. It is optional if the task file is given on
+the command line.
+"""
+def load_configuration(args) -> Configuration:
     config = Configuration()
-    config.read("config.json")
-    print(config.task_file_path)
+    if args.task_file is None or Path(args.config).exists():
+        config.read(args.config)
+    return config
+
+"""
+Return the remote task source named by the arguments or by the
+configuration file, None if the task file is a local file. The cache of a
+URL given on the command line is kept in the current directory.
+"""
+def open_remote_source(args, config: Configuration):
+    if args.task_file is None:
+        remote_source = config.remote_source()
+        if remote_source is not None and args.task_format is not None:
+            remote_source.file_format = args.task_format
+        return remote_source
+    if is_url(args.task_file):
+        return RemoteTaskSource(args.task_file, default_cache_path(args.task_file, Path.cwd()), args.task_format)
+    return None
+
+"""
+Load the task list named by the arguments or by the configuration file.
+A remote source is fetched, or read from its cache when it is unchanged or
+cannot be reached.
+"""
+def load_task_list(args, config: Configuration, remote_source=None) -> TaskList:
+    if remote_source is not None:
+        return remote_source.read()
+
+    task_file_path = args.task_file
+    if task_file_path is None:
+        task_file_path = config.task_file_path
+    task_file_format = args.task_format
+    if task_file_format is None and args.task_file is None:
+        task_file_format = config.task_file_format
 
-    # load task list
     task_list = TaskList()
-    task_list.read(config.task_file_path)
-    task_list.print()
+    task_list.read(task_file_path, task_file_format)
+    return task_list
+
+"""
+Run a headless command. Qt is never imported on this path.
+
+Returns:
+    int: Process exit code
+"""
+def run_headless(args, task_list: TaskList) -> int:
+    if args.command == "validate":
+        problems = task_list.validate()
+        if problems:
+            sys.stderr.write("\n".join(problems) + "\n")
+            return 1
+        sys.stdout.write(f"{len(task_list.tasks)} tasks OK\n")
+        return 0
+
+    if args.command == "summary":
+        header = ["Project", "Tasks", "TimeRequired", "TimeSpent", "Progress"]
+        rows = [(project, str(values['tasks']), str(values['time_required']),
+                 str(values['time_spent']), str(values['progress']))
+                for project, values in task_list.summary().items()]
+        write_rows(header, rows, args.output_format)
+        return 0
+
+    if args.command == "memory":
+        # Lay out the board so the layout data shows up in the report
+        positions = calculate_task_positions(task_list.tasks)
+        report = memory_report.measure(task_list)
+        del positions
+        sys.stdout.write(memory_report.report_to_json(report) + "\n")
+        return 0
+
+    if args.command == "export":
+        exported = export_html(task_list, args.output)
+        sys.stdout.write(f"{exported} tasks exported to {args.output}\n")
+        return 0
+
+    task_list.print(args.output_format)
+    return 0
+
+"""
+Render the boards of all sources in parallel worker processes and report
+the time of each board. Qt is only imported in the workers.
+
+Returns:
+    int: Process exit code, 1 if a board failed
+"""
+def run_render(args) -> int:
+    if not args.sources:
+        sys.stderr.write("The render command needs at least one configuration or task file\n")
+        return 2
+
+    start = time.perf_counter()
+    results = render_boards(args.sources, args.output_dir, args.image_format, args.jobs, args.timeout)
+    elapsed = time.perf_counter() - start
+
+    def seconds(value):
+        return "" if value is None else f"{value:.2f}"
+
+    header = ["Source", "Output", "Status", "Load", "Layout", "Render", "Total"]
+    rows = [(str(result.source), str(result.output), result.status, seconds(result.load_seconds),
+             seconds(result.layout_seconds), seconds(result.render_seconds), seconds(result.total_seconds))
+            for result in results]
+    write_rows(header, rows, args.output_format)
+    failed = sum(result.status != "ok" for result in results)
+    sys.stderr.write(f"{len(results) - failed} of {len(results)} boards rendered in {elapsed:.2f} s\n")
+    return 1 if failed else 0
+
+"""
+Open the main window. Qt and the compiled resources are imported here so
+the headless commands start without them.
+
+Returns:
+    int: Exit code of the Qt event loop
+"""
+def run_gui(task_list: TaskList, config: Configuration, remote_source=None) -> int:
+    from PyQt5.QtWidgets import QApplication
+    from main_window import MainWindow
+
+    # Create application
+    app = QApplication(sys.argv)
 
     # create main window
-    main_window = MainWindow(task_list)
+    main_window = MainWindow(task_list, config.memory_budget_mb, remote_source, config.task_poll_seconds)
     main_window.show()
 
     # Start event loop
-    sys.exit(app.exec_())
+    return app.exec_()
+
+"""
+Main function
+"""
+def main(argv=None):
+    args = parse_arguments(argv)
+
+    if args.command in BATCH_COMMANDS:
+        sys.exit(run_render(args))
+
+    # load configuration and task list
+    try:
+        config = load_configuration(args)
+
+        # Allocations are only attributed if tracing starts before loading
+        if args.command == "memory" or args.memory_report:
+            memory_report.start_tracing()
+
+        remote_source = open_remote_source(args, config)
+        task_list = load_task_list(args, config, remote_source)
+    except (OSError, ValueError) as error:
+        sys.stderr.write(f"{error}\n")
+        sys.exit(2)
+
+    if args.command in HEADLESS_COMMANDS:
+        sys.exit(run_headless(args, task_list))
+
+    task_list.print()
+    sys.exit(run_gui(task_list, config, remote_source))
 
 
 """
 Entry point
 """
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
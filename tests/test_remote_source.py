@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+
+Checks of the remote task source against a local stand-in server.
+"""
+
+import functools
+import os
+import sys
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from remote_source import RemoteTaskSource
+from task_list import TaskList
+
+TASKS = ("TaskId;Project;Task;TimeRequired;TimeSpent;Progress;OtherDepartments;DependsOnTask\n"
+         "T1;Projekt A;Anforderungsanalyse;40;30;75;STR;\n"
+         "T2;Projekt A;Design;60;10;15;;T1\n")
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def server(tmp_path):
+    """Serve a directory with a task file over HTTP, answers conditional requests with 304."""
+    public = tmp_path / "public"
+    public.mkdir()
+    (public / "tasks.csv").write_text(TASKS, encoding='utf-8')
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=str(public)))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield public, f"http://127.0.0.1:{httpd.server_address[1]}/tasks.csv"
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_remote_tasks_are_read_only(server, tmp_path):
+    public, url = server
+    source = RemoteTaskSource(url, tmp_path / ".remote-tasks.csv")
+    task_list = source.read()
+    assert task_list.read_only
+    assert [task.task_id for task in task_list.tasks] == ["T1", "T2"]
+
+    task_list.update_task("T2", progress="50")
+    with pytest.raises(ValueError):
+        task_list.write()
+    assert source.cache_path.read_text(encoding='utf-8') == TASKS
+
+    # A local copy can still be saved
+    task_list.write(tmp_path / "copy.csv")
+    copy = TaskList()
+    copy.read(tmp_path / "copy.csv")
+    assert copy.task_index["T2"].progress == "50"
+    assert not copy.read_only
+
+def test_changed_upstream_replaces_cache(server, tmp_path):
+    public, url = server
+    source = RemoteTaskSource(url, tmp_path / ".remote-tasks.csv")
+    source.read()
+    assert source.fetch() is None
+
+    changed = TASKS.replace("T2;Projekt A;Design;60;10;15", "T2;Projekt A;Design;60;20;40")
+    (public / "tasks.csv").write_text(changed, encoding='utf-8')
+    stat = (public / "tasks.csv").stat()
+    os.utime(public / "tasks.csv", (stat.st_atime, stat.st_mtime + 10))
+
+    task_list = source.fetch()
+    assert task_list is not None and task_list.read_only
+    assert task_list.task_index["T2"].progress == "40"
+    assert source.cache_path.read_text(encoding='utf-8') == changed
+
+def test_cached_copy_is_read_only_offline(server, tmp_path):
+    _, url = server
+    source = RemoteTaskSource(url, tmp_path / ".remote-tasks.csv")
+    source.read()
+
+    # Nothing listens on the discard port, the cached copy is used
+    offline = RemoteTaskSource("http://127.0.0.1:9/tasks.csv", source.cache_path, timeout=5)
+    task_list = offline.read()
+    assert task_list.read_only
+    assert [task.task_id for task in task_list.tasks] == ["T1", "T2"]
+
+def test_broken_upstream_keeps_cache(server, tmp_path):
+    public, url = server
+    source = RemoteTaskSource(url, tmp_path / ".remote-tasks.csv")
+    source.read()
+
+    # A file without the required columns is published upstream
+    broken = "TaskId;Task\nT1;Anforderungsanalyse\n"
+    (public / "tasks.csv").write_text(broken, encoding='utf-8')
+    stat = (public / "tasks.csv").stat()
+    os.utime(public / "tasks.csv", (stat.st_atime, stat.st_mtime + 10))
+
+    with pytest.raises(ValueError):
+        source.fetch()
+    task_list = source.read()
+    assert task_list.read_only
+    assert [task.task_id for task in task_list.tasks] == ["T1", "T2"]
+    assert source.cache_path.read_text(encoding='utf-8') == TASKS
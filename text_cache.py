@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont, QFontMetricsF, QStaticText, QTransform
+from collections import OrderedDict, namedtuple
+
+# A laid out label with the measures needed to align it
+StaticTextEntry = namedtuple("StaticTextEntry", ["static_text", "width", "height", "ascent"])
+
+class StaticTextCache:
+    """
+    Shared cache of pre-laid-out labels that repeat across many task boxes,
+    such as "Required: 40" or "75%". Each entry holds the prepared
+    QStaticText together with its measured bounding box, so painting a
+    label needs neither text shaping nor font metrics. Labels are measured
+    with the metrics of the device they are painted on, e.g. a PDF writer
+    with another resolution than the screen, and cached per resolution.
+    The least recently used entries are dropped when the cache is full.
+    """
+
+    # Rough size of one entry including the glyph layout of a short label
+    ENTRY_BYTES = 1024
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (text, font key, device resolution) -> StaticTextEntry
+        self.fonts = {}  # (family, size, weight) -> QFont
+
+    def font(self, family, size, weight=QFont.Normal) -> QFont:
+        """Return a shared font object instead of creating one per paint."""
+        key = (family, size, weight)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = QFont(family, size, weight)
+        return font
+
+    def get(self, text, font, device=None) -> StaticTextEntry:
+        """
+        Return the cached label for the text in the font, laying it out on first use.
+
+        Args:
+            text (str): Label text
+            font (QFont): Font of the label
+            device (QPaintDevice): Device the label is painted on, e.g.
+                painter.device(), None for the screen
+        """
+        resolution = (device.logicalDpiX(), device.logicalDpiY()) if device is not None else None
+        key = (text, font.key(), resolution)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry
+
+        static_text = QStaticText(text)
+        static_text.setTextFormat(Qt.PlainText)
+        static_text.prepare(QTransform(), font)
+
+        metrics = QFontMetricsF(font, device) if device is not None else QFontMetricsF(font)
+        bounding_rect = metrics.boundingRect(text)
+        entry = StaticTextEntry(static_text, bounding_rect.width(), bounding_rect.height(), metrics.ascent())
+
+        self.entries[key] = entry
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return entry
+
+    def memory_bytes(self) -> int:
+        """Return the estimated size of the cached labels."""
+        return len(self.entries) * self.ENTRY_BYTES
+
+    def shrink(self) -> bool:
+        """
+        Halve the number of cached labels to save memory.
+
+        Returns:
+            bool: False if the smallest cache size is already reached
+        """
+        if self.max_entries <= 256:
+            return False
+        self.max_entries //= 2
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return True
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+import numpy as np
+from itertools import chain, repeat
+from operator import attrgetter
+from typing import Dict, Iterable, List
+
+class Workload:
+    """
+    Per-department load of a board: remaining hours (required minus spent)
+    per department and dependency column, and per department the number of
+    over-budget tasks. A task with several departments counts fully for each
+    of them, tasks without departments are left out.
+
+    Department names are integer-coded and the times and columns are stored
+    as arrays once when the workload is built. Edits only change single
+    array entries, and the aggregation itself is a NumPy group-by (bincount)
+    over the codes, so refreshing after an edit takes milliseconds even for
+    large boards.
+
+    Building the workload when the data reloads has no Python loop per task:
+    the task fields are collected with map and the departments are
+    flattened and coded in bulk. It still has to touch every task object and
+    look up every column, which takes several hundred milliseconds for 500k
+    tasks. The row index for edits is only built on the first edit.
+    """
+
+    def __init__(self, tasks, positions: Dict[str, int]):
+        task_ids = list(map(attrgetter("task_id"), tasks))
+        self.task_ids = task_ids
+        self.row_by_id: Dict[str, int] = None  # First row per task ID, built on the first edit
+        self.duplicate_rows: Dict[str, List[int]] = {}  # Further rows of duplicate task IDs
+
+        # Integer-code the departments in order of appearance and flatten to one entry per (task, department)
+        department_lists = list(map(attrgetter("other_departments"), tasks))
+        flat_departments = list(chain.from_iterable(department_lists))
+        department_codes = {department: code for code, department in enumerate(dict.fromkeys(flat_departments))}
+        self.departments: List[str] = list(department_codes)
+        self.codes = np.fromiter(map(department_codes.__getitem__, flat_departments),
+                                 dtype=np.int64, count=len(flat_departments))
+        self.task_index = np.repeat(np.arange(len(tasks), dtype=np.int64),
+                                    np.fromiter(map(len, department_lists), dtype=np.int64, count=len(tasks)))
+
+        # Per task values
+        self.required = _to_array(list(map(attrgetter("time_required"), tasks)))
+        self.spent = _to_array(list(map(attrgetter("time_spent"), tasks)))
+        self.columns = np.fromiter(map(positions.get, task_ids, repeat(0)), dtype=np.int64, count=len(tasks))
+
+        self.column_count = 0
+        self.remaining = np.zeros((len(self.departments), 0))
+        self.over_budget = np.zeros(len(self.departments), dtype=np.int64)
+        self.aggregate()
+
+    """
+    Take over the edited times of a task.
+    """
+    def update_task(self, task) -> None:
+        for row in self._rows(task.task_id):
+            self.required[row] = _to_float(task.time_required)
+            self.spent[row] = _to_float(task.time_spent)
+
+    """
+    Take over changed dependency columns.
+
+    Args:
+        positions (Dict[str, int]): Column per task ID
+        task_ids (Iterable[str]): IDs of the tasks whose column changed
+    """
+    def update_columns(self, positions: Dict[str, int], task_ids: Iterable[str]) -> None:
+        for task_id in task_ids:
+            for row in self._rows(task_id):
+                self.columns[row] = positions.get(task_id, 0)
+
+    def _rows(self, task_id) -> List[int]:
+        """Return the array rows of a task ID."""
+        if self.row_by_id is None:
+            # Later pairs overwrite earlier ones, so the pairs are inserted in reverse
+            self.row_by_id = dict(zip(reversed(self.task_ids), range(len(self.task_ids) - 1, -1, -1)))
+            if len(self.row_by_id) != len(self.task_ids):
+                for index, task_id in enumerate(self.task_ids):
+                    if self.row_by_id[task_id] != index:
+                        self.duplicate_rows.setdefault(task_id, []).append(index)
+        row = self.row_by_id.get(task_id)
+        if row is None:
+            return []
+        return [row] + self.duplicate_rows.get(task_id, [])
+
+    """
+    Recalculate the sums from the stored times and columns.
+    """
+    def aggregate(self) -> None:
+        remaining = np.maximum(self.required - self.spent, 0)
+        over_budget = self.spent > self.required
+
+        department_count = len(self.departments)
+        self.column_count = int(self.columns.max()) + 1 if len(self.columns) else 0
+
+        # Group by department and column through one combined index
+        cells = self.codes * self.column_count + self.columns[self.task_index]
+        self.remaining = np.bincount(cells, weights=remaining[self.task_index],
+                                     minlength=department_count * self.column_count
+                                     ).reshape(department_count, self.column_count)
+        self.over_budget = np.bincount(self.codes, weights=over_budget[self.task_index],
+                                       minlength=department_count).astype(np.int64)
+
+    def totals(self) -> np.ndarray:
+        """Return the remaining hours per department."""
+        return self.remaining.sum(axis=1)
+
+"""
+Convert a numeric CSV value to float, invalid values become 0.
+"""
+def _to_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
+
+"""
+Convert numeric CSV values to a float array, invalid values become 0.
+"""
+def _to_array(values) -> np.ndarray:
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        return np.fromiter(map(_to_float, values), dtype=np.float64, count=len(values))
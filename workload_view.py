@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Jan-Eric-P
+"""
+
+from PyQt5.QtWidgets import QWidget, QToolTip
+from PyQt5.QtCore import Qt, QRectF, QSize
+from PyQt5.QtGui import QPainter, QFont, QImage
+import numpy as np
+
+class WorkloadHeatmap(QWidget):
+    """
+    Heatmap of the remaining hours per department (rows) and dependency
+    column (columns). Each row is labeled with the department, its total
+    remaining hours and its number of over-budget tasks. Hovering a cell
+    shows its value. The cells are converted to an image with NumPy in one
+    step whenever the workload changes and drawn scaled to the widget.
+    """
+
+    LABEL_WIDTH = 150
+    ROW_HEIGHT = 22
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.workload = None
+        self.image = None  # One pixel per cell, built by set_workload
+        self.pixels = None  # Keeps the image buffer alive
+        self.setMouseTracking(True)
+        self.setMinimumHeight(60)
+
+    def sizeHint(self):
+        """Return a height that fits all departments."""
+        rows = len(self.workload.departments) if self.workload is not None else 2
+        return QSize(400, (rows + 1) * self.ROW_HEIGHT)
+
+    def set_workload(self, workload):
+        """Show a new aggregation result."""
+        self.workload = workload
+        self.image = None
+
+        remaining = workload.remaining
+        if remaining.size:
+            # White for no load up to full red for the highest load
+            maximum = remaining.max()
+            level = remaining / maximum if maximum > 0 else np.zeros_like(remaining)
+            fade = (255 * (1 - level)).astype(np.uint32)
+            self.pixels = np.ascontiguousarray(0xFFFF0000 | (fade << 8) | fade, dtype=np.uint32)
+            rows, columns = self.pixels.shape
+            self.image = QImage(self.pixels.data, columns, rows, columns * 4, QImage.Format_RGB32)
+        self.updateGeometry()
+        self.update()
+
+    def _cell_width(self) -> float:
+        """Return the width of one dependency column."""
+        return max(1.0, (self.width() - self.LABEL_WIDTH) / max(1, self.workload.column_count))
+
+    def paintEvent(self, event):
+        """Draw the labels and the heatmap cells."""
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.white)
+        painter.setFont(QFont("Arial", 8))
+
+        if self.workload is None or not self.workload.departments:
+            painter.drawText(self.rect(), Qt.AlignCenter, "No department data")
+            return
+
+        cell_width = self._cell_width()
+        totals = self.workload.totals()
+
+        # Heatmap cells, one image row per department with a gap between rows
+        if self.image is not None:
+            for row in range(len(self.workload.departments)):
+                painter.drawImage(QRectF(self.LABEL_WIDTH, row * self.ROW_HEIGHT + 1,
+                                         cell_width * self.workload.column_count, self.ROW_HEIGHT - 2),
+                                  self.image, QRectF(0, row, self.workload.column_count, 1))
+
+        for row, department in enumerate(self.workload.departments):
+            y = row * self.ROW_HEIGHT
+            label = f"{department}: {totals[row]:.0f} h, {self.workload.over_budget[row]} over"
+            painter.setPen(Qt.red if self.workload.over_budget[row] else Qt.black)
+            painter.drawText(QRectF(4, y, self.LABEL_WIDTH - 8, self.ROW_HEIGHT), Qt.AlignVCenter | Qt.AlignLeft, label)
+
+        # Column axis
+        painter.setPen(Qt.gray)
+        axis_y = len(self.workload.departments) * self.ROW_HEIGHT
+        painter.drawLine(self.LABEL_WIDTH, axis_y, self.width(), axis_y)
+        painter.drawText(QRectF(self.LABEL_WIDTH, axis_y, self.width() - self.LABEL_WIDTH, self.ROW_HEIGHT),
+                         Qt.AlignLeft | Qt.AlignVCenter, "Dependency column →")
+
+    def mouseMoveEvent(self, event):
+        """Show the value of the hovered cell as tooltip."""
+        if self.workload is None or event.x() < self.LABEL_WIDTH:
+            QToolTip.hideText()
+            return
+        row = event.y() // self.ROW_HEIGHT
+        column = int((event.x() - self.LABEL_WIDTH) / self._cell_width())
+        if 0 <= row < len(self.workload.departments) and 0 <= column < self.workload.column_count:
+            QToolTip.showText(event.globalPos(),
+                              f"{self.workload.departments[row]}, column {column}: "
+                              f"{self.workload.remaining[row, column]:.0f} h remaining", self)
+        else:
+            QToolTip.hideText()